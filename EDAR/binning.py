@@ -0,0 +1,169 @@
+import numpy as np
+from math import ceil
+from EDAR.auc import _grow_thresholds
+
+# most buckets a column is quantized into, so every bucket index fits in a uint8
+MAX_BUCKETS = 255
+
+# rows the bucket edges are taken from, as LightGBM does for its histograms
+EDGE_SAMPLE_ROWS = 200_000
+
+# rows assigned to buckets at a time, which bounds the temporary float32 and index arrays
+CHUNK_ROWS = 1 << 16
+
+
+def quantize(X, max_buckets= MAX_BUCKETS, sample_rows= EDGE_SAMPLE_ROWS, random_state= 0):
+
+    """
+    Quantizes a numeric column into quantile buckets, stored as one byte per row.
+
+    The edges are taken from a sample of `sample_rows` rows, drawn with replacement:
+    every distinct value of the sample when there are fewer than `max_buckets`, else
+    its quantiles, so each edge is a value of the column. Only the uint8 buckets are
+    kept for all rows, the column is converted to float32 a chunk at a time.
+
+    Parameters
+    ----------
+    X : np.ndarray
+        The column values, shaped (n,) or (n, 1), without missing values.
+    max_buckets : int, optional
+        The most buckets to use, at most 256 (default is 255).
+    sample_rows : int, optional
+        The number of rows the quantiles are computed on (default is 200,000).
+    random_state : int, optional
+        Seed of the sample (default is 0).
+
+    Returns
+    -------
+    tuple of (np.ndarray, np.ndarray, np.ndarray)
+        The uint8 bucket of every row, and the smallest and largest float32 value of each
+        bucket (inf and -inf for empty buckets).
+    """
+
+    if not 2 <= max_buckets <= 256:
+        raise ValueError(f"max_buckets must be between 2 and 256, got {max_buckets}")
+
+    values = np.asarray(X).reshape(-1)
+
+    sample = values
+    if len(values) > sample_rows:
+        rng = np.random.default_rng(random_state)
+        sample = values[rng.integers(0, len(values), sample_rows)]
+    sample = sample.astype(np.float32)
+
+    # a value goes to the first bucket whose edge is >= to it, values above the last
+    # edge to one more bucket
+    edges = np.unique(sample)
+    if len(edges) > max_buckets - 1:
+        levels = np.arange(1, max_buckets) / max_buckets
+        edges = np.unique(np.quantile(sample, levels, method= 'inverted_cdf')).astype(np.float32)
+
+    n_buckets = len(edges) + 1
+    codes = np.empty(len(values), dtype= np.uint8)
+    low = np.full(n_buckets, np.inf, dtype= np.float32)
+    high = np.full(n_buckets, -np.inf, dtype= np.float32)
+
+    for start in range(0, len(values), CHUNK_ROWS):
+        chunk = values[start:start + CHUNK_ROWS].astype(np.float32)
+        chunk_codes = np.searchsorted(edges, chunk)
+        codes[start:start + CHUNK_ROWS] = chunk_codes
+        np.minimum.at(low, chunk_codes, chunk)
+        np.maximum.at(high, chunk_codes, chunk)
+
+    return codes, low, high
+
+
+def _bucket_counts(codes, n_buckets):
+    """Counts the rows of every bucket, a chunk at a time as bincount widens the codes to intp."""
+    counts = np.zeros(n_buckets, dtype= np.int64)
+    for start in range(0, len(codes), CHUNK_ROWS):
+        counts += np.bincount(codes[start:start + CHUNK_ROWS], minlength= n_buckets)
+    return counts
+
+
+def _positive_rows(y):
+
+    """
+    Finds the rows of the second class of a target without sorting or hashing it.
+
+    Parameters
+    ----------
+    y : np.ndarray
+        The target values.
+
+    Returns
+    -------
+    tuple of (np.ndarray, int)
+        A mask of the rows of the larger class, and the number of classes.
+    """
+
+    y = np.asarray(y).reshape(-1)
+    if y.dtype.kind not in 'biuf':
+        classes, yc = np.unique(y, return_inverse= True)
+        return yc.reshape(-1) == len(classes) - 1, len(classes)
+
+    low, high = y.min(), y.max()
+    positive = y == high
+    if low == high:
+        return positive, 1
+    return positive, 2 if (positive | (y == low)).all() else 3
+
+
+def hist_thresholds(X, y, min_samples_leaf, buckets= None):
+
+    """
+    Fits the bin edges of a numeric column on its quantile buckets.
+
+    The balanced Gini tree of `_fit_thresholds` is grown on the class counts of each
+    bucket instead of on the sorted rows, so splits can only fall between buckets.
+    A split is placed halfway between the largest value on its left and the smallest on
+    its right, as the decision tree does, so a column whose distinct values all get
+    their own bucket gets the same edges as the decision tree.
+
+    Parameters
+    ----------
+    X : np.ndarray
+        The column values, shaped (n,) or (n, 1), without missing values. Not used when
+        `buckets` is given.
+    y : np.ndarray
+        The binary target values.
+    min_samples_leaf : int or float
+        Minimum samples per leaf, as a count or a fraction of the rows.
+    buckets : tuple, optional
+        The result of `quantize(X)`, when it is already known (default is None).
+
+    Returns
+    -------
+    np.ndarray
+        The sorted upper edges of the bins, ending with inf, with the -2 the decision tree
+        stores for its leaves like `_fit_thresholds`.
+    """
+
+    positive, n_classes = _positive_rows(y)
+    if n_classes > 2:
+        raise ValueError("The target must have at most two classes, got more")
+
+    if n_classes < 2:
+        # a single class is a single leaf
+        thresholds = np.array([], dtype= np.float64)
+    else:
+        codes, low, high = quantize(X) if buckets is None else buckets
+        count = _bucket_counts(codes, len(low))
+        c1 = _bucket_counts(codes[positive], len(low))
+        c0 = count - c1
+        present = count > 0
+
+        n_rows = len(codes)
+        n0, n1 = c0.sum(), c1.sum()
+
+        # class_weight='balanced'
+        w0 = n_rows / (2.0 * n0)
+        w1 = n_rows / (2.0 * n1)
+
+        if isinstance(min_samples_leaf, float):
+            min_samples_leaf = int(ceil(min_samples_leaf * n_rows))
+
+        thresholds = _grow_thresholds(high[present], c0[present], c1[present], w0, w1,
+                                      min_samples_leaf, low= low[present])
+
+    return np.append(np.unique(np.append(thresholds, -2.0)), np.inf)
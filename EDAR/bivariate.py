@@ -0,0 +1,212 @@
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from sys import maxsize
+
+import numpy as np
+import pandas as pd
+
+from EDAR.eda_format import EDA_Formatter
+from EDAR.parallel import resolve_n_jobs
+
+# the options of the Bivariate EDA
+BIVARIATE_DEFAULTS = {
+    'top_k': 10,           # the columns with the highest ROC AUC, paired with each other
+    'max_cells': 50_000,   # the most rows of the Bivariate EDA sheet, over all pairs
+}
+
+# pairs with more possible cells than this are counted from their distinct codes
+DENSE_CELLS = 1 << 22
+
+# the columns of the Bivariate EDA frame, as those of the Detailed EDA one
+BIVARIATE_COLUMNS = ['Column', 'value', 'count', 'sum', 'mean']
+
+# separates the bins of the two columns in a value of the Bivariate EDA
+SEPARATOR = ' | '
+
+
+def bivariate_options(bivariate):
+
+    """
+    Returns the options of the Bivariate EDA.
+
+    Parameters
+    ----------
+    bivariate : bool, int or dict
+        True for `BIVARIATE_DEFAULTS`, the number of top columns, or a dict overriding
+        some of the defaults.
+
+    Returns
+    -------
+    dict
+        Every option of `BIVARIATE_DEFAULTS`.
+    """
+
+    if bivariate is True:
+        return dict(BIVARIATE_DEFAULTS)
+    if isinstance(bivariate, int):
+        bivariate = {'top_k': bivariate}
+    unknown = set(bivariate) - set(BIVARIATE_DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unknown bivariate options {sorted(unknown)}, use {sorted(BIVARIATE_DEFAULTS)}")
+    options = dict(BIVARIATE_DEFAULTS, **bivariate)
+    if options['top_k'] < 2:
+        raise ValueError(f"top_k must be at least 2 to make a pair, got {options['top_k']}")
+    return options
+
+
+def numeric_bins(X, edges):
+
+    """
+    Bins a numeric column on the edges of its Detailed EDA block.
+
+    Parameters
+    ----------
+    X : np.ndarray
+        The column values with missing values filled, shaped (n, 1).
+    edges : np.ndarray
+        The sorted upper edges of the bins holding rows, the values of the column's
+        Detailed EDA block. The empty bins are merged into the next one, which holds
+        the same rows.
+
+    Returns
+    -------
+    tuple of (np.ndarray, list of str)
+        The bin of every row and the label of each bin, as in the Detailed EDA.
+    """
+
+    bins = np.digitize(X.ravel(), edges, right= True).astype(np.int32)
+
+    # the edges as the Detailed EDA block shows them, rounded with 'inf' last
+    values = [maxsize if np.isinf(edge) else round(float(edge), 2) for edge in edges]
+    return bins, EDA_Formatter.bin_labels(values)
+
+
+def categorical_bins(column_codes):
+
+    """
+    Numbers the levels of a factorized column in the order of its Detailed EDA block.
+
+    Parameters
+    ----------
+    column_codes : tuple
+        The column as returned by `EDAR.excel_report._column_codes`.
+
+    Returns
+    -------
+    tuple of (np.ndarray, list of str)
+        The level of every row, -1 when missing, and the label of each level.
+    """
+
+    codes, levels, order, group_order = column_codes
+    position = np.empty(len(levels), dtype= np.int32)
+    position[group_order] = np.arange(len(levels), dtype= np.int32)
+    valid = codes >= 0
+    return np.where(valid, position[np.where(valid, codes, 0)], -1), [str(level) for level in levels[group_order]]
+
+
+def pair_table(first, second, y):
+
+    """
+    Aggregates the target over every pair of bins of two columns.
+
+    The bins of the two columns are combined into one code per row, and a single
+    `np.bincount` of the codes, weighted by the target for the sum, gives the whole 2-D
+    table. Rows missing from either column are left out.
+
+    Parameters
+    ----------
+    first, second : tuple
+        The name, bin of every row and bin labels of each column, from `numeric_bins`
+        or `categorical_bins`.
+    y : np.ndarray
+        The target values.
+
+    Returns
+    -------
+    pd.DataFrame
+        The count, sum and mean of the target for every pair of bins holding rows,
+        with the pair of columns under "Column" and the pair of bins under "value".
+    """
+
+    name_a, codes_a, labels_a = first
+    name_b, codes_b, labels_b = second
+
+    valid = (codes_a >= 0) & (codes_b >= 0)
+    combined = codes_a.astype(np.int64) * len(labels_b) + codes_b
+    y = np.asarray(y)
+    if not valid.all():
+        combined, y = combined[valid], y[valid]
+
+    if len(labels_a) * len(labels_b) <= DENSE_CELLS:
+        cells = None
+        size = len(labels_a) * len(labels_b)
+    else:
+        cells, combined = np.unique(combined, return_inverse= True)
+        size = len(cells)
+
+    count = np.bincount(combined, minlength= size)
+    total = np.bincount(combined, weights= y, minlength= size)
+    used = np.flatnonzero(count)
+    cell = used if cells is None else cells[used]
+
+    a, b = np.divmod(cell, len(labels_b))
+    labels_a, labels_b = np.asarray(labels_a, dtype= object), np.asarray(labels_b, dtype= object)
+    return pd.DataFrame({'Column': f"{name_a} x {name_b}",
+                         'value': labels_a[a] + SEPARATOR + labels_b[b],
+                         'count': count[used].astype(np.int64),
+                         'sum': total[used].astype(np.int64) if y.dtype.kind in 'biu' else total[used],
+                         'mean': total[used] / count[used]})
+
+
+def bivariate_tables(columns, y, max_cells= 50_000, n_jobs= 1):
+
+    """
+    Builds the Bivariate EDA of every pair of columns, up to a number of cells.
+
+    The pairs are taken in the order of the columns, the first column with each of the
+    others, then the second, and so on. They are computed in a pool of threads, as the
+    combining and counting release the GIL and the bins of every column are shared
+    without copying. Pairs are added until the next one would take the sheet over
+    `max_cells` rows.
+
+    Parameters
+    ----------
+    columns : list of tuple
+        The name, bin of every row and bin labels of each column, from `numeric_bins`
+        or `categorical_bins`, most important first.
+    y : np.ndarray
+        The target values.
+    max_cells : int, optional
+        The most rows of all the pair tables together (default is 50,000).
+    n_jobs : int, optional
+        The number of threads, -1 for all CPUs (default is 1).
+
+    Returns
+    -------
+    tuple of (pd.DataFrame, int)
+        The tables of the pairs kept, stacked as the Detailed EDA frame is, and the
+        number of pairs left out by `max_cells`.
+    """
+
+    pairs = list(itertools.combinations(columns, 2))
+    n_jobs = min(resolve_n_jobs(n_jobs), max(len(pairs), 1))
+
+    tables = []
+    cells = 0
+    full = False
+    with ThreadPoolExecutor(max_workers= n_jobs) as pool:
+        # one batch in flight at a time, so few pairs are computed past the cap
+        for start in range(0, len(pairs), 4 * n_jobs):
+            batch = pairs[start:start + 4 * n_jobs]
+            for table in pool.map(lambda pair: pair_table(pair[0], pair[1], y), batch):
+                if cells + len(table) > max_cells:
+                    full = True
+                    break
+                tables.append(table)
+                cells += len(table)
+            if full:
+                break
+
+    if not tables:
+        return pd.DataFrame(columns= BIVARIATE_COLUMNS), len(pairs)
+    return pd.concat(tables, ignore_index= True), len(pairs) - len(tables)
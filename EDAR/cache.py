@@ -0,0 +1,163 @@
+import os
+import time
+import pickle
+import hashlib
+import numpy as np
+import pandas as pd
+
+
+class EDACache:
+
+    """
+    An on-disk store of per-column results, reused across report runs.
+
+    Every analysed column is stored under a key made of its name, dtype, a fingerprint
+    of its values and of the target, and the report parameters, so an unchanged column
+    is read back instead of being refitted. The bin edges and category encodings of each
+    column are also kept under a key without the fingerprint, which lets a report reuse
+    fixed edges on new data to monitor drift.
+
+    Parameters
+    ----------
+    path : str
+        The directory holding the cache, created if needed.
+    max_entries : int, optional
+        The number of column results kept, and separately of frozen edges, the least
+        recently used are removed first (default is 10,000, None for no limit).
+    max_age_days : float, optional
+        Column results and frozen edges not used for this many days are removed
+        (default is None, no limit).
+
+    Methods
+    -------
+    get(key)
+        Returns the record stored under `key`, or None.
+    put(key, record, evict)
+        Stores a record and, unless `evict` is False, evicts old entries.
+    get_edges(key) / put_edges(key, edges)
+        Reads or stores the frozen edges of a column, evicted with the results.
+    evict()
+        Removes the entries beyond the limits, once per report run.
+    """
+
+    def __init__(self, path, max_entries= 10_000, max_age_days= None):
+
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+        self.results_path = os.path.join(path, 'results')
+        self.edges_path = os.path.join(path, 'edges')
+        os.makedirs(self.results_path, exist_ok= True)
+        os.makedirs(self.edges_path, exist_ok= True)
+
+    @staticmethod
+    def fingerprint(values):
+
+        """
+        Hashes the content of a column or target.
+
+        Parameters
+        ----------
+        values : pd.Series or np.ndarray
+            The values to hash.
+
+        Returns
+        -------
+        str
+            The hex digest of the values.
+        """
+
+        hashes = pd.util.hash_pandas_object(pd.Series(values), index= False)
+        return hashlib.sha1(hashes.to_numpy().tobytes()).hexdigest()
+
+    @staticmethod
+    def make_key(*parts):
+        """Returns a file-safe key for the given parts, arrays are keyed by their exact values."""
+        parts = [part.tolist() if isinstance(part, np.ndarray) else part for part in parts]
+        return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _read(path):
+        try:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+    @staticmethod
+    def _write(path, value):
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(value, f, protocol= pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    def get(self, key):
+
+        path = os.path.join(self.results_path, key + '.pkl')
+        record = self._read(path)
+        if record is not None:
+            # the modification time tracks the last use
+            os.utime(path)
+        return record
+
+    def put(self, key, record, evict= True):
+
+        """
+        Stores a record under `key`.
+
+        Eviction scans the whole cache, so a run storing many records passes
+        `evict=False` and calls `evict` once at the end.
+        """
+
+        self._write(os.path.join(self.results_path, key + '.pkl'), record)
+        if evict:
+            self.evict()
+
+    def get_edges(self, key):
+
+        path = os.path.join(self.edges_path, key + '.pkl')
+        edges = self._read(path)
+        if edges is not None:
+            # frozen edges in use are kept like recently used results
+            os.utime(path)
+        return edges
+
+    def put_edges(self, key, edges):
+        self._write(os.path.join(self.edges_path, key + '.pkl'), edges)
+
+    def evict(self):
+
+        """
+        Removes column results and frozen edges older than `max_age_days`, then the least
+        recently used ones beyond `max_entries`, in each store.
+        """
+
+        for folder in (self.results_path, self.edges_path):
+            self._evict_folder(folder)
+
+    def _evict_folder(self, folder):
+
+        entries = []
+        for entry in os.scandir(folder):
+            if entry.name.endswith('.pkl'):
+                entries.append((entry.stat().st_mtime, entry.path))
+        entries.sort()
+
+        expired = 0
+        if self.max_age_days is not None:
+            oldest = time.time() - self.max_age_days * 86400
+            expired = sum(mtime < oldest for mtime, _ in entries)
+        if self.max_entries is not None:
+            expired = max(expired, len(entries) - self.max_entries)
+
+        for _, path in entries[:expired]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def clear(self):
+        """Removes every column result and frozen edge."""
+        for folder in (self.results_path, self.edges_path):
+            for entry in os.scandir(folder):
+                os.remove(entry.path)
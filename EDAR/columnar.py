@@ -0,0 +1,88 @@
+def _library(data):
+    return type(data).__module__.split('.')[0]
+
+
+def is_columnar(data):
+    """Tells whether `data` is a pyarrow or polars object rather than a pandas DataFrame."""
+    return _library(data) in ('pyarrow', 'polars')
+
+
+def is_arrow_dataset(source):
+    """Tells whether `source` is a pyarrow Dataset, which is read a batch at a time."""
+    if _library(source) != 'pyarrow':
+        return False
+    import pyarrow.dataset as ds
+    return isinstance(source, ds.Dataset)
+
+
+def to_arrow(data):
+
+    """
+    Returns a pyarrow Table holding `data`, without copying it.
+
+    Parameters
+    ----------
+    data : pyarrow.Table, pyarrow.RecordBatch or polars.DataFrame
+        The dataset.
+
+    Returns
+    -------
+    pyarrow.Table
+        The same columns, sharing their buffers.
+    """
+
+    if _library(data) == 'polars':
+        if not hasattr(data, 'to_arrow'):
+            raise TypeError(f"Cannot read a polars {type(data).__name__}, collect it first or "
+                            f"sink it to Parquet and use EDAExcelReport.from_source")
+        return data.to_arrow()
+
+    import pyarrow as pa
+
+    if isinstance(data, pa.RecordBatch):
+        return pa.Table.from_batches([data])
+    if isinstance(data, pa.Table):
+        return data
+    raise TypeError(f"Cannot read a {type(data).__name__}, pass a pandas DataFrame, a pyarrow Table "
+                    f"or RecordBatch, or a polars DataFrame. A pyarrow Dataset is read by "
+                    f"EDAExcelReport.from_source")
+
+
+def _is_string(arrow_type):
+    import pyarrow as pa
+    is_string_view = getattr(pa.types, 'is_string_view', lambda t: False)
+    return pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type) or is_string_view(arrow_type)
+
+
+def to_pandas(data):
+
+    """
+    Converts an Arrow table or a polars DataFrame into the DataFrame the analysis runs on.
+
+    The columns are converted by Arrow on several threads. Numeric columns without
+    missing values keep their buffers, and string columns are dictionary encoded by
+    Arrow into `category` columns, so their values are hashed once here instead of in
+    every column's factorization, and stored as integer codes. Their categories are
+    sorted, so the Detailed EDA lists them as for a string column of pandas.
+
+    Parameters
+    ----------
+    data : pyarrow.Table, pyarrow.RecordBatch or polars.DataFrame
+        The dataset.
+
+    Returns
+    -------
+    pd.DataFrame
+        The dataset, one block per column.
+    """
+
+    table = to_arrow(data)
+    strings = [field.name for field in table.schema if _is_string(field.type)]
+
+    df = table.to_pandas(strings_to_categorical= True, split_blocks= True)
+    for col in strings:
+        categories = df[col].cat.categories
+        df[col] = df[col].cat.reorder_categories(categories.sort_values())
+
+    return df
+
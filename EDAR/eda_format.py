@@ -3,13 +3,95 @@ import numpy as np
 import datetime
 from sys import maxsize
 from openpyxl.formatting.rule import ColorScaleRule
-from openpyxl import Workbook, load_workbook
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.utils import get_column_letter
-from openpyxl.styles import Font, PatternFill, Border, Side, Alignment
+from openpyxl.styles import Font, PatternFill, Border, Side, Alignment, NamedStyle
+from openpyxl.styles.fonts import DEFAULT_FONT
+from EDAR.profiling import stage
+
+# number format of each column of a block, by position
+NUMBER_FORMATS = {3: '0.00%', 5: '0.00%', 6: '0.00%', 7: '0.00'}
+
+# rows of an Excel worksheet
+MAX_SHEET_ROWS = 1_048_576
+
+# characters Excel does not allow in sheet titles
+INVALID_TITLE_CHARS = str.maketrans({char: '_' for char in '[]:*?/\\'})
+
+
+def sheet_title(name, suffix):
+
+    """
+    Builds a valid sheet title from a report name and a suffix such as 'EDA' or 'ROC'.
+
+    Parameters
+    ----------
+    name : str
+        The name of the report, such as a target or a target and a segment.
+    suffix : str
+        Appended to the name after a space.
+
+    Returns
+    -------
+    str
+        The title, without the characters Excel rejects and shortened to 31 characters.
+    """
+
+    name = str(name).translate(INVALID_TITLE_CHARS)
+    return name[:31 - len(suffix) - 1] + ' ' + suffix
+
+
+def _named_styles():
+
+    """
+    Builds the named styles of the Detailed EDA sheet.
+
+    A data cell's style is picked by its number format and by whether it is on the
+    last row of a block, which carries the bottom border. 'EDA Header' is the header
+    row and 'EDA Label' the merged column name cell.
+
+    Returns
+    -------
+    list of NamedStyle
+        The styles, to be added to each workbook once.
+    """
+
+    thin = Side(border_style='thin')
+    center_alignment = Alignment(horizontal='center', vertical='center')
+    bottom_border = Border(bottom=thin)
+
+    styles = [
+        NamedStyle(name='EDA Header',
+                   font=Font(name='calibri', size= 11, bold=True),
+                   fill=PatternFill(fill_type='solid', start_color='E4DFEC', end_color='E4DFEC'),
+                   border=Border(left=thin, right=thin, top=thin, bottom=thin),
+                   alignment=center_alignment),
+        NamedStyle(name='EDA Label', font=DEFAULT_FONT, alignment=center_alignment),
+        NamedStyle(name='EDA Label End', font=DEFAULT_FONT, alignment=center_alignment,
+                   border=bottom_border),
+        NamedStyle(name='EDA Merged End', font=DEFAULT_FONT, border=bottom_border),
+    ]
+    for name, number_format in (('EDA Value', 'General'), ('EDA Percent', '0.00%'), ('EDA Ratio', '0.00')):
+        styles.append(NamedStyle(name=name, font=DEFAULT_FONT, alignment=center_alignment,
+                                 number_format=number_format))
+        styles.append(NamedStyle(name=name+' End', font=DEFAULT_FONT, alignment=center_alignment,
+                                 number_format=number_format, border=bottom_border))
+    return styles
+
+
+def _data_style(col, last):
+    """Returns the name of the style of a data cell in column `col` of a block."""
+    name = {'0.00%': 'EDA Percent', '0.00': 'EDA Ratio'}.get(NUMBER_FORMATS.get(col), 'EDA Value')
+    return name + ' End' if last else name
+
 
 class EDA_Formatter:
   
-    def __init__(self, path= "..\\reports\\EDA_raw.xlsx", model_type= "Target", conditional_color ="red"):
+    def __init__(self, path= "..\\reports\\EDA_raw.xlsx", model_type= "Target", conditional_color ="red",
+                 grp_data= None, roc_data= None, write_only= False, profiler= None, reports= None,
+                 sheets= ('eda', 'roc'), formulas= True, sheet_rows= None, skipped_data= None,
+                 bivariate_data= None):
 
 
         """
@@ -23,12 +105,68 @@ class EDA_Formatter:
             The type of model used for generating the EDA (default is "Target").
         conditional_color : str, optional
             The color used for conditional formatting in the report (default is "red").
+        grp_data : pd.DataFrame, optional
+            The Detailed EDA results. When given together with `roc_data`, the report is
+            built directly from the frames and `path` is only used to name the output file
+            (default is None, which reads the sheets back from `path`). Only the frames of
+            the `sheets` written are needed.
+        roc_data : pd.DataFrame, optional
+            The ROC AUC results (default is None).
+        write_only : bool, optional
+            Stream the rows to an openpyxl write-only workbook instead of building every
+            cell in memory, the saved report looks the same (default is False).
+        profiler : Profiler, optional
+            Records the time of the setup, formatting and saving stages, and adds the
+            hidden "Diagnostics" sheet when its `write_sheet` is set (default is None).
+        reports : list of tuple, optional
+            Several reports to write to one workbook, as `(name, model_type, grp_data,
+            roc_data)` tuples. Each gets a "<name> EDA" and a "<name> ROC" sheet, and
+            `grp_data`, `roc_data` and `model_type` must be left out (default is None).
+        sheets : tuple of str, optional
+            The sheets to write, 'eda' for the Detailed EDA and 'roc' for the ROC Report
+            (default is both).
+        formulas : bool, optional
+            Write 'Freq Distribution', '% of Total' and 'Lift' as Excel formulas over the
+            block. When False their values are computed here and written as numbers, so
+            Excel has nothing to recalculate when the report is opened (default is True).
+        sheet_rows : int, optional
+            The most rows of a Detailed EDA sheet. A wider report goes on to "Detailed EDA 2",
+            "Detailed EDA 3" and so on, a block is never split across sheets (default is
+            None, the 1,048,576 rows of an Excel sheet).
+        skipped_data : pd.DataFrame, optional
+            The columns skipped by the screening, written as they are to a last "Skipped
+            Columns" sheet when there are any (default is None).
+        bivariate_data : pd.DataFrame, optional
+            The Bivariate EDA, from `EDAR.bivariate.bivariate_tables`, written to a
+            "Bivariate EDA" sheet after the Detailed EDA, one block per pair of columns
+            laid out as a Detailed EDA block (default is None).
         """
 
         """
         Initializes the EDA_Formatter with the given parameters and runs the formatter.
         """
+        sheets = tuple(sheets)
+        if not sheets or set(sheets) - {'eda', 'roc'}:
+            raise ValueError(f"sheets must hold 'eda' and/or 'roc', got {sheets!r}")
+        if grp_data is not None or roc_data is not None:
+            if ('eda' in sheets and grp_data is None) or ('roc' in sheets and roc_data is None):
+                raise ValueError("grp_data and roc_data must be passed together")
+        if reports is not None and grp_data is not None:
+            raise ValueError("reports replaces grp_data and roc_data, pass one or the other")
+        if sheet_rows is not None and sheet_rows < 1:
+            raise ValueError(f"sheet_rows must be a positive number of rows, got {sheet_rows}")
+
         self.input_path = path
+        self.grp_data = grp_data
+        self.roc_data = roc_data
+        self.reports = reports
+        self.skipped_data = skipped_data
+        self.bivariate_data = bivariate_data
+        self.sheets = sheets
+        self.write_only = write_only
+        self.formulas = formulas
+        self.profiler = profiler
+        self.sheet_rows = min(sheet_rows or MAX_SHEET_ROWS, MAX_SHEET_ROWS)
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
 
         self.output_path = f"_{timestamp}.xlsx".join(path.split(".xlsx"))
@@ -37,7 +175,8 @@ class EDA_Formatter:
         self.r = 1
         self.c = 1
         
-        self.setup_workbook()
+        with stage(self.profiler, 'setup workbook'):
+            self.setup_workbook()
         self.run_formatter()
 
     def setup_workbook(self):
@@ -45,49 +184,231 @@ class EDA_Formatter:
         """
         Sets up the workbook by loading the initial sheet and setting column widths.
         """
+        if self.reports is not None:
+            # the sheets are added report by report in run_formatter
+            self.wb = Workbook(write_only= self.write_only)
+            if not self.write_only:
+                self.wb.remove(self.wb.active)
+            self.add_named_styles()
+            return
+
+        if self.write_only:
+            self.setup_write_only_workbook()
+            return
+
         self.wb = Workbook()
-        ws2 = load_workbook(self.input_path)['ROC Report']
-        ws2._parent = self.wb
-        self.wb._add_sheet(ws2)                                                                     
+        self.add_named_styles()
+        if 'roc' in self.sheets:
+            roc_data = self.roc_data
+            if roc_data is None:
+                roc_data = pd.read_excel(self.input_path, "ROC Report", engine = "openpyxl")
+            self.add_roc_sheet(roc_data)
         self.ws = self.wb.worksheets[0]
         self.ws_title = 'Detailed EDA'
         self.set_column_widths()
+        if 'eda' not in self.sheets:
+            self.wb.remove(self.ws)
+
+    def setup_write_only_workbook(self):
+
+        """
+        Sets up a write-only workbook, its column widths and the styles shared by all blocks.
+        """
+        self.wb = Workbook(write_only=True)
+        if 'eda' in self.sheets:
+            self.ws = self.wb.create_sheet('Sheet')
+            self.ws_title = 'Detailed EDA'
+            self.set_column_widths()
+            self.ws.sheet_view.showGridLines = False
+
+        if 'roc' in self.sheets:
+            roc_data = self.roc_data
+            if roc_data is None:
+                roc_data = pd.read_excel(self.input_path, "ROC Report", engine = "openpyxl")
+            self.add_roc_sheet(roc_data)
+
+        self.add_named_styles()
+
+    def add_eda_sheet(self, title, index= None):
+
+        """
+        Adds an empty Detailed EDA sheet and makes it the one the blocks are written to.
+
+        Parameters
+        ----------
+        title : str
+            The title of the sheet.
+        index : int, optional
+            The position of the sheet in the workbook (default is None, the last).
+        """
+        self.ws = self.wb.create_sheet(title, index)
+        self.ws_title = title
+        self.r = 1
+        self.set_column_widths()
+        self.ws.sheet_view.showGridLines = False
+
+    def add_roc_sheet(self, roc_data, title= 'ROC Report'):
+
+        """
+        Adds a sheet holding the ROC AUC results as they are.
+
+        Parameters
+        ----------
+        roc_data : pd.DataFrame
+            The ROC AUC results.
+        title : str, optional
+            The title of the sheet (default is 'ROC Report').
+        """
+        ws2 = self.wb.create_sheet(title)
+        ws2.append(roc_data.columns.tolist())
+        for row in roc_data.itertuples(index=False):
+            ws2.append(list(row))
+
+    def add_named_styles(self):
+        """
+        Adds the named styles of the report to the workbook, so each cell only refers to one.
+        """
+        for style in _named_styles():
+            self.wb.add_named_style(style)
 
     def run_formatter(self):
         """
         Runs the formatter to process and format the EDA results.
         """
-        df = pd.read_excel(self.input_path, "Detailed EDA", engine = "openpyxl")
+        if self.reports is not None:
+            for name, model_type, grp_data, roc_data in self.reports:
+                if 'eda' in self.sheets:
+                    self.add_eda_sheet(sheet_title(name, 'EDA'))
+                    self.format_blocks(grp_data.reset_index(drop=True), model_type)
+                if 'roc' in self.sheets:
+                    self.add_roc_sheet(roc_data, sheet_title(name, 'ROC'))
+        elif 'eda' in self.sheets:
+            if self.grp_data is not None:
+                df = self.grp_data.reset_index(drop=True)
+            else:
+                df = pd.read_excel(self.input_path, "Detailed EDA", engine = "openpyxl")
+            self.format_blocks(df, self.type)
+
+        if self.bivariate_data is not None and len(self.bivariate_data):
+            self.add_eda_sheet('Bivariate EDA')
+            self.format_blocks(self.bivariate_data.reset_index(drop=True), self.type)
+
+        if self.skipped_data is not None and len(self.skipped_data):
+            skipped = self.skipped_data.astype(object)
+            self.add_roc_sheet(skipped.where(skipped.notna(), None), 'Skipped Columns')
+
+        if self.profiler is not None and self.profiler.write_sheet:
+            self.profiler.write_diagnostics_sheet(self.wb)
+
+        with stage(self.profiler, 'save'):
+            self.wb.save(self.output_path)
+        print(f"Your EDA report is ready at {self.output_path}")
+
+
+    def format_blocks(self, df, model_type):
+
+        """
+        Writes the Detailed EDA frame to the current sheet, one formatted block per column.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            The Detailed EDA results, with a default index.
+        model_type : str
+            The name of the target, used in the column headers.
+        """
+
         df.rename(columns = {"value": "Value",
                              "count": "Frequency",
-                             "sum": self.type,
-                             "mean": self.type+" Rate"}, inplace=True)
+                             "sum": model_type,
+                             "mean": model_type+" Rate"}, inplace=True)
         df.insert(loc=3, column="Freq Distribution", value=0)
-        df.insert(loc=6, column= r"% of Total "+ self.type, value=0)
+        df.insert(loc=6, column= r"% of Total "+ model_type, value=0)
         df.insert(loc=7, column="Lift", value = 0)
 
 
-        df2 = pd.DataFrame(columns=df.columns)
-        #init_val = df.loc[0][0]
-        init_val = df.iloc[0,0]
+        # values are replaced by numbers or labels block by block
+        df["Value"] = df["Value"].astype(object)
+
+        bounds = self.block_bounds(df["Column"])
+        if not self.formulas:
+            self.fill_shares(df, bounds)
+        base_title, part = self.ws_title, 1
+        with stage(self.profiler, 'format blocks', blocks= len(bounds), rows= len(df)):
+            for start, end in bounds:
+                df2 = df.iloc[start:end].reset_index(drop=True)
+                if self.r > 1 and self.r + len(df2.index) > self.sheet_rows:
+                    # the header and rows of the block go to the next sheet
+                    part += 1
+                    if part == 2 and self.ws.title != base_title:
+                        # the default first sheet gets the title its parts continue
+                        self.ws.title = base_title
+                    self.add_eda_sheet(sheet_title(base_title, str(part)),
+                                       self.wb.worksheets.index(self.ws) + 1)
+                if self.write_only:
+                    self.append_block(df2)
+                else:
+                    self.write_to_excel(df2)
+                self.r += len(df2.index) + 3
 
-        for index in df.index:
+    @staticmethod
+    def block_bounds(column):
 
-            if df.iloc[index, 0] != init_val:
-                df2.reset_index(inplace=True, drop=True)
-                self.write_to_excel(df2)
-                self.r += len(df2.index) + 3
+        """
+        Finds the row ranges of the consecutive runs of each column name.
 
-                df2 = pd.DataFrame(columns= df.columns)
-                init_val= df.iloc[index, 0]
+        Parameters
+        ----------
+        column : pd.Series
+            The 'Column' values of the Detailed EDA frame.
 
-            df2.loc[index] = df.loc[index]
-        df2.reset_index(inplace=True, drop=True)
-        self.write_to_excel(df2)
+        Returns
+        -------
+        list of tuple
+            The (start, end) positions of every block, end excluded.
+        """
 
-        self.wb.save(self.output_path)
-        print(f"Your EDA report is ready at {self.output_path}")
+        values = column.to_numpy()
+        starts = np.flatnonzero(np.r_[True, values[1:] != values[:-1]])
+        ends = np.r_[starts[1:], len(values)]
+
+        return list(zip(starts.tolist(), ends.tolist()))
+
+    @staticmethod
+    def fill_shares(df, bounds):
+
+        """
+        Computes 'Freq Distribution', '% of Total' and 'Lift' of every block at once.
+
+        They hold the values the formulas of the report evaluate to: the share of each
+        row in its block's frequency and target total, and the ratio of the two. A
+        ratio over a zero total is left empty, where the formula shows #DIV/0!.
 
+        Parameters
+        ----------
+        df : pd.DataFrame
+            The Detailed EDA frame with the report's columns, changed in place.
+        bounds : list of tuple
+            The (start, end) positions of every block, from `block_bounds`.
+        """
+
+        starts = np.array([start for start, _ in bounds], dtype= np.intp)
+        lengths = np.array([end - start for start, end in bounds], dtype= np.intp)
+
+        def share(values, totals):
+            with np.errstate(divide= 'ignore', invalid= 'ignore'):
+                result = values / totals
+            result[~np.isfinite(result)] = np.nan
+            return result
+
+        def block_share(values):
+            values = values.astype(np.float64)
+            return share(values, np.repeat(np.add.reduceat(values, starts), lengths))
+
+        freq = block_share(df.iloc[:, 2].to_numpy())
+        total = block_share(df.iloc[:, 4].to_numpy())
+        for col, values in ((3, freq), (6, total), (7, share(total, freq))):
+            df[df.columns[col]] = pd.Series(values, index= df.index, dtype= object).where(~np.isnan(values), None)
 
     @staticmethod
     def is_number(n):
@@ -155,25 +476,45 @@ class EDA_Formatter:
             The number of rows in the DataFrame.
         """
 
-        char = get_column_letter(self.c+1)
+        cells = [self.ws.cell(row= self.r + row, column= self.c + 1) for row in range(1, df_rows+1)]
+        labels = self.bin_labels([cell.value for cell in cells])
 
-        prev_cell = self.ws[char + str(self.r)]
-        prev_val = prev_cell.value
+        for cell, label in zip(cells, labels):
+            cell.value = label
 
-        for row in range(1, df_rows+1):
+    @staticmethod
+    def bin_labels(values):
 
-            cell = self.ws[char+str(self.r + row)]
-            val = cell.value
+        """
+        Turns the sorted upper edges of numeric bins into range labels.
+
+        Parameters
+        ----------
+        values : list
+            The upper edge of every bin, in increasing order.
+
+        Returns
+        -------
+        list of str
+            The label of every bin, such as "<= 10", "> 10 & <= 20" and "> 20".
+        """
+
+        labels = []
+        prev_val = None
+
+        for row, val in enumerate(values, start=1):
 
             if (row==1):
-                cell.value = "<= " + str(val)
-            elif (row == df_rows):
-                cell.value = "> " + str(prev_val)
+                labels.append("<= " + str(val))
+            elif (row == len(values)):
+                labels.append("> " + str(prev_val))
             else:
-                cell.value = "> "+str(prev_val)+ " & <= "+str(val) 
+                labels.append("> "+str(prev_val)+ " & <= "+str(val))
 
             prev_val = val
 
+        return labels
+
 
     def df_formatter(self, rows, cols):
 
@@ -188,91 +529,59 @@ class EDA_Formatter:
             The number of columns in the DataFrame.
         """
 
+        for header_cell in self.ws.iter_rows(min_row= self.r, max_row= self.r, min_col= self.c,
+                                             max_col= self.c + cols - 1).__next__():
+            header_cell.style = 'EDA Header'
 
-        thin_border = Border(left=Side(border_style='thin'),
-                             right=Side(border_style='thin'),
-                             top=Side(border_style='thin'),
-                             bottom=Side(border_style='thin'))
-        font = Font(name='calibri',
-                    size= 11,
-                    bold=True)
-        fill = PatternFill(fill_type='solid',
-                           start_color='E4DFEC',
-                           end_color='E4DFEC')
-        center_alignment = Alignment(
-            horizontal='center', vertical='center')
-        left_alignment = Alignment(
-            horizontal='center', vertical='center')
-        right_alignment = Alignment(
-            horizontal='center', vertical='center')
-        
-        for col in range(0, cols):
-
-            char = get_column_letter(col+self.c)
-            header_cell = self.ws[char+str(self.r)]
-
-            header_cell.border = thin_border
-            header_cell.font = font
-            header_cell.alignment = center_alignment
-            header_cell.fill = fill
-
-            for row in range(0, rows):
-                data_cell = self.ws[char+ str(self.r+row+1)]
-                if col == 0:
-                    data_cell.alignment = center_alignment
-                else:
-                    if (col==3 or col == 5 or col== 6):
-                        data_cell.number_format = '0.00%'
-                    elif (col == 7):
-                        data_cell.number_format = '0.00'
-                    if col == 1:
-                        data_cell.alignment = left_alignment
-                    else:
-                        data_cell.alignment =  right_alignment
+        for row, cells in enumerate(self.ws.iter_rows(min_row= self.r + 1, max_row= self.r + rows,
+                                                      min_col= self.c, max_col= self.c + cols - 1)):
+            last = row == rows - 1
+            cells[0].style = 'EDA Label End' if last else 'EDA Label'
+            for col in range(1, cols):
+                cells[col].style = _data_style(col, last)
             
         char = get_column_letter(self.c)
         self.ws.merge_cells(char+str(self.r+1)+':'+char+str(self.r+rows))
 
     def cond_format(self, start_row, end_row, start_col, end_col):
-        """Apply conditional formatting to the worksheet."""
+        """Apply conditional formatting to the worksheet.
 
-        if (self.color == 'red' or self.color == 'Red'):
-            high_value = 'F8696B'
-        else:
-            high_value = '63BE7B'
+        Every block and column keeps its own range, as the percentiles of a colour scale
+        are taken over all the cells of its range.
+        """
 
+        if (self.color == 'color' or self.color == 'Color'):
+            scale = dict(start_type='percentile', start_value=0, start_color='F8696B',
+                         mid_type='percentile', mid_value= 50, mid_color= 'FFEB84',
+                         end_type= 'percentile', end_value= 100, end_color= '63BE7B')
+        elif (self.color == 'red' or self.color == 'Red'):
+            scale = dict(start_type='percentile', start_value= 0, start_color= 'FCFCFF',
+                         end_type= 'percentile', end_value=100, end_color= 'F8696B')
+        else:
+            scale = dict(start_type='percentile', start_value= 0, start_color= 'FCFCFF',
+                         end_type= 'percentile', end_value=100, end_color= '63BE7B')
 
         for col in range(start_col, end_col+1):
             char = get_column_letter(col)
-            
-            if (self.color == 'color' or self.color == 'Color'):
-                self.ws.conditional_formatting.add(char+str(start_row)+ ':'+char+str(end_row),
-                                                   ColorScaleRule(start_type='percentile', start_value=0, start_color='F8696B',
-                                                                  mid_type='percentile', mid_value= 50, mid_color= 'FFEB84',
-                                                                  end_type= 'percentile', end_value= 100, end_color= '63BE7B'))
-            else:
-                self.ws.conditional_formatting.add(char+str(start_row)+':'+char+str(end_row),
-                                                   ColorScaleRule(start_type='percentile', start_value= 0, start_color= 'FCFCFF',
-                                                                  end_type= 'percentile', end_value=100, end_color= high_value)
-                                                   )
-                
-
-    def write_to_excel(self, df):
-        
-        """Write the DataFrame to the worksheet and apply formatting."""
-
-        num_flag = False
+            self.ws.conditional_formatting.add(char+str(start_row)+':'+char+str(end_row),
+                                               ColorScaleRule(**scale))
 
-        thin_border = Border(bottom=Side(style='thin'))
+    def sort_numeric_block(self, df):
 
+        """
+        Sorts a numeric column's block by bin edge, with the 'inf' edge last.
 
-        #writing header
-        for col in range(0, len(df.columns)):
-            char = get_column_letter(self.c+ col)
-            cell = self.ws[char+str(self.r)]
-            cell.value  = df.columns[col]
+        Parameters
+        ----------
+        df : pd.DataFrame
+            The block of one column.
 
-        #sorting if numeric after replacing inf with maxsize
+        Returns
+        -------
+        tuple of (pd.DataFrame, bool)
+            The block, sorted with edges rounded to 2 decimals if they are numeric, and
+            True if they are.
+        """
 
         if (self.is_number(df.iloc[0, 1]) or df.iloc[0, 1]== 'inf'):
             for index in df.index:
@@ -280,34 +589,125 @@ class EDA_Formatter:
                     df.at[index, "Value"]= maxsize
             df = self.sort(df)
             df['Value'] = df['Value'].round(decimals= 2)
-            num_flag = True
+            return df, True
+
+        return df, False
+
+    def block_columns(self, df):
+
+        """
+        Returns the values of the data cells of the current block, column by column.
+
+        The formulas of 'Freq Distribution', '% of Total' and 'Lift' are built for the
+        whole block at once, or left to the values of `df` when `formulas` is off.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            The block of one column, sorted.
+
+        Returns
+        -------
+        list of list
+            The values of every column of the block, in row order.
+        """
+
+        columns = [df.iloc[:, col].tolist() for col in range(len(df.columns))]
+        if not self.formulas:
+            return columns
+
+        first, last = self.r + 1, self.r + len(df.index)
+        rows = range(first, last + 1)
+        freq, dist, target, total = (get_column_letter(self.c + col) for col in (2, 3, 4, 6))
+
+        columns[3] = [f"={freq}{row}/SUM({freq}${first}:{freq}${last})" for row in rows]
+        columns[6] = [f"={target}{row}/SUM({target}${first}:{target}${last})" for row in rows]
+        columns[7] = [f"={total}{row}/{dist}{row}" for row in rows]
+        return columns
+
+    def write_cell(self, value, style):
+
+        """
+        Creates a styled cell for a write-only worksheet.
+
+        Parameters
+        ----------
+        value : Any
+            The value of the cell.
+        style : str
+            The name of one of the report's named styles.
+
+        Returns
+        -------
+        WriteOnlyCell
+            The cell.
+        """
+
+        cell = WriteOnlyCell(self.ws, value=value)
+        cell.style = style
+        return cell
+
+    def append_block(self, df):
 
+        """
+        Appends the DataFrame as the next block of a write-only worksheet.
+
+        Produces the same values, styles, merged cells and conditional formats as
+        `write_to_excel`, one row at a time.
+        """
+
+        if self.r > 1:
+            self.ws.append([])
+            self.ws.append([])
+
+        self.ws.append([self.write_cell(name, 'EDA Header') for name in df.columns])
+
+        df, num_flag = self.sort_numeric_block(df)
+        rows = len(df.index)
+        labels = self.bin_labels(df['Value'].tolist()) if num_flag else None
+        columns = self.block_columns(df)
 
-        for row in range(0, len(df.index)):
+        for row in range(0, rows):
+            last = row == rows - 1
+            cells = []
             for col in range(0, len(df.columns)):
-                char = get_column_letter(self.c+col) 
-                cell = self.ws[char+str(self.r+ row+1)]
-                if (col== 3):
-                    char2 = get_column_letter(self.c + 2)
-                    cell.value = "="+char2+str(self.r+row+1)+'/SUM('+char2+ '$' + str(self.r +1)+':'+char2+ '$'+str(self.r+len(df.index))+')'
-                elif (col== 6):
-                    char2 = get_column_letter(self.c + 4)
-                    cell.value = "="+char2+str(self.r+row+1)+'/SUM('+char2+ '$' + str(self.r +1)+':'+char2+ '$'+str(self.r+len(df.index))+')'
-                elif (col== 7):
-                    char2 = get_column_letter(self.c+3)
-                    char3 = get_column_letter(self.c+6)
-                    cell.value = "="+char3 + \
-                        str(self.r+row+1)+ '/'+ char2+ str(self.r+row+1)
-                else:
-                    cell.value = df.iloc[row, col]
+                if col == 0:
+                    # the merged range takes its bottom border from the block's last row
+                    if row == 0:
+                        cells.append(self.write_cell(df.iloc[row, col], 'EDA Label End' if last else 'EDA Label'))
+                    elif last:
+                        cells.append(self.write_cell(None, 'EDA Merged End'))
+                    else:
+                        cells.append(None)
+                    continue
+
+                value = labels[row] if (col == 1 and num_flag) else columns[col][row]
+                cells.append(self.write_cell(value, _data_style(col, last)))
+            self.ws.append(cells)
+
+        char = get_column_letter(self.c)
+        self.ws.merged_cells.add(char+str(self.r+1)+':'+char+str(self.r+rows))
+        self.cond_format(start_row= self.r+1,
+                         end_row= self.r+ rows, start_col = self.c + 5, end_col=self.c+ 7)
+
+    def write_to_excel(self, df):
+        
+        """Write the DataFrame to the worksheet and apply formatting."""
 
-        # Adding a border to the last row of the data
-        last_row = self.r + len(df.index)
+        #writing header
         for col in range(0, len(df.columns)):
-            char = get_column_letter(self.c + col)
-            cell = self.ws[char + str(last_row)]
-            cell.border = thin_border
+            self.ws.cell(row= self.r, column= self.c + col, value= df.columns[col])
+
+        #sorting if numeric after replacing inf with maxsize
+
+        df, num_flag = self.sort_numeric_block(df)
+        columns = self.block_columns(df)
+
+        for col, values in enumerate(columns):
+            for row, value in enumerate(values):
+                self.ws.cell(row= self.r + row + 1, column= self.c + col, value= value)
 
+        # the last row of the data gets its bottom border from df_formatter's styles
         if num_flag:
             self.number_format(len(df.index))
 
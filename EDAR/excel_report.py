@@ -1,13 +1,29 @@
 import pandas as pd
 import numpy as np
 import os
+import re
+import json
+import warnings
 from EDAR.eda_format import EDA_Formatter 
+from EDAR.parallel import map_columns
+from EDAR.render import render_reports
+from EDAR.auc import cv_auc, sorted_values, auc_confidence_interval, fold_indices, stop_early
+from EDAR.cache import EDACache
+from EDAR.binning import quantize, hist_thresholds
+from EDAR.columnar import is_columnar, to_pandas
+from EDAR.schema import infer_schema, column_kind, as_flag, NUMERIC, FLAG, YES_NO
+from EDAR.screening import screen_columns, screen_options
+from EDAR.bivariate import bivariate_options, bivariate_tables, categorical_bins, numeric_bins
+from EDAR.profiling import Profiler, ColumnTimer, stage
 from sklearn.tree import DecisionTreeClassifier
 from sklearn import tree
 
-from sklearn.model_selection import StratifiedKFold
 from sklearn import metrics
 
+# columns of the ROC Report, the sample columns are only filled when rows are sampled and
+# "Folds" when the cross-validation may stop early, followed by the fold AUCs when asked for
+ROC_COLUMNS = ["Column", "ROC AUC", "Sample Rows", "AUC CI Low", "AUC CI High", "Folds"]
+
 class EDAExcelReport():
 
     """
@@ -15,7 +31,7 @@ class EDAExcelReport():
 
     Parameters
     ----------
-    data : pd.DataFrame
+    data : pd.DataFrame, pyarrow.Table or polars.DataFrame
         The dataset for which the report is generated.
     target : str
         The name of the target variable in the dataset.
@@ -29,6 +45,94 @@ class EDAExcelReport():
         Minimum samples per leaf for numerical data (default is 0.1).
     conditional_color : str, optional
         The color used for conditional formatting in the report (default is 'red').
+    write_raw : bool, optional
+        Write the unformatted EDA sheets to `report_path` and let the formatter read them
+        back, as in earlier versions (default is False, which formats in memory).
+    n_jobs : int, optional
+        Number of processes used for the per-column analysis, -1 for all CPUs (default is 1).
+    progress_callback : callable, optional
+        Called as `progress_callback(done, total, col)` after each column of each stage
+        (default is None).
+    auc_engine : str, optional
+        'sorted' builds the fold trees from the sorted column values, 'sklearn' fits a
+        DecisionTreeClassifier per fold (default is 'sorted').
+    write_only : bool, optional
+        Stream the formatted report to disk row by row instead of building it in memory
+        (default is False).
+    cache : str or EDACache, optional
+        A directory or `EDACache` where column results are kept between runs, so that
+        only columns whose values changed are analysed again (default is None, no cache).
+    freeze_bins : bool, optional
+        Reuse the bin edges and category encodings stored in `cache` instead of fitting
+        new ones, to follow the drift of a column against fixed bins (default is False).
+    max_rows : int, optional
+        Fit the bins and the ROC AUC on a sample of at most this many rows that keeps the
+        target rate, while the count, sum and mean of every bin still cover all rows. The
+        ROC Report then also gives the sample size and a 95% interval of the ROC AUC
+        (default is None, use every row).
+    random_state : int, optional
+        Seed of the `max_rows` sample and of the rows screened (default is 0).
+    profiler : Profiler or bool, optional
+        Records the time, memory and counts of every stage and column, True for a default
+        `Profiler`. It is kept as the `profiler` attribute (default is None).
+    formulas : bool, optional
+        Write 'Freq Distribution', '% of Total' and 'Lift' as Excel formulas. When False
+        their values are computed with pandas and written as numbers, which writes
+        faster and opens large reports without a recalculation (default is True).
+    bin_engine : str, optional
+        'sklearn' fits a DecisionTreeClassifier on every numeric column to find its bins.
+        'hist' quantizes the column once into at most 255 buckets of one byte per row and
+        grows the same tree on the bucket counts, which is faster and lighter on long
+        columns. Its bins are the same on columns with fewer distinct values, and within
+        a bucket of the tree's otherwise (default is 'sklearn').
+    sheet_rows : int, optional
+        The most rows of a Detailed EDA sheet. A longer report goes on to "Detailed EDA 2",
+        "Detailed EDA 3" and so on, a block is never split across sheets (default is
+        None, the 1,048,576 rows Excel allows).
+    render_jobs : int, optional
+        `for_targets` only: the number of files written at once in separate processes
+        when `single_workbook` is False, -1 for all CPUs (default is 1).
+    memory_limit : int, optional
+        `for_targets` only: the bytes the files being written at once may take, by
+        `EDAR.render.estimate_memory`. A file that alone exceeds it is written with a
+        write-only workbook (default is None, no limit).
+    screen : bool or dict, optional
+        Screen the columns before analysing them and skip the constant, mostly missing,
+        identifier and no-signal ones, which are listed on a "Skipped Columns" sheet.
+        True uses the thresholds of `EDAR.screening.SCREEN_DEFAULTS`, a dict overrides
+        some of them (default is None, every column is analysed).
+    cv_folds : int, optional
+        The number of stratified folds of the ROC AUC. The folds are assigned once per
+        report and shared by every column (default is 10).
+    cv_tolerance : float, optional
+        Adaptive cross-validation: stop a column, after at least 3 folds, once the 95%
+        interval of its median fold AUC is narrower than this on either side. The ROC
+        Report then gives the number of folds run under "Folds" (default is None, run
+        every fold).
+    fold_aucs : bool, optional
+        Add the AUC of every fold to the ROC Report, "AUC Fold 1", "AUC Fold 2" and so
+        on (default is False).
+    bivariate : bool, int or dict, optional
+        Add a "Bivariate EDA" sheet with the count, sum and mean of the target over the
+        bins of every pair of the columns with the highest ROC AUC, on the bins of the
+        Detailed EDA. True pairs the top 10 columns, an int sets their number and a dict
+        overrides some of `EDAR.bivariate.BIVARIATE_DEFAULTS`, such as `max_cells`, the
+        most rows of the sheet (default is None, no Bivariate EDA).
+
+    Attributes
+    ----------
+    result : EDAResult
+        The analysis behind the report, to render it again, render a single sheet or
+        save the results to Parquet or JSON without redoing the analysis.
+    grp_data : pd.DataFrame
+        The Detailed EDA results.
+    roc_data : pd.DataFrame
+        The ROC AUC results.
+    skipped_data : pd.DataFrame
+        The columns skipped by the screening, with the reason and their statistics, or
+        None without `screen`.
+    bivariate_data : pd.DataFrame
+        The Bivariate EDA, one block per pair of columns, or None without `bivariate`.
 
     Methods
     -------
@@ -37,17 +141,122 @@ class EDAExcelReport():
     
     _get_roc_auc(data, target, ignore_cols, cat_label_enco_thresh, num_min_samples_leaf)
         Calculates the ROC AUC metrics for the dataset.
+
+    _analyse_columns(data, target, ignore_cols, cat_label_enco_thresh, num_min_samples_leaf)
+        Computes the bins and the ROC AUC of every column in a single pass.
     """
 
-    def __init__(self, data, target, report_path, ignore_cols= None, cat_label_enco_thresh= 0.05, num_min_samples_leaf = 0.1, conditional_color: str = 'red' ):
+    def __init__(self, data, target, report_path, ignore_cols= None, cat_label_enco_thresh= 0.05, num_min_samples_leaf = 0.1, conditional_color: str = 'red',
+                 write_raw: bool = False, n_jobs: int = 1, progress_callback = None,
+                 auc_engine: str = 'sorted', write_only: bool = False, cache = None,
+                 freeze_bins: bool = False, max_rows: int = None, random_state: int = 0,
+                 profiler = None, formulas: bool = True, bin_engine: str = 'sklearn',
+                 sheet_rows: int = None, screen = None, cv_folds: int = 10,
+                 cv_tolerance: float = None, fold_aucs: bool = False, bivariate = None):
 
         """
         Constructs the necessary attributes for the EDAExcelReport object and generates the Excel report.
 
         Parameters
         ----------
-        data : pd.DataFrame
-            The dataset for which the report is generated.
+        data : pd.DataFrame, pyarrow.Table or polars.DataFrame
+            The dataset for which the report is generated. Arrow and polars input is
+            converted with `EDAR.columnar.to_pandas`, string columns as categoricals.
+        target : str
+            The name of the target variable in the dataset.
+        report_path : str
+            The path where the generated Excel report will be saved.
+        ignore_cols : list of str, optional
+            Columns to ignore in the analysis (default is None).
+        cat_label_enco_thresh : float, optional
+            Threshold for encoding categorical labels (default is 0.05).
+        num_min_samples_leaf : float, optional
+            Minimum samples per leaf for numerical data (default is 0.1).
+        conditional_color : str, optional
+            The color used for conditional formatting in the report (default is 'red').
+        write_raw : bool, optional
+            Write the unformatted EDA sheets to `report_path` before formatting (default is False).
+        n_jobs : int, optional
+            Number of processes used for the per-column analysis (default is 1).
+        progress_callback : callable, optional
+            Called as `progress_callback(done, total, col)` after each column (default is None).
+        auc_engine : str, optional
+            How the cross-validated ROC AUC is computed, 'sorted' or 'sklearn' (default is 'sorted').
+        write_only : bool, optional
+            Stream the formatted report to disk row by row (default is False).
+        cache : str or EDACache, optional
+            Where column results are kept between runs (default is None, no cache).
+        freeze_bins : bool, optional
+            Reuse the bin edges stored in `cache` instead of fitting new ones (default is False).
+        max_rows : int, optional
+            Fit bins and ROC AUC on a stratified sample of at most this many rows (default is None).
+        random_state : int, optional
+            Seed of the `max_rows` sample and of the rows screened (default is 0).
+        profiler : Profiler or bool, optional
+            Records the time, memory and counts of every stage and column (default is None).
+        formulas : bool, optional
+            Write 'Freq Distribution', '% of Total' and 'Lift' as Excel formulas, else as
+            precomputed values (default is True).
+        bin_engine : str, optional
+            How the bins of numeric columns are fitted, 'sklearn' or 'hist' (default is 'sklearn').
+        sheet_rows : int, optional
+            The most rows of a Detailed EDA sheet before the blocks go on to the next one
+            (default is None, as many as Excel allows).
+        screen : bool or dict, optional
+            Skip the uninformative columns found by `EDAR.screening.screen_columns`, True
+            for the default thresholds or a dict of some of them (default is None).
+        cv_folds : int, optional
+            The number of cross-validation folds of the ROC AUC (default is 10).
+        cv_tolerance : float, optional
+            Stop the cross-validation of a column once its median AUC is known to this
+            (default is None, run every fold).
+        fold_aucs : bool, optional
+            Write the AUC of every fold to the ROC Report (default is False).
+        bivariate : bool, int or dict, optional
+            Write the Bivariate EDA of the top columns by ROC AUC, True for the top 10, an
+            int for their number or a dict of `EDAR.bivariate.bivariate_options` (default
+            is None).
+        """
+
+        self.result = EDAResult(data, target, ignore_cols, cat_label_enco_thresh, num_min_samples_leaf,
+                                n_jobs= n_jobs, progress_callback= progress_callback,
+                                auc_engine= auc_engine, cache= cache, freeze_bins= freeze_bins,
+                                max_rows= max_rows, random_state= random_state, profiler= profiler,
+                                bin_engine= bin_engine, screen= screen, cv_folds= cv_folds,
+                                cv_tolerance= cv_tolerance, fold_aucs= fold_aucs,
+                                bivariate= bivariate)
+        self.profiler = self.result.profiler
+
+        # both sheets are asked for at once, so the columns are analysed in one pass
+        self.result.render_excel(report_path, conditional_color, write_raw= write_raw,
+                                 write_only= write_only, formulas= formulas, sheet_rows= sheet_rows)
+        self.grp_data = self.result.grp_data
+        self.roc_data = self.result.roc_data
+        self.skipped_data = self.result.skipped
+        self.bivariate_data = self.result.bivariate_data
+
+    @classmethod
+    def from_source(cls, source, target, report_path, ignore_cols= None, cat_label_enco_thresh= 0.05,
+                    num_min_samples_leaf = 0.1, conditional_color: str = 'red',
+                    columns_per_group: int = 50, chunksize: int = 100_000,
+                    sample_size: int = 100_000, random_state: int = 0, progress_callback = None,
+                    write_only: bool = False, profiler = None, formulas: bool = True,
+                    bin_engine: str = 'sklearn', sheet_rows: int = None):
+
+        """
+        Generates the Excel report from a file or chunks too large to load as one DataFrame.
+
+        The columns are processed a group at a time. For each group the source is read
+        in chunks: bins, missing value fills and the ROC AUC are estimated from a
+        reservoir sample of `sample_size` rows, while the count, sum and mean of every
+        bin and category are aggregated exactly over all rows.
+
+        Parameters
+        ----------
+        source : str, os.PathLike, callable or pyarrow.dataset.Dataset
+            A .csv or .parquet file, a function returning a fresh iterable of
+            DataFrame chunks each time it is called, or an Arrow dataset, which is
+            scanned a batch at a time without loading it.
         target : str
             The name of the target variable in the dataset.
         report_path : str
@@ -60,24 +269,276 @@ class EDAExcelReport():
             Minimum samples per leaf for numerical data (default is 0.1).
         conditional_color : str, optional
             The color used for conditional formatting in the report (default is 'red').
+        columns_per_group : int, optional
+            Number of columns held in memory at a time (default is 50).
+        chunksize : int, optional
+            Number of rows read per chunk from a file (default is 100,000).
+        sample_size : int, optional
+            Number of rows kept in the reservoir sample (default is 100,000).
+        random_state : int, optional
+            Seed of the reservoir sample (default is 0).
+        progress_callback : callable, optional
+            Called as `progress_callback(done, total, col)` after each column (default is None).
+        write_only : bool, optional
+            Stream the formatted report to disk row by row (default is False).
+        profiler : Profiler or bool, optional
+            Records the time, memory and counts of every stage (default is None).
+        formulas : bool, optional
+            Write 'Freq Distribution', '% of Total' and 'Lift' as Excel formulas, else as
+            precomputed values (default is True).
+        bin_engine : str, optional
+            How the bins of numeric columns are fitted, 'sklearn' or 'hist' (default is 'sklearn').
+        sheet_rows : int, optional
+            The most rows of a Detailed EDA sheet before the blocks go on to the next one
+            (default is None, as many as Excel allows).
+
+        Returns
+        -------
+        EDAExcelReport
+            The report, with `grp_data` and `roc_data` set.
+        """
+
+        from EDAR.streaming import analyse_source
+
+        if bin_engine not in ('sklearn', 'hist'):
+            raise ValueError(f"bin_engine must be 'sklearn' or 'hist', got {bin_engine!r}")
+
+        report = cls.__new__(cls)
+        report.profiler = Profiler() if profiler is True else (profiler or None)
+
+        with stage(report.profiler, 'analyse source') as info:
+            records = analyse_source(source, target, ignore_cols, cat_label_enco_thresh,
+                                     num_min_samples_leaf, columns_per_group= columns_per_group,
+                                     chunksize= chunksize, sample_size= sample_size,
+                                     random_state= random_state, progress_callback= progress_callback,
+                                     bin_engine= bin_engine)
+            info['columns'] = len(records)
+
+        with stage(report.profiler, 'build frames'):
+            report.grp_data = cls._records_to_eda(records)
+            report.roc_data = cls._records_to_roc(records)
+        report.skipped_data = None
+        report.bivariate_data = None
+        report._write_report(report_path, target, conditional_color, write_only= write_only,
+                             formulas= formulas, sheet_rows= sheet_rows)
+
+        return report
+
+    @classmethod
+    def for_targets(cls, data, targets, report_path, segment= None, ignore_cols= None,
+                    cat_label_enco_thresh= 0.05, num_min_samples_leaf = 0.1,
+                    conditional_color: str = 'red', n_jobs: int = 1, progress_callback = None,
+                    auc_engine: str = 'sorted', write_only: bool = False,
+                    single_workbook: bool = True, profiler = None, formulas: bool = True,
+                    bin_engine: str = 'sklearn', sheet_rows: int = None, render_jobs: int = 1,
+                    memory_limit: int = None, screen = None, random_state: int = 0,
+                    cv_folds: int = 10, cv_tolerance: float = None, fold_aucs: bool = False):
+
+        """
+        Generates the reports of several targets, and of every segment, in one pass over the columns.
+
+        Each column is checked for binary flags, converted or factorized and sorted once,
+        and only the bins and the ROC AUC are computed per target and segment. Numeric
+        columns are filled with the median of each segment, as separate reports would.
+
+        A segment's report can still differ from a separate report on its rows in two
+        ways:
+
+        - the columns are classified once, on all rows, so a column that is 0/1 overall
+          is binned as a Yes/No flag in every segment, even one where it holds a single
+          value and a separate report would bin it as numeric,
+        - rows without a `segment` value belong to no segment and are left out of every
+          report, with a warning.
+
+        A target and segment with fewer than `cv_folds` rows of a class get a NaN ROC AUC.
+
+        Parameters
+        ----------
+        data : pd.DataFrame, pyarrow.Table or polars.DataFrame
+            The dataset for which the reports are generated, see `EDAExcelReport`.
+        targets : list of str
+            The names of the binary target variables.
+        report_path : str
+            The path of the workbook, or the base path of the files when `single_workbook`
+            is False.
+        segment : str, optional
+            A column whose values split the rows into segments, each getting its own
+            report. Rows without a value are left out (default is None).
+        ignore_cols : list of str, optional
+            Columns to ignore in the analysis (default is None).
+        cat_label_enco_thresh : float, optional
+            Threshold for encoding categorical labels (default is 0.05).
+        num_min_samples_leaf : float, optional
+            Minimum samples per leaf for numerical data (default is 0.1).
+        conditional_color : str, optional
+            The color used for conditional formatting in the report (default is 'red').
+        n_jobs : int, optional
+            Number of processes used for the per-column analysis (default is 1).
+        progress_callback : callable, optional
+            Called as `progress_callback(done, total, col)` after each column (default is None).
+        auc_engine : str, optional
+            How the cross-validated ROC AUC is computed, 'sorted' or 'sklearn' (default is 'sorted').
+        write_only : bool, optional
+            Stream the formatted report to disk row by row (default is False).
+        single_workbook : bool, optional
+            Write one workbook with an EDA and a ROC sheet per target and segment, else one
+            file per target and segment named after them (default is True).
+        profiler : Profiler or bool, optional
+            Records the time, memory and counts of every stage (default is None).
+        formulas : bool, optional
+            Write 'Freq Distribution', '% of Total' and 'Lift' as Excel formulas, else as
+            precomputed values (default is True).
+        bin_engine : str, optional
+            How the bins of numeric columns are fitted, 'sklearn' or 'hist' (default is 'sklearn').
+        sheet_rows : int, optional
+            The most rows of a Detailed EDA sheet before the blocks go on to the next one
+            (default is None, as many as Excel allows).
+        render_jobs : int, optional
+            Number of files written at once when `single_workbook` is False, -1 for all
+            CPUs (default is 1).
+        memory_limit : int, optional
+            The bytes the files being written at once may take, see
+            `EDAR.render.render_reports` (default is None, no limit).
+        screen : bool or dict, optional
+            Skip the uninformative columns found by `EDAR.screening.screen_columns` over
+            all rows, a column only lacking signal when it has none for every target. The
+            skipped columns are listed once in the workbook, or in every file, and set as
+            `skipped_data` of every report (default is None).
+        random_state : int, optional
+            Seed of the rows sampled by the screening (default is 0).
+        cv_folds : int, optional
+            The number of cross-validation folds of the ROC AUC, assigned once per target
+            and segment and shared by every column (default is 10).
+        cv_tolerance : float, optional
+            Stop the cross-validation of a column once its median AUC is known to this
+            (default is None, run every fold).
+        fold_aucs : bool, optional
+            Write the AUC of every fold to the ROC sheets (default is False).
+
+        Returns
+        -------
+        dict
+            The report of every target and segment, keyed by `(target, segment)` with
+            segment None when there is no `segment` column.
+        """
+
+        if auc_engine not in ('sorted', 'sklearn'):
+            raise ValueError(f"auc_engine must be 'sorted' or 'sklearn', got {auc_engine!r}")
+        if bin_engine not in ('sklearn', 'hist'):
+            raise ValueError(f"bin_engine must be 'sklearn' or 'hist', got {bin_engine!r}")
+        _check_cv(cv_folds, cv_tolerance)
+
+        targets = list(targets)
+        profiler = Profiler() if profiler is True else (profiler or None)
+        if is_columnar(data):
+            with stage(profiler, 'convert input'):
+                data = to_pandas(data)
+
+        excluded = set(targets) | set(ignore_cols or []) | {segment}
+        cols = [col for col in data.columns if col not in excluded]
+
+        skipped = None
+        if screen:
+            with stage(profiler, 'screen columns', columns= len(cols)) as info:
+                cols, skipped = cls._screen(data, targets, cols, screen_options(screen), random_state)
+                info['skipped'] = len(skipped)
+
+        y = [data[target].to_numpy() for target in targets]
+        segments = None
+        if segment is not None:
+            segment_codes, segments = pd.factorize(data[segment], sort= True)
+            segments = segments.tolist()
+            missing = int((segment_codes < 0).sum())
+            if missing:
+                warnings.warn(f"{missing} rows without a {segment!r} value are left out of "
+                              f"every segment report", stacklevel= 2)
+            y.append(segment_codes)
+        y = np.column_stack(y)
+
+        with stage(profiler, 'infer schema', columns= len(cols)):
+            column_kwargs = {col: {'kind': kind} for col, kind in infer_schema(data, cols).items()}
+
+        folds = [[_group_folds(y[:, t] if rows is None else y[rows, t], cv_folds)
+                  for t in range(len(targets))]
+                 for _, rows in _segment_rows(y, segments)]
+
+        with stage(profiler, 'analyse columns', rows= len(data)) as info:
+            results = map_columns(_analyse_column_targets, data, cols, y, n_jobs, progress_callback,
+                                  column_kwargs= column_kwargs, targets= targets, cat_label_enco_thresh= cat_label_enco_thresh,
+                                  num_min_samples_leaf= num_min_samples_leaf,
+                                  auc_engine= auc_engine, segments= segments, bin_engine= bin_engine,
+                                  cv_folds= cv_folds, cv_tolerance= cv_tolerance,
+                                  fold_aucs= fold_aucs, folds= folds)
+            info['columns'] = len(cols)
+
+        keys = [(target, seg) for seg in (segments or [None]) for target in targets]
+        reports = {}
+        with stage(profiler, 'build frames', reports= len(keys)):
+            for i, key in enumerate(keys):
+                records = [column_records[i] for column_records in results]
+                report = cls.__new__(cls)
+                report.profiler = profiler
+                report.grp_data = cls._records_to_eda(records)
+                report.roc_data = cls._records_to_roc(records)
+                report.skipped_data = skipped
+                reports[key] = report
+
+        names = {key: key[0] if key[1] is None else f"{key[0]} {key[1]}" for key in keys}
+
+        if single_workbook:
+            with stage(profiler, 'format'):
+                EDA_Formatter(path = report_path, conditional_color = conditional_color,
+                              write_only = write_only, profiler = profiler, formulas = formulas,
+                              sheet_rows = sheet_rows, skipped_data = skipped,
+                              reports = [(names[key], key[0], report.grp_data, report.roc_data)
+                                         for key, report in reports.items()])
+        else:
+            jobs = []
+            for key, report in reports.items():
+                name = re.sub(r'[^\w\-. ]', '_', names[key]).replace(' ', '_')
+                jobs.append(dict(path= f"_{name}.xlsx".join(report_path.split(".xlsx")),
+                                 model_type= key[0], conditional_color= conditional_color,
+                                 grp_data= report.grp_data, roc_data= report.roc_data,
+                                 write_only= write_only, profiler= profiler, formulas= formulas,
+                                 sheet_rows= sheet_rows, skipped_data= skipped))
+            with stage(profiler, 'format', reports= len(jobs)):
+                render_reports(jobs, render_jobs, memory_limit)
+
+        return reports
+
+    def _write_report(self, report_path, target, conditional_color= 'red', write_raw= False,
+                      write_only= False, formulas= True, sheet_rows= None):
+
+        """
+        Writes `grp_data` and `roc_data` to the formatted Excel report.
+
+        Parameters
+        ----------
+        report_path : str
+            The path where the generated Excel report will be saved.
+        target : str
+            The name of the target variable in the dataset.
+        conditional_color : str, optional
+            The color used for conditional formatting in the report (default is 'red').
+        write_raw : bool, optional
+            Write the unformatted EDA sheets to `report_path` before formatting (default is False).
+        write_only : bool, optional
+            Stream the formatted report to disk row by row (default is False).
+        formulas : bool, optional
+            Write 'Freq Distribution', '% of Total' and 'Lift' as Excel formulas, else as
+            precomputed values (default is True).
+        sheet_rows : int, optional
+            The most rows of a Detailed EDA sheet (default is None, as many as Excel allows).
         """
-         
-        grp_data = self._get_full_eda(
-            data, target, ignore_cols, cat_label_enco_thresh, num_min_samples_leaf)
-        
-        roc_data = self._get_roc_auc(
-            data, target, ignore_cols, cat_label_enco_thresh, num_min_samples_leaf
-        )
-        
-        xw = pd.ExcelWriter(report_path, engine='openpyxl')
-        roc_data.to_excel(xw, sheet_name = 'ROC Report', index= False)
-        grp_data.to_excel(xw, sheet_name = 'Detailed EDA', index =  False)
-        xw.close()
-        EDA_Formatter(path =  report_path, model_type= target, 
-                      conditional_color = conditional_color)
+
+        _write_excel(report_path, target, self.grp_data, self.roc_data, conditional_color,
+                     write_raw, write_only, getattr(self, 'profiler', None), formulas= formulas,
+                     sheet_rows= sheet_rows, skipped_data= getattr(self, 'skipped_data', None),
+                     bivariate_data= getattr(self, 'bivariate_data', None))
 
     
-    def _get_full_eda(self, data, target, ignore_cols= None, cat_label_enco_thresh= 0.05, num_min_samples_leaf =0.01):
+    def _get_full_eda(self, data, target, ignore_cols= None, cat_label_enco_thresh= 0.05, num_min_samples_leaf =0.01,
+                      n_jobs= 1, progress_callback= None, bin_engine= 'sklearn'):
 
         """
         Performs a detailed exploratory data analysis on the dataset.
@@ -94,6 +555,12 @@ class EDAExcelReport():
             Threshold for encoding categorical labels.
         num_min_samples_leaf : float
             Minimum samples per leaf for numerical data.
+        n_jobs : int, optional
+            Number of processes used across columns (default is 1).
+        progress_callback : callable, optional
+            Called as `progress_callback(done, total, col)` after each column (default is None).
+        bin_engine : str, optional
+            How the bins of numeric columns are fitted, 'sklearn' or 'hist' (default is 'sklearn').
 
         Returns
         -------
@@ -102,74 +569,70 @@ class EDAExcelReport():
         """
 
 
-        cols = data.columns.tolist()
-        cols.remove(target)
-
-
-
-        if ignore_cols is not None:
-            cols= [col for col in cols if col not in ignore_cols]
-        
-        y = data[target].copy()
+        records = self._analyse_columns(
+            data, target, ignore_cols, cat_label_enco_thresh, num_min_samples_leaf,
+            n_jobs= n_jobs, progress_callback= progress_callback, bin_engine= bin_engine)
 
-        # Check for binary columns and replace 0 with "No" and 1 with "Yes"
-        for col in cols:
-            unique_values = set(data[col].dropna().unique())
-            if unique_values == {0, 1}:
-                data[col] = data[col].map({0: "No", 1: "Yes"}).fillna("No" if 0 in unique_values else "Yes")
-            elif unique_values == {'Y', 'N'}:
-                data[col] = data[col].map({'Y': "Yes", 'N': "No"}).fillna("No" if 'N' in unique_values else "Yes")
+        return self._records_to_eda(records)
+    
 
-        # EDA
+    def _get_roc_auc(self, data, target, ignore_cols= None, cat_label_enco_thresh= 0.05, num_min_smaples_leaf = 0.1,
+                     n_jobs= 1, progress_callback= None, auc_engine= 'sorted'):
 
-        all_grp_dfs = []
+        """
+        Calculates the ROC AUC metrics for the dataset.
 
-        for col in cols:
+        Parameters
+        ----------
+        data : pd.DataFrame
+            The dataset for which the ROC AUC is calculated.
+        target : str
+            The name of the target variable in the dataset.
+        ignore_cols : list of str
+            Columns to ignore in the analysis.
+        cat_label_enco_thresh : float
+            Threshold for encoding categorical labels.
+        num_min_samples_leaf : float
+            Minimum samples per leaf for numerical data.
+        n_jobs : int, optional
+            Number of processes used across columns (default is 1).
+        progress_callback : callable, optional
+            Called as `progress_callback(done, total, col)` after each column (default is None).
+        auc_engine : str, optional
+            How the cross-validated ROC AUC is computed, 'sorted' or 'sklearn' (default is 'sorted').
 
-            #numeric
-            isnum = str(data[col].dtype).startswith('float') | str(data[col].dtype).startswith('int')
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame containing the ROC AUC metrics.
+        """
 
-            if isnum:
-                X = np.array(data[col].fillna(data[col].median()
-                                              ).values.tolist()).reshape(-1,1)
-                dt =  DecisionTreeClassifier(class_weight='balanced', min_samples_leaf= num_min_samples_leaf)
-                dt.fit(X, y)
-
-                thresholds = np.sort(np.unique(dt.tree_.threshold))
-                thresholds = np.append(thresholds, np.inf)
-                X = np.digitize(X, thresholds, right= True)
-
-                x_map = dict(enumerate(map(str, thresholds)))
-
-                grp_df = pd.DataFrame(X, columns= [col])
-                grp_df[col] = grp_df[col].replace(x_map)
-                grp_df[target] = y
-
-                grp_df = grp_df.groupby(col)[target].agg(
-                ['count', 'sum', 'mean']).reset_index()
-                grp_df.insert(0, 'Column', col)
-                grp_df = grp_df.rename(columns = {col: "value"})
-        
-            else:
-                grp_df  = data.groupby(col)[target].agg(
-                    ['count', 'sum', 'mean']).reset_index()
-                grp_df.insert(0, 'Column', col)
-                grp_df = grp_df.rename(columns = {col: "value"})
+        records = self._analyse_columns(
+            data, target, ignore_cols, cat_label_enco_thresh, num_min_smaples_leaf,
+            n_jobs= n_jobs, progress_callback= progress_callback, auc_engine= auc_engine)
 
-            all_grp_dfs.append(grp_df)
+        return self._records_to_roc(records)
 
-        return pd.concat(all_grp_dfs)
-    
 
-    def _get_roc_auc(self, data, target, ignore_cols= None, cat_label_enco_thresh= 0.05, num_min_smaples_leaf = 0.1):
+    @classmethod
+    def _analyse_columns(cls, data, target, ignore_cols= None, cat_label_enco_thresh= 0.05,
+                         num_min_samples_leaf= 0.1, n_jobs= 1, progress_callback= None,
+                         auc_engine= 'sorted', cache= None, freeze_bins= False, max_rows= None,
+                         random_state= 0, profiler= None, bins= True, auc= True,
+                         bin_engine= 'sklearn', schema= None, cv_folds= 10, cv_tolerance= None,
+                         fold_aucs= False):
 
         """
-        Calculates the ROC AUC metrics for the dataset.
+        Runs the per-column analysis that feeds both the Detailed EDA and the ROC Report.
+
+        With a cache, a column is only analysed when no result is stored for its name,
+        dtype and values, the target and the parameters. The cache holds complete records,
+        so `bins` and `auc` are ignored when it is used.
 
         Parameters
         ----------
         data : pd.DataFrame
-            The dataset for which the ROC AUC is calculated.
+            The dataset to analyse.
         target : str
             The name of the target variable in the dataset.
         ignore_cols : list of str
@@ -178,81 +641,1420 @@ class EDAExcelReport():
             Threshold for encoding categorical labels.
         num_min_samples_leaf : float
             Minimum samples per leaf for numerical data.
+        n_jobs : int, optional
+            Number of processes used across columns (default is 1).
+        progress_callback : callable, optional
+            Called as `progress_callback(done, total, col)` after each column (default is None).
+        auc_engine : str, optional
+            How the cross-validated ROC AUC is computed, 'sorted' or 'sklearn' (default is 'sorted').
+        cache : str or EDACache, optional
+            Where column results are kept between runs (default is None, no cache).
+        freeze_bins : bool, optional
+            Reuse the bin edges stored in `cache` instead of fitting new ones (default is False).
+        max_rows : int, optional
+            Fit bins and ROC AUC on a stratified sample of at most this many rows (default is None).
+        random_state : int, optional
+            Seed of the `max_rows` sample (default is 0).
+        profiler : Profiler, optional
+            Receives the profile of every column and flags the slow ones (default is None).
+        bins : bool, optional
+            Compute the bin table of every column (default is True).
+        auc : bool, optional
+            Compute the ROC AUC of every column (default is True).
+        bin_engine : str, optional
+            How the bins of numeric columns are fitted, 'sklearn' or 'hist' (default is 'sklearn').
+        schema : dict, optional
+            The kind of every column from `EDAR.schema.infer_schema` (default is None,
+            inferred here).
+        cv_folds : int, optional
+            The number of cross-validation folds, assigned once for all columns (default
+            is 10).
+        cv_tolerance : float, optional
+            Stop the cross-validation of a column once its median AUC is known to this
+            (default is None, run every fold).
+        fold_aucs : bool, optional
+            Add the AUC of every fold to the records (default is False).
 
         Returns
         -------
-        pd.DataFrame
-            DataFrame containing the ROC AUC metrics.
+        list of dict
+            One record per column, see `_analyse_column`. With `max_rows` and `auc`, the
+            records also hold the sample size under "Sample Rows" and the ROC AUC interval
+            under "AUC CI Low" and "AUC CI High".
         """
 
-        # get all required columns
+        if auc_engine not in ('sorted', 'sklearn'):
+            raise ValueError(f"auc_engine must be 'sorted' or 'sklearn', got {auc_engine!r}")
+        if bin_engine not in ('sklearn', 'hist'):
+            raise ValueError(f"bin_engine must be 'sklearn' or 'hist', got {bin_engine!r}")
+        _check_cv(cv_folds, cv_tolerance)
+
+        cols = cls._analysis_columns(data, target, ignore_cols)
+        if schema is None:
+            schema = infer_schema(data, cols)
+
+        y = data[target].copy()
+        params = dict(target= target, cat_label_enco_thresh= cat_label_enco_thresh,
+                      num_min_samples_leaf= num_min_samples_leaf, auc_engine= auc_engine,
+                      bin_engine= bin_engine, cv_folds= cv_folds, cv_tolerance= cv_tolerance,
+                      fold_aucs= fold_aucs)
+
+        sample = None
+        if max_rows is not None and len(y) > max_rows:
+            sample = _stratified_sample(y.to_numpy(), max_rows, random_state)
+
+        # the folds only depend on the target, so they are assigned once for every column
+        folds = None
+        if auc or cache is not None:
+            folds = fold_indices(y.to_numpy() if sample is None else y.to_numpy()[sample], cv_folds)
+
+        profile = {}
+        if profiler is not None:
+            profile = dict(profile= True, trace_memory= profiler.trace_memory)
+
+        if cache is None:
+            column_kwargs = {col: {'kind': schema.get(col)} for col in cols}
+            records = map_columns(_analyse_column, data, cols, y, n_jobs, progress_callback,
+                                  column_kwargs= column_kwargs, sample= sample, bins= bins, auc= auc,
+                                  folds= folds, **profile, **params)
+        else:
+            auc = True
+            records = cls._cached_columns(data, cols, y, cache, freeze_bins, n_jobs,
+                                           progress_callback, sample, (max_rows, random_state),
+                                           profile, schema, folds, **params)
+
+        if profiler is not None:
+            for record in records:
+                profiler.add_column(record["Column"], record.get("profile", {}))
+            profiler.flag_slow_columns()
+
+        if max_rows is not None and auc:
+            y_sample = y.to_numpy() if sample is None else y.to_numpy()[sample]
+            n_pos = int((y_sample == np.unique(y_sample)[-1]).sum())
+            for record in records:
+                low, high = auc_confidence_interval(record["ROC AUC"], n_pos, len(y_sample) - n_pos)
+                record.update({"Sample Rows": len(y_sample), "AUC CI Low": low, "AUC CI High": high})
+
+        return records
+
+    @staticmethod
+    def _analysis_columns(data, target, ignore_cols= None):
+        """Lists the columns of `data` that are analysed, all but the target and `ignore_cols`."""
         cols = data.columns.tolist()
         cols.remove(target)
 
         if ignore_cols is not None:
             cols = [col for col in cols if col not in ignore_cols]
+        return cols
 
-        y = data[target].copy()
+    @staticmethod
+    def _screen(data, targets, cols, options, random_state= 0):
 
-        #EDA
-        all_auc_dfs = []
+        """
+        Screens the columns against one or more targets, see `EDAR.screening.screen_columns`.
 
-        for col in cols:
+        Parameters
+        ----------
+        data : pd.DataFrame
+            The dataset.
+        targets : str or list of str
+            The target, or the targets a column must lack signal for to be skipped.
+        cols : list of str
+            The columns to screen.
+        options : dict
+            The thresholds, see `EDAR.screening.screen_options`.
+        random_state : int, optional
+            Seed of the rows the splits are computed on, stratified on the first target
+            (default is 0).
+
+        Returns
+        -------
+        tuple of (list of str, pd.DataFrame)
+            The columns to analyse and the Skipped columns table.
+        """
+
+        targets = [targets] if isinstance(targets, str) else list(targets)
+        y = [data[target].to_numpy() for target in targets]
+        positive = np.column_stack([y_t == np.unique(y_t)[-1] for y_t in y])
+
+        rows = None
+        if options['sample_rows'] is not None and len(data) > options['sample_rows']:
+            rows = _stratified_sample(y[0], options['sample_rows'], random_state)
+
+        return screen_columns(data, cols, positive, options, rows)
+
+    @staticmethod
+    def _bivariate(data, target, records, schema, top_k= 10, max_cells= 50_000, n_jobs= 1):
+
+        """
+        Builds the Bivariate EDA of the columns with the highest ROC AUC, see
+        `EDAR.bivariate.bivariate_tables`.
+
+        Numeric columns are binned on the edges of their Detailed EDA block, with missing
+        values filled as there, and categorical columns on their levels, without the
+        missing rows.
 
-            #numeric
-            isnum = str(data[col].dtype).startswith('float') | str(data[col].dtype).startswith('int')
+        Parameters
+        ----------
+        data : pd.DataFrame
+            The dataset.
+        target : str
+            The name of the target variable.
+        records : list of dict
+            The column records with their bins and ROC AUC, see `_analyse_columns`.
+        schema : dict
+            The kind of every column, see `EDAR.schema.infer_schema`.
+        top_k : int, optional
+            The number of columns paired (default is 10).
+        max_cells : int, optional
+            The most rows of the Bivariate EDA (default is 50,000).
+        n_jobs : int, optional
+            The number of threads the pairs are computed in (default is 1).
+
+        Returns
+        -------
+        tuple of (pd.DataFrame, int)
+            The Bivariate EDA and the number of pairs left out by `max_cells`.
+        """
 
+        # a missing ROC AUC ranks last
+        ranked = sorted(records, key= lambda record: (np.isnan(record["ROC AUC"]), -record["ROC AUC"]))
+
+        columns = []
+        for record in ranked[:top_k]:
+            col = record["Column"]
+            x, isnum = _prepare_column(data[col], schema.get(col))
             if isnum:
-                X = np.array(data[col].fillna(data[col].median()
-                                              ).values.tolist()).reshape(-1,1)
-                dt =  DecisionTreeClassifier(class_weight='balanced', min_samples_leaf= num_min_smaples_leaf)
+                edges = np.sort(pd.to_numeric(record["bins"]["value"]).to_numpy(dtype= np.float64))
+                codes, labels = numeric_bins(_numeric_values(x), edges)
             else:
-                X = np.array(data[col].fillna(data[col].mode()[0]
-                                              ).values.tolist()).reshape(-1,1)
-                
-                label_enc = {}
-                i = 0
-
-                for unx in np.unique(X):
-                    rate = np.where(X== unx, 1, 0).sum()/ len(X)
-                    
-                    if rate >= cat_label_enco_thresh:
-                        i = i+1
-                        label_enc.update({unx: i})
-                    else:
-                        label_enc.update({unx: 0})
-
-                map_label_enc = np.vectorize(label_enc.get)
-
-                X = map_label_enc(X)
-                dt = DecisionTreeClassifier(class_weight='balanced')
-
-            #K-fold decision tree classifier
-
-            kf =  StratifiedKFold(n_splits= 10, random_state= None, shuffle= False)
-            results = []
-            i = 0
-
-            for train_index, test_index in kf.split(X, y):
-                X_train, X_test = X[train_index], X[test_index]
-                y_train, y_test = y.iloc[train_index], y.iloc[test_index]
-                i = i +1
-                dt.fit(X_train, y_train)
-                yproba = dt.predict_proba(X_test)
-                auc = metrics.roc_auc_score(y_test, yproba[:, 1])
-                results.append(auc)
-
-            all_auc_dfs.append({
-                "Column": col,
-                "ROC AUC": np.median(results)
-            })
+                codes, labels = categorical_bins(_column_codes(x))
+            columns.append((col, codes, labels))
+
+        return bivariate_tables(columns, data[target].to_numpy(), max_cells, n_jobs)
+
+    @staticmethod
+    def _cached_columns(data, cols, y, cache, freeze_bins, n_jobs, progress_callback,
+                        sample, sample_params, profile, schema, folds, **params):
+
+        """
+        Runs `_analyse_column` on the columns without a result in `cache` and stores them.
+
+        Parameters
+        ----------
+        data : pd.DataFrame
+            The dataset to analyse.
+        cols : list of str
+            The columns to analyse.
+        y : pd.Series
+            The target values.
+        cache : str or EDACache
+            Where column results are kept between runs.
+        freeze_bins : bool
+            Reuse the bin edges stored in `cache` instead of fitting new ones.
+        n_jobs : int
+            Number of processes used across columns.
+        progress_callback : callable
+            Called as `progress_callback(done, total, col)` after each column, or None.
+        sample : np.ndarray
+            The rows the bins and ROC AUC are fitted on, or None for all rows.
+        sample_params : tuple
+            The options that chose `sample`, part of the cache key.
+        profile : dict
+            The profiling options passed on to `_analyse_column`.
+        schema : dict
+            The kind of every column, passed on to `_analyse_column`.
+        folds : np.ndarray
+            The test fold of every fitted row, passed on to `_analyse_column`.
+        **params
+            Passed on to `_analyse_column`.
+
+        Returns
+        -------
+        list of dict
+            One record per column, in the order of `cols`.
+        """
+
+        target = params['target']
+
+        if not isinstance(cache, EDACache):
+            cache = EDACache(cache)
+
+        target_print = cache.fingerprint(y)
+        records = {}
+        keys = {}
+        column_kwargs = {}
+
+        for col in cols:
+            dtype = str(data[col].dtype)
+            edges_key = cache.make_key(col, dtype, target, params['cat_label_enco_thresh'],
+                                       params['num_min_samples_leaf'])
+            edges = cache.get_edges(edges_key) if freeze_bins else None
+
+            key = cache.make_key(col, dtype, cache.fingerprint(data[col]), target_print,
+                                 sorted(params.items()), sample_params, edges)
+            keys[col] = (key, edges_key)
+
+            record = cache.get(key)
+            if record is not None:
+                record["profile"] = {"cached": True, "bins": len(record["bins"])}
+                records[col] = record
+                continue
+            column_kwargs[col] = {'kind': schema.get(col)}
+            if edges is not None:
+                column_kwargs[col]['edges'] = edges
+
+        todo = [col for col in cols if col not in records]
+
+        callback = None
+        if progress_callback is not None:
+            hits = len(records)
+            for i, col in enumerate(col for col in cols if col in records):
+                progress_callback(i + 1, len(cols), col)
+            callback = lambda done, total, col: progress_callback(hits + done, len(cols), col)
+
+        for col, record in zip(todo, map_columns(_analyse_column, data, todo, y, n_jobs, callback,
+                                                 column_kwargs= column_kwargs, sample= sample,
+                                                 folds= folds, **profile, **params)):
+            key, edges_key = keys[col]
+            cache.put(key, record, evict= False)
+            if 'edges' not in column_kwargs[col]:
+                cache.put_edges(edges_key, record["edges"])
+            records[col] = record
+
+        # one scan of the cache per run, not one per stored column
+        if todo:
+            cache.evict()
+
+        return [records[col] for col in cols]
+
+    @staticmethod
+    def _records_to_eda(records):
+        """Stacks the bin tables of the column records into the Detailed EDA frame."""
+        return pd.concat([record["bins"] for record in records])
+
+    @staticmethod
+    def _records_to_roc(records):
+        """Collects the ROC AUC of the column records into the ROC Report frame."""
+        folds = max((int(key.split()[-1]) for record in records for key in record
+                     if key.startswith("AUC Fold ")), default= 0)
+        columns = ROC_COLUMNS + [f"AUC Fold {k}" for k in range(1, folds + 1)]
+        roc = pd.DataFrame([{key: record[key] for key in columns if key in record}
+                            for record in records])
+        # in the order of `columns`, whichever record has the most folds
+        return roc[[key for key in columns if key in roc.columns]]
+
+
+class EDAResult():
+
+    """
+    The per-column analysis of a dataset, computed when its results are first used.
+
+    Creating it does no work. `grp_data` runs only the binning of every column and
+    `roc_data` only the cross-validated ROC AUC, and each is kept once computed. The
+    outputs ask for the frames they write, so when both are needed and neither is
+    computed yet, they come from a single pass over the columns. The same analysis can
+    then be rendered as often as needed, or saved without Excel at all. The columns are
+    classified once, in `schema`, and both passes reuse it.
+
+    Parameters
+    ----------
+    data : pd.DataFrame, pyarrow.Table or polars.DataFrame
+        The dataset to analyse. Arrow and polars input is converted with
+        `EDAR.columnar.to_pandas`, without copying numeric columns, and kept as `data`.
+    target : str
+        The name of the target variable in the dataset.
+    ignore_cols : list of str, optional
+        Columns to ignore in the analysis (default is None).
+    cat_label_enco_thresh : float, optional
+        Threshold for encoding categorical labels (default is 0.05).
+    num_min_samples_leaf : float, optional
+        Minimum samples per leaf for numerical data (default is 0.1).
+    n_jobs : int, optional
+        Number of processes used for the per-column analysis (default is 1).
+    progress_callback : callable, optional
+        Called as `progress_callback(done, total, col)` after each column (default is None).
+    auc_engine : str, optional
+        How the cross-validated ROC AUC is computed, 'sorted' or 'sklearn' (default is 'sorted').
+    cache : str or EDACache, optional
+        Where column results are kept between runs. The cache holds both results of a
+        column, so they are always computed together (default is None, no cache).
+    freeze_bins : bool, optional
+        Reuse the bin edges stored in `cache` instead of fitting new ones (default is False).
+    max_rows : int, optional
+        Fit bins and ROC AUC on a stratified sample of at most this many rows (default is None).
+    random_state : int, optional
+        Seed of the `max_rows` sample and of the rows screened (default is 0).
+    profiler : Profiler or bool, optional
+        Records the time, memory and counts of every stage and column, True for a default
+        `Profiler` (default is None).
+    bin_engine : str, optional
+        How the bins of numeric columns are fitted, 'sklearn' or 'hist' (default is 'sklearn').
+    screen : bool or dict, optional
+        Skip the uninformative columns found by `EDAR.screening.screen_columns` before
+        any other work, True for the default thresholds or a dict of some of them. The
+        skipped columns are listed in `skipped` (default is None).
+    cv_folds : int, optional
+        The number of cross-validation folds of the ROC AUC, assigned once for all
+        columns (default is 10).
+    cv_tolerance : float, optional
+        Stop the cross-validation of a column once its median AUC is known to this, see
+        `EDAR.auc.cv_auc` (default is None, run every fold).
+    fold_aucs : bool, optional
+        Add the AUC of every fold to `roc_data` (default is False).
+    bivariate : bool, int or dict, optional
+        Compute `bivariate_data` from the top columns by ROC AUC and write it to a
+        "Bivariate EDA" sheet with the Detailed EDA, True for the top 10, an int for their
+        number or a dict of `EDAR.bivariate.bivariate_options` (default is None).
+
+    Methods
+    -------
+    render_excel(report_path, conditional_color, sheets, write_raw, write_only, formulas)
+        Writes the formatted Excel report.
+    to_parquet(eda_path, roc_path)
+        Writes the Detailed EDA and/or the ROC Report to Parquet files.
+    to_json(path, sheets)
+        Serialises the Detailed EDA and/or the ROC Report to JSON.
+    """
+
+    def __init__(self, data, target, ignore_cols= None, cat_label_enco_thresh= 0.05,
+                 num_min_samples_leaf= 0.1, n_jobs: int = 1, progress_callback = None,
+                 auc_engine: str = 'sorted', cache = None, freeze_bins: bool = False,
+                 max_rows: int = None, random_state: int = 0, profiler = None,
+                 bin_engine: str = 'sklearn', screen = None, cv_folds: int = 10,
+                 cv_tolerance: float = None, fold_aucs: bool = False, bivariate = None):
+
+        if auc_engine not in ('sorted', 'sklearn'):
+            raise ValueError(f"auc_engine must be 'sorted' or 'sklearn', got {auc_engine!r}")
+        if bin_engine not in ('sklearn', 'hist'):
+            raise ValueError(f"bin_engine must be 'sklearn' or 'hist', got {bin_engine!r}")
+
+        _check_cv(cv_folds, cv_tolerance)
+
+        self.profiler = Profiler() if profiler is True else (profiler or None)
+        if is_columnar(data):
+            with stage(self.profiler, 'convert input'):
+                data = to_pandas(data)
+        self.data = data
+        self.target = target
+        self.params = dict(ignore_cols= ignore_cols, cat_label_enco_thresh= cat_label_enco_thresh,
+                           num_min_samples_leaf= num_min_samples_leaf, n_jobs= n_jobs,
+                           progress_callback= progress_callback, auc_engine= auc_engine,
+                           cache= cache, freeze_bins= freeze_bins, max_rows= max_rows,
+                           random_state= random_state, bin_engine= bin_engine, cv_folds= cv_folds,
+                           cv_tolerance= cv_tolerance, fold_aucs= fold_aucs)
+        self.screen = screen_options(screen) if screen else None
+        self.bivariate = bivariate_options(bivariate) if bivariate else None
+        self._skipped = None
+        self._bivariate_data = None
+        self._schema = None
+        self._records = None
+        self._parts = set()
+        self._grp_data = None
+        self._roc_data = None
+
+    def _column_records(self, bins= True, auc= True):
+
+        """
+        Returns the column records, analysing the columns for the parts not computed yet.
+
+        Parameters
+        ----------
+        bins : bool, optional
+            The bin tables are needed (default is True).
+        auc : bool, optional
+            The ROC AUCs are needed (default is True).
+
+        Returns
+        -------
+        list of dict
+            One record per column, see `EDAExcelReport._analyse_columns`.
+        """
+
+        bins = bins and 'bins' not in self._parts
+        auc = auc and 'auc' not in self._parts
+        if not (bins or auc):
+            return self._records
+        if self.params['cache'] is not None:
+            bins = auc = True
+
+        with stage(self.profiler, 'analyse columns', rows= len(self.data), bins= bins, auc= auc) as info:
+            params = dict(self.params, ignore_cols= self._ignored_columns())
+            records = EDAExcelReport._analyse_columns(self.data, self.target, profiler= self.profiler,
+                                                      bins= bins, auc= auc, schema= self.schema,
+                                                      **params)
+            info['columns'] = len(records)
+
+        if self._records is None:
+            self._records = records
+        else:
+            for record, new in zip(self._records, records):
+                record.update(new)
+        self._parts.update(part for part, done in (('bins', bins), ('auc', auc)) if done)
+
+        return self._records
+
+    def _ignored_columns(self):
+        """The columns left out of the analysis, `ignore_cols` and those the screening skipped."""
+        ignored = list(self.params['ignore_cols'] or [])
+        if self.skipped is not None:
+            ignored += self.skipped["Column"].tolist()
+        return ignored
+
+    @property
+    def skipped(self):
+        """The columns skipped by the screening, see `EDAR.screening.screen_columns`, None without it."""
+        if self.screen is not None and self._skipped is None:
+            cols = EDAExcelReport._analysis_columns(self.data, self.target, self.params['ignore_cols'])
+            with stage(self.profiler, 'screen columns', columns= len(cols)) as info:
+                kept, self._skipped = EDAExcelReport._screen(self.data, self.target, cols, self.screen,
+                                                             self.params['random_state'])
+                info['skipped'] = len(self._skipped)
+            if not kept:
+                raise ValueError(f"The screening skipped every column: {self._skipped.to_dict('records')}")
+        return self._skipped
+
+    @property
+    def schema(self):
+        """The kind of every analysed column, see `EDAR.schema.infer_schema`."""
+        if self._schema is None:
+            cols = EDAExcelReport._analysis_columns(self.data, self.target, self._ignored_columns())
+            with stage(self.profiler, 'infer schema', columns= len(cols)):
+                self._schema = infer_schema(self.data, cols)
+        return self._schema
+
+    @property
+    def grp_data(self):
+        """The Detailed EDA frame, the bin table of every column."""
+        if self._grp_data is None:
+            records = self._column_records(auc= False)
+            with stage(self.profiler, 'build frames', sheet= 'eda'):
+                self._grp_data = EDAExcelReport._records_to_eda(records)
+        return self._grp_data
+
+    @property
+    def roc_data(self):
+        """The ROC Report frame, the cross-validated ROC AUC of every column."""
+        if self._roc_data is None:
+            records = self._column_records(bins= False)
+            with stage(self.profiler, 'build frames', sheet= 'roc'):
+                self._roc_data = EDAExcelReport._records_to_roc(records)
+        return self._roc_data
+
+    @property
+    def bivariate_data(self):
+        """The Bivariate EDA frame of the top columns by ROC AUC, None without `bivariate`."""
+        if self.bivariate is not None and self._bivariate_data is None:
+            records = self._column_records()
+            with stage(self.profiler, 'bivariate', columns= min(self.bivariate['top_k'], len(records))) as info:
+                self._bivariate_data, dropped = EDAExcelReport._bivariate(
+                    self.data, self.target, records, self.schema, n_jobs= self.params['n_jobs'],
+                    **self.bivariate)
+                info['rows'] = len(self._bivariate_data)
+                info['dropped_pairs'] = dropped
+        return self._bivariate_data
+
+    def _frames(self, sheets):
+        """Returns the frames of the sheets asked for, None for the others, analysing once."""
+        sheets = tuple(sheets)
+        if not sheets or set(sheets) - {'eda', 'roc'}:
+            raise ValueError(f"sheets must hold 'eda' and/or 'roc', got {sheets!r}")
+        self._column_records(bins= 'eda' in sheets, auc= 'roc' in sheets)
+        return (self.grp_data if 'eda' in sheets else None,
+                self.roc_data if 'roc' in sheets else None)
+
+    def render_excel(self, report_path, conditional_color: str = 'red', sheets= ('eda', 'roc'),
+                     write_raw: bool = False, write_only: bool = False, formulas: bool = True,
+                     sheet_rows: int = None):
+
+        """
+        Writes the formatted Excel report.
+
+        Parameters
+        ----------
+        report_path : str
+            The path of the report, a timestamp is added to the file name.
+        conditional_color : str, optional
+            The color used for conditional formatting in the report (default is 'red').
+        sheets : tuple of str, optional
+            The sheets to write, 'eda' for the Detailed EDA and 'roc' for the ROC Report.
+            Only the results of these sheets are computed, and the Bivariate EDA is
+            written with the Detailed EDA (default is both).
+        write_raw : bool, optional
+            Write the unformatted sheets to `report_path` before formatting (default is False).
+        write_only : bool, optional
+            Stream the formatted report to disk row by row (default is False).
+        formulas : bool, optional
+            Write 'Freq Distribution', '% of Total' and 'Lift' as Excel formulas, else as
+            precomputed values (default is True).
+        sheet_rows : int, optional
+            The most rows of a Detailed EDA sheet before the blocks go on to the next one
+            (default is None, as many as Excel allows).
+
+        Returns
+        -------
+        str
+            The path of the formatted report.
+        """
+
+        grp_data, roc_data = self._frames(sheets)
+        return _write_excel(report_path, self.target, grp_data, roc_data, conditional_color,
+                            write_raw, write_only, self.profiler, tuple(sheets), formulas, sheet_rows,
+                            self.skipped, self.bivariate_data if 'eda' in sheets else None)
+
+    def to_parquet(self, eda_path= None, roc_path= None):
+
+        """
+        Writes the Detailed EDA and/or the ROC Report to Parquet files, needs pyarrow.
+
+        Parameters
+        ----------
+        eda_path : str, optional
+            The file of the Detailed EDA, not computed when None (default is None).
+        roc_path : str, optional
+            The file of the ROC Report, not computed when None (default is None).
+        """
+
+        if eda_path is None and roc_path is None:
+            raise ValueError("pass eda_path, roc_path or both")
+
+        sheets = [sheet for sheet, path in (('eda', eda_path), ('roc', roc_path)) if path is not None]
+        grp_data, roc_data = self._frames(sheets)
+
+        with stage(self.profiler, 'write parquet'):
+            if grp_data is not None:
+                grp_data.reset_index(drop= True).to_parquet(eda_path, index= False)
+            if roc_data is not None:
+                roc_data.to_parquet(roc_path, index= False)
+
+    def to_json(self, path= None, sheets= ('eda', 'roc')):
+
+        """
+        Serialises the Detailed EDA and/or the ROC Report to JSON.
+
+        Parameters
+        ----------
+        path : str, optional
+            A file to write the JSON to (default is None).
+        sheets : tuple of str, optional
+            The frames to include, 'eda' and/or 'roc'. Only these are computed (default
+            is both).
+
+        Returns
+        -------
+        str
+            A JSON object with the rows of each frame, as a list of objects, under "eda"
+            and "roc". Missing values are null.
+        """
+
+        frames = dict(zip(('eda', 'roc'), self._frames(sheets)))
+        text = json.dumps({sheet: json.loads(frame.to_json(orient= 'records'))
+                           for sheet, frame in frames.items() if frame is not None}, indent= 2)
+        if path is not None:
+            with open(path, 'w', encoding= 'utf-8') as f:
+                f.write(text)
+        return text
+
+
+def _write_excel(report_path, target, grp_data, roc_data, conditional_color= 'red', write_raw= False,
+                 write_only= False, profiler= None, sheets= ('eda', 'roc'), formulas= True,
+                 sheet_rows= None, skipped_data= None, bivariate_data= None):
+
+    """
+    Writes the Detailed EDA and ROC Report frames to the formatted Excel report.
+
+    Parameters
+    ----------
+    report_path : str
+        The path where the generated Excel report will be saved.
+    target : str
+        The name of the target variable in the dataset.
+    grp_data : pd.DataFrame
+        The Detailed EDA results, or None when the sheet is not written.
+    roc_data : pd.DataFrame
+        The ROC AUC results, or None when the sheet is not written.
+    conditional_color : str, optional
+        The color used for conditional formatting in the report (default is 'red').
+    write_raw : bool, optional
+        Write the unformatted sheets to `report_path` before formatting (default is False).
+    write_only : bool, optional
+        Stream the formatted report to disk row by row (default is False).
+    profiler : Profiler, optional
+        Records the time of the writing stages (default is None).
+    sheets : tuple of str, optional
+        The sheets to write, 'eda' and/or 'roc' (default is both).
+    formulas : bool, optional
+        Write 'Freq Distribution', '% of Total' and 'Lift' as Excel formulas, else as
+        precomputed values (default is True).
+    sheet_rows : int, optional
+        The most rows of a Detailed EDA sheet (default is None, as many as Excel allows).
+    skipped_data : pd.DataFrame, optional
+        The columns skipped by the screening, written to a "Skipped Columns" sheet
+        (default is None).
+    bivariate_data : pd.DataFrame, optional
+        The Bivariate EDA, written to a "Bivariate EDA" sheet (default is None).
+
+    Returns
+    -------
+    str
+        The path of the formatted report.
+    """
+
+    if write_raw:
+        with stage(profiler, 'write raw', rows= 0 if grp_data is None else len(grp_data)):
+            xw = pd.ExcelWriter(report_path, engine='openpyxl')
+            if roc_data is not None:
+                roc_data.to_excel(xw, sheet_name = 'ROC Report', index= False)
+            if grp_data is not None:
+                grp_data.to_excel(xw, sheet_name = 'Detailed EDA', index =  False)
+            xw.close()
+        with stage(profiler, 'format'):
+            formatter = EDA_Formatter(path =  report_path, model_type= target,
+                                      conditional_color = conditional_color, write_only = write_only,
+                                      profiler = profiler, sheets = sheets, formulas = formulas,
+                                      sheet_rows = sheet_rows, skipped_data = skipped_data,
+                                      bivariate_data = bivariate_data)
+    else:
+        with stage(profiler, 'format'):
+            formatter = EDA_Formatter(path =  report_path, model_type= target,
+                                      conditional_color = conditional_color,
+                                      grp_data = grp_data, roc_data = roc_data,
+                                      write_only = write_only, profiler = profiler, sheets = sheets,
+                                      formulas = formulas, sheet_rows = sheet_rows,
+                                      skipped_data = skipped_data, bivariate_data = bivariate_data)
+
+    return formatter.output_path
+
+
+def _check_cv(cv_folds, cv_tolerance):
+    """Rejects a number of folds or a tolerance the cross-validation cannot use."""
+    if isinstance(cv_folds, bool) or not isinstance(cv_folds, (int, np.integer)) or cv_folds < 2:
+        raise ValueError(f"cv_folds must be an integer of at least 2, got {cv_folds!r}")
+    if cv_tolerance is not None and not cv_tolerance > 0:
+        raise ValueError(f"cv_tolerance must be positive or None, got {cv_tolerance!r}")
+
+
+def _prepare_column(x, kind= None):
+
+    """
+    Replaces binary flags with a "No"/"Yes" categorical and tells whether the column is numeric.
+
+    Parameters
+    ----------
+    x : pd.Series
+        The column values.
+    kind : str, optional
+        The kind of the column from `EDAR.schema.infer_schema`, when it is already known
+        (default is None, found here).
+
+    Returns
+    -------
+    tuple of (pd.Series, bool)
+        The prepared column and True if it is numeric.
+    """
+
+    if kind is None:
+        kind = column_kind(x)
+
+    if kind in (FLAG, YES_NO):
+        return as_flag(x, kind), False
+    return x, kind == NUMERIC
+
+
+def _numeric_values(x, rows= None):
+
+    """
+    Returns the values of a numeric column as a contiguous float array, missing values
+    filled with the median.
+
+    A float column without missing values is returned as a view of its data. Otherwise
+    the values are converted into a new array with a single copy and filled in place.
+
+    Parameters
+    ----------
+    x : pd.Series
+        A numeric column.
+    rows : np.ndarray, optional
+        The positions of the rows to return, the median is taken over them (default is
+        None, all rows).
+
+    Returns
+    -------
+    np.ndarray
+        The float32 or float64 values, shaped (n, 1).
+    """
+
+    values = x.to_numpy()
+    if rows is not None:
+        values = values[rows]
+    dtype = values.dtype if values.dtype in (np.float32, np.float64) else np.dtype(np.float64)
+    missing = np.isnan(values) if values.dtype.kind == 'f' else None
+    has_missing = missing is not None and missing.any()
+
+    if values.dtype == dtype and values.flags.c_contiguous and not has_missing:
+        return values.reshape(-1,1)
+
+    X = np.empty(len(values), dtype= dtype)
+    np.copyto(X, values, casting= 'unsafe')
+    if has_missing:
+        # the median of the valid values, partitioning a single copy of them in place
+        X[missing] = np.median(X[~missing], overwrite_input= True)
+
+    return X.reshape(-1,1)
 
 
-        return pd.DataFrame(all_auc_dfs)   
+def _fit_thresholds(X, y, num_min_samples_leaf, bin_engine= 'sklearn', buckets= None):
+
+    """
+    Fits the decision tree that bins a numeric column and returns the bin edges.
+
+    With the 'hist' engine the tree is grown on the quantile buckets of the column, see
+    `EDAR.binning.hist_thresholds`.
+
+    Parameters
+    ----------
+    X : np.ndarray
+        The column values with missing values filled, shaped (n, 1).
+    y : np.ndarray
+        The target values.
+    num_min_samples_leaf : float
+        Minimum samples per leaf for numerical data.
+    bin_engine : str, optional
+        'sklearn' to fit a DecisionTreeClassifier, 'hist' to grow the tree on quantile
+        buckets (default is 'sklearn').
+    buckets : tuple, optional
+        The result of `EDAR.binning.quantize(X)` for the 'hist' engine, when it is
+        already known (default is None).
+
+    Returns
+    -------
+    np.ndarray
+        The sorted upper edges of the bins, ending with inf. The -2 that the fitted tree
+        stores for its leaves is kept as an edge.
+    """
+
+    if bin_engine == 'hist':
+        return hist_thresholds(X, y, num_min_samples_leaf, buckets)
+
+    dt =  DecisionTreeClassifier(class_weight='balanced', min_samples_leaf= num_min_samples_leaf)
+    dt.fit(X, y)
+
+    thresholds = np.sort(np.unique(dt.tree_.threshold))
+    return np.append(thresholds, np.inf)
+
+
+def _bin_table(name, thresholds, count, total, integer):
+
+    """
+    Builds the rows of a numeric column from the row count and target sum of every bin.
+
+    Parameters
+    ----------
+    name : str
+        The name of the bin column.
+    thresholds : np.ndarray
+        The sorted upper edges of the bins.
+    count : np.ndarray
+        The number of rows in each bin.
+    total : np.ndarray
+        The sum of the target in each bin.
+    integer : bool
+        Whether the target sums are integers.
+
+    Returns
+    -------
+    pd.DataFrame
+        The count, sum and mean of the target per non empty bin, keyed by the bin's upper
+        edge and sorted by it as text.
+    """
+
+    used = np.flatnonzero(count)
+    grp_df = pd.DataFrame({name: [str(thresholds[b]) for b in used],
+                           'count': count[used].astype(np.int64),
+                           'sum': total[used].astype(np.int64) if integer else total[used],
+                           'mean': total[used] / count[used]})
+
+    return grp_df.sort_values(name).reset_index(drop= True)
+
+
+def _numeric_bins(col, X, y, target, thresholds):
+
+    """
+    Bins a numeric column on the given edges and aggregates the target per bin.
+
+    Parameters
+    ----------
+    col : str
+        The name of the column.
+    X : np.ndarray
+        The column values with missing values filled, shaped (n, 1).
+    y : np.ndarray
+        The target values.
+    target : str
+        The name of the target variable.
+    thresholds : np.ndarray
+        The sorted upper edges of the bins, as returned by `_fit_thresholds`.
+
+    Returns
+    -------
+    pd.DataFrame
+        The count, sum and mean of the target per bin, keyed by the bin's upper edge.
+    """
+
+    bins = np.digitize(X.ravel(), thresholds, right= True)
+    y = np.asarray(y)
+
+    if y.dtype.kind not in 'biuf':
+        grp_df = pd.DataFrame({col: np.asarray(thresholds).astype(str)[bins], target: y})
+        return grp_df.groupby(col)[target].agg(['count', 'sum', 'mean']).reset_index()
+
+    count = np.bincount(bins, minlength= len(thresholds))
+    total = np.bincount(bins, weights= y, minlength= len(thresholds))
+
+    return _bin_table(col, thresholds, count, total, y.dtype.kind in 'biu')
+
+
+def _stratified_sample(y, max_rows, random_state= 0):
+
+    """
+    Draws at most `max_rows` rows without replacement, keeping the share of each target class.
+
+    Parameters
+    ----------
+    y : np.ndarray
+        The target values.
+    max_rows : int
+        The size of the sample.
+    random_state : int, optional
+        Seed of the sample (default is 0).
+
+    Returns
+    -------
+    np.ndarray
+        The sorted positions of the sampled rows.
+    """
+
+    rng = np.random.default_rng(random_state)
+    _, classes = np.unique(y, return_inverse= True)
+    counts = np.bincount(classes)
+    sizes = np.minimum(np.maximum(np.round(counts * max_rows / len(y)).astype(np.int64), 1), counts)
+
+    sample = [rng.choice(np.flatnonzero(classes == k), size, replace= False)
+              for k, size in enumerate(sizes)]
+
+    return np.sort(np.concatenate(sample))
+
+
+def _column_codes(x):
+
+    """
+    Factorizes a categorical column once, so it can be encoded and aggregated from codes.
+
+    Parameters
+    ----------
+    x : pd.Series
+        The column values.
+
+    Returns
+    -------
+    tuple of (np.ndarray, np.ndarray, np.ndarray, np.ndarray)
+        The code of every row (-1 when missing), the levels, the positions of the levels
+        in sorted order, and in the order groupby lists them: by category for a
+        `category` column, sorted otherwise.
+    """
+
+    if isinstance(x.dtype, pd.CategoricalDtype):
+        codes = x.cat.codes.to_numpy().astype(np.intp)
+        levels = x.cat.categories.to_numpy()
+    else:
+        codes, levels = pd.factorize(x)
+        levels = np.asarray(levels)
 
+    try:
+        order = np.argsort(levels, kind= 'stable')
+    except TypeError:
+        order = np.argsort(levels.astype(str), kind= 'stable')
 
+    group_order = np.arange(len(levels)) if isinstance(x.dtype, pd.CategoricalDtype) else order
 
+    return codes, levels, order, group_order
 
 
+def _encode_codes(column_codes, cat_label_enco_thresh, label_enc= None):
 
+    """
+    Encodes a factorized categorical column as integers, collapsing rare levels into 0.
+
+    Missing values are filled with the most frequent level, the first one in groupby
+    order when tied like `x.mode()[0]`. Frequent levels are numbered from 1 in sorted
+    order.
+
+    Parameters
+    ----------
+    column_codes : tuple
+        The column as returned by `_column_codes`, possibly for a subset of its rows.
+    cat_label_enco_thresh : float
+        Levels with a lower share of rows than this are encoded as 0.
+    label_enc : dict, optional
+        A fixed encoding to apply instead of fitting one, unknown levels are encoded
+        as 0 (default is None).
+
+    Returns
+    -------
+    tuple of (np.ndarray, dict)
+        The encoded values, shaped (n, 1), and the code of every level.
+    """
+
+    codes, levels, order, group_order = column_codes
+    counts = np.bincount(codes[codes >= 0], minlength= len(levels))
+
+    missing = codes < 0
+    if missing.any():
+        mode = group_order[counts[group_order].argmax()]
+        codes = np.where(missing, mode, codes)
+        counts[mode] += missing.sum()
+
+    sorted_counts = counts[order]
+    present = sorted_counts > 0
+
+    if label_enc is None:
+        frequent = present & (sorted_counts / len(codes) >= cat_label_enco_thresh)
+        sorted_codes = np.where(frequent, np.cumsum(frequent), 0)
+        label_enc = dict(zip(levels[order][present].tolist(), sorted_codes[present].tolist()))
+    else:
+        sorted_codes = np.array([label_enc.get(level, 0) for level in levels[order].tolist()],
+                                dtype= np.int64)
+
+    level_codes = np.empty(len(levels), dtype= np.int64)
+    level_codes[order] = sorted_codes
+
+    return level_codes[codes].reshape(-1,1), label_enc
+
+
+def _subset_codes(column_codes, rows):
+    """Returns a factorized column restricted to some rows, or as is when `rows` is None."""
+    if rows is None:
+        return column_codes
+    codes, levels, order, group_order = column_codes
+    return codes[rows], levels, order, group_order
+
+
+def _categorical_bins(col, column_codes, y, target):
+
+    """
+    Aggregates the target per level of a factorized categorical column.
+
+    Parameters
+    ----------
+    col : str
+        The name of the column.
+    column_codes : tuple
+        The column as returned by `_column_codes`.
+    y : np.ndarray
+        The target values.
+    target : str
+        The name of the target variable.
+
+    Returns
+    -------
+    pd.DataFrame
+        The count, sum and mean of the target per level present, missing values left
+        out, in groupby order.
+    """
+
+    codes, levels, order, group_order = column_codes
+    valid = codes >= 0
+    y = np.asarray(y)
+
+    if y.dtype.kind not in 'biuf':
+        grp_df = pd.DataFrame({col: pd.Series(levels.take(codes)).where(valid), target: y})
+        return grp_df.groupby(col)[target].agg(['count', 'sum', 'mean']).reset_index()
+
+    count = np.bincount(codes[valid], minlength= len(levels))
+    total = np.bincount(codes[valid], weights= y[valid], minlength= len(levels))
+    used = group_order[count[group_order] > 0]
+
+    return pd.DataFrame({col: levels[used],
+                         'count': count[used].astype(np.int64),
+                         'sum': total[used].astype(np.int64) if y.dtype.kind in 'biu' else total[used],
+                         'mean': total[used] / count[used]})
+
+
+def _cv_auc(X, y, dt):
+
+    """
+    Calculates the median ROC AUC of a decision tree over 10 stratified folds.
+
+    Parameters
+    ----------
+    X : np.ndarray
+        The feature values, shaped (n, 1).
+    y : np.ndarray
+        The target values.
+    dt : DecisionTreeClassifier
+        The unfitted tree to cross-validate.
+
+    Returns
+    -------
+    float
+        The median ROC AUC over the folds.
+    """
+
+    return np.median(_cv_fold_aucs(X, y, dt))
+
+
+def _cv_fold_aucs(X, y, dt, folds= None, n_splits= 10, tolerance= None):
+
+    """
+    Calculates the ROC AUC of a decision tree on every stratified fold.
+
+    Parameters
+    ----------
+    X : np.ndarray
+        The feature values, shaped (n, 1).
+    y : np.ndarray
+        The target values.
+    dt : DecisionTreeClassifier
+        The unfitted tree to cross-validate.
+    folds : np.ndarray, optional
+        The test fold of every row from `EDAR.auc.fold_indices` (default is None,
+        computed here).
+    n_splits : int, optional
+        The number of folds (default is 10).
+    tolerance : float, optional
+        Stop once the median is known to this, see `EDAR.auc.cv_auc` (default is None).
+
+    Returns
+    -------
+    list of float
+        The ROC AUC of every fold run. A ValueError is raised when a test fold holds a
+        single class.
+    """
+
+    if folds is None:
+        folds = fold_indices(y, n_splits)
+    results = []
+
+    for k in range(n_splits):
+        test = folds == k
+        X_train, X_test = X[~test], X[test]
+        y_train, y_test = y[~test], y[test]
+        if len(np.unique(y_test)) < 2:
+            # roc_auc_score only warns and returns NaN, the sorted engine raises
+            raise ValueError("Only one class is present in a test fold, the ROC AUC is not defined")
+        dt.fit(X_train, y_train)
+        yproba = dt.predict_proba(X_test)
+        auc = metrics.roc_auc_score(y_test, yproba[:, 1])
+        results.append(auc)
+        if stop_early(results, tolerance):
+            break
+
+    return results
+
+
+def _column_auc(X, y, min_samples_leaf, auc_engine= 'sorted', values= None, folds= None,
+                n_splits= 10, tolerance= None):
+
+    """
+    Calculates the cross-validated ROC AUC of every fold of a prepared column.
+
+    Parameters
+    ----------
+    X : np.ndarray
+        The filled or encoded values, shaped (n, 1).
+    y : np.ndarray
+        The target values.
+    min_samples_leaf : int or float
+        Minimum samples per leaf of the trees.
+    auc_engine : str, optional
+        'sorted' to use `EDAR.auc.cv_auc`, 'sklearn' to fit a tree per fold (default is 'sorted').
+    values : tuple, optional
+        `EDAR.auc.sorted_values(X)`, shared by the targets of a column (default is None).
+    folds : np.ndarray, optional
+        The test fold of every row from `EDAR.auc.fold_indices`, shared by the columns
+        (default is None, computed here).
+    n_splits : int, optional
+        The number of folds (default is 10).
+    tolerance : float, optional
+        Stop once the 95% interval of the median AUC is narrower than this on either
+        side, see `EDAR.auc.cv_auc` (default is None, run every fold).
+
+    Returns
+    -------
+    list of float
+        The ROC AUC of every fold run, their median is the column's ROC AUC.
+    """
+
+    if auc_engine == 'sklearn':
+        dt = DecisionTreeClassifier(class_weight='balanced', min_samples_leaf= min_samples_leaf)
+        return _cv_fold_aucs(X, y, dt, folds, n_splits, tolerance)
+
+    return cv_auc(X, y, min_samples_leaf, n_splits, values, folds, tolerance)
+
+
+def _fold_results(aucs, cv_tolerance= None, fold_aucs= False):
+
+    """
+    Builds the ROC Report entries of a column from the AUC of every fold.
+
+    Parameters
+    ----------
+    aucs : list of float
+        The ROC AUC of every fold run.
+    cv_tolerance : float, optional
+        The tolerance of the adaptive cross-validation, which adds the number of folds
+        run under "Folds" (default is None).
+    fold_aucs : bool, optional
+        Add the AUC of every fold under "AUC Fold 1", "AUC Fold 2" and so on (default is
+        False).
+
+    Returns
+    -------
+    dict
+        The median ROC AUC under "ROC AUC", and the entries asked for.
+    """
+
+    results = {"ROC AUC": np.median(aucs)}
+    if cv_tolerance is not None:
+        results["Folds"] = len(aucs)
+    if fold_aucs:
+        results.update({f"AUC Fold {k + 1}": auc for k, auc in enumerate(aucs)})
+    return results
+
+
+def _analyse_column(col, x, y, target, cat_label_enco_thresh, num_min_samples_leaf,
+                    auc_engine= 'sorted', edges= None, sample= None, profile= False,
+                    trace_memory= False, bins= True, auc= True, bin_engine= 'sklearn', kind= None,
+                    cv_folds= 10, cv_tolerance= None, fold_aucs= False, folds= None):
+
+    """
+    Computes the bin table and the cross-validated ROC AUC of a single column.
+
+    Missing values are filled and the column is converted to a float array once, and
+    both results are computed from that array. With a `sample`, the bin edges and the
+    ROC AUC are fitted on the sampled rows and the bin table counts every row.
+
+    Parameters
+    ----------
+    col : str
+        The name of the column.
+    x : pd.Series
+        The column values.
+    y : np.ndarray
+        The target values.
+    target : str
+        The name of the target variable.
+    cat_label_enco_thresh : float
+        Threshold for encoding categorical labels.
+    num_min_samples_leaf : float
+        Minimum samples per leaf for numerical data.
+    auc_engine : str, optional
+        'sorted' to use `EDAR.auc.cv_auc`, 'sklearn' to fit a tree per fold (default is 'sorted').
+    edges : np.ndarray or dict, optional
+        Fixed bin edges of a numeric column or label encoding of a categorical one, used
+        instead of fitting them (default is None).
+    sample : np.ndarray, optional
+        The positions of the rows the bin edges and ROC AUC are fitted on (default is
+        None, all rows).
+    profile : bool, optional
+        Time the steps of the analysis and add them to the record under "profile"
+        (default is False).
+    trace_memory : bool, optional
+        Also record the peak memory of the column when profiling (default is False).
+    bins : bool, optional
+        Compute the bin table (default is True).
+    auc : bool, optional
+        Compute the ROC AUC (default is True).
+    bin_engine : str, optional
+        'sklearn' or 'hist', see `_fit_thresholds` (default is 'sklearn').
+    kind : str, optional
+        The kind of the column from `EDAR.schema.infer_schema` (default is None, found
+        from the column).
+    cv_folds : int, optional
+        The number of cross-validation folds (default is 10).
+    cv_tolerance : float, optional
+        Stop the cross-validation once the median AUC is known to this, see
+        `EDAR.auc.cv_auc` (default is None, run every fold).
+    fold_aucs : bool, optional
+        Add the AUC of every fold to the record (default is False).
+    folds : np.ndarray, optional
+        The test fold of every fitted row from `EDAR.auc.fold_indices`, shared by the
+        columns (default is None, computed here).
+
+    Returns
+    -------
+    dict
+        The column name under "Column", its Detailed EDA rows under "bins", the median
+        ROC AUC under "ROC AUC" and the bin edges or label encoding under "edges". Only
+        the parts asked for are set, the edges of a numeric column come with its bins
+        and the label encoding of a categorical one with its ROC AUC. The fold entries
+        of `_fold_results` come with the ROC AUC.
+    """
+
+    timer = ColumnTimer(trace_memory) if profile else None
+
+    x, isnum = _prepare_column(x, kind)
+    y_fit = y if sample is None else y[sample]
+    if timer is not None:
+        timer.step('prepare')
+
+    record = {"Column": col}
+
+    if isnum:
+        X = _numeric_values(x)
+        if bins:
+            if not isinstance(edges, np.ndarray):
+                edges = _fit_thresholds(X if sample is None else X[sample], y_fit, num_min_samples_leaf,
+                                        bin_engine)
+            grp_df = _numeric_bins(col, X, y, target, edges)
+        min_samples_leaf = num_min_samples_leaf
+    else:
+        column_codes = _column_codes(x)
+        if bins:
+            grp_df = _categorical_bins(col, column_codes, y, target)
+        if auc:
+            X, edges = _encode_codes(column_codes, cat_label_enco_thresh,
+                                     edges if isinstance(edges, dict) else None)
+        min_samples_leaf = 1
+
+    if bins:
+        grp_df.insert(0, 'Column', col)
+        record["bins"] = grp_df.rename(columns = {col: "value"})
+    if timer is not None:
+        timer.step('bins')
+
+    if auc:
+        if sample is not None:
+            X = X[sample]
+        aucs = _column_auc(X, y_fit, min_samples_leaf, auc_engine, folds= folds, n_splits= cv_folds,
+                           tolerance= cv_tolerance)
+        record.update(_fold_results(aucs, cv_tolerance, fold_aucs))
+
+    if edges is not None:
+        record["edges"] = edges
+
+    if timer is not None:
+        timer.step('auc')
+        levels = None
+        if not isnum:
+            levels = len(edges) if edges is not None else len(column_codes[1])
+        record["profile"] = timer.finish(kind= 'numeric' if isnum else 'categorical', rows= len(x),
+                                         bins= len(record["bins"]) if bins else None, levels= levels)
+
+    return record
+
+
+def _segment_rows(y, segments):
+    """Lists the segments with the positions of their rows, a single group of all rows without segments."""
+    if segments is None:
+        return [(None, None)]
+    return [(segment, np.flatnonzero(y[:, -1] == i)) for i, segment in enumerate(segments)]
+
+
+def _group_folds(y, cv_folds):
+    """Assigns the folds of a target and segment, None when it has fewer than `cv_folds` rows of a class."""
+    counts = np.unique(y, return_counts= True)[1]
+    if len(counts) != 2 or counts.min() < cv_folds:
+        # some test folds would lack a class, so the ROC AUC is not defined
+        return None
+    return fold_indices(y, cv_folds)
+
+
+def _analyse_column_targets(col, x, y, targets, cat_label_enco_thresh, num_min_samples_leaf,
+                            auc_engine= 'sorted', segments= None, bin_engine= 'sklearn', kind= None,
+                            cv_folds= 10, cv_tolerance= None, fold_aucs= False, folds= None):
+
+    """
+    Computes the bin tables and ROC AUCs of a single column for several targets and segments.
+
+    The column is checked for binary flags and converted or factorized once. The median
+    fill and the label encoding are redone for every segment, and the sorted values used
+    by the ROC AUC are shared by all targets of a segment.
+
+    Parameters
+    ----------
+    col : str
+        The name of the column.
+    x : pd.Series
+        The column values.
+    y : np.ndarray
+        The target values, one column per target, followed by the segment code of every
+        row when there are segments (-1 for rows without a segment).
+    targets : list of str
+        The names of the targets.
+    cat_label_enco_thresh : float
+        Threshold for encoding categorical labels.
+    num_min_samples_leaf : float
+        Minimum samples per leaf for numerical data.
+    auc_engine : str, optional
+        'sorted' to use `EDAR.auc.cv_auc`, 'sklearn' to fit a tree per fold (default is 'sorted').
+    segments : list, optional
+        The segment of each segment code (default is None, all rows together).
+    bin_engine : str, optional
+        'sklearn' or 'hist', see `_fit_thresholds`. The buckets of the 'hist' engine are
+        shared by all targets of a segment (default is 'sklearn').
+    kind : str, optional
+        The kind of the column from `EDAR.schema.infer_schema` (default is None, found
+        from the column).
+    cv_folds : int, optional
+        The number of cross-validation folds (default is 10).
+    cv_tolerance : float, optional
+        Stop the cross-validation once the median AUC is known to this (default is None).
+    fold_aucs : bool, optional
+        Add the AUC of every fold to the records (default is False).
+    folds : list of list, optional
+        The folds of every segment and target, from `EDAR.auc.fold_indices`, shared by
+        the columns. None for a segment too small to split (default is None, computed
+        here).
+
+    Returns
+    -------
+    list of dict
+        The records of `_analyse_column` for every segment and target, with "Target" and
+        "Segment" added. The ROC AUC is NaN when a segment has fewer than `cv_folds` rows
+        of a class, as found by `_group_folds`.
+    """
+
+    x, isnum = _prepare_column(x, kind)
+    column_codes = None if isnum else _column_codes(x)
+
+    records = []
+    for g, (segment, rows) in enumerate(_segment_rows(y, segments)):
+        if isnum:
+            X = _numeric_values(x, rows)
+            min_samples_leaf = num_min_samples_leaf
+        else:
+            codes = _subset_codes(column_codes, rows)
+            X, edges = _encode_codes(codes, cat_label_enco_thresh)
+            min_samples_leaf = 1
+        values = sorted_values(X) if auc_engine == 'sorted' else None
+        buckets = quantize(X) if isnum and bin_engine == 'hist' else None
+
+        for t, target in enumerate(targets):
+            y_t = y[:, t] if rows is None else y[rows, t]
+
+            if isnum:
+                edges = _fit_thresholds(X, y_t, num_min_samples_leaf, bin_engine, buckets)
+                grp_df = _numeric_bins(col, X, y_t, target, edges)
+            else:
+                grp_df = _categorical_bins(col, codes, y_t, target)
+            grp_df.insert(0, 'Column', col)
+            grp_df = grp_df.rename(columns = {col: "value"})
+
+            if folds is not None and folds[g][t] is None:
+                roc = {"ROC AUC": np.nan}
+            else:
+                aucs = _column_auc(X, y_t, min_samples_leaf, auc_engine, values,
+                                   None if folds is None else folds[g][t], cv_folds, cv_tolerance)
+                roc = _fold_results(aucs, cv_tolerance, fold_aucs)
+
+            records.append({
+                "Column": col,
+                "bins": grp_df,
+                **roc,
+                "edges": edges,
+                "Target": target,
+                "Segment": segment
+            })
 
+    return records
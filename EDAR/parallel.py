@@ -0,0 +1,142 @@
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# target array of the current worker process, attached once by _init_worker
+_shared = {}
+
+
+def _init_worker(name, shape, dtype):
+
+    """
+    Attaches a pool worker to the shared memory block holding the target array.
+
+    Parameters
+    ----------
+    name : str
+        The name of the shared memory block.
+    shape : tuple
+        The shape of the target array.
+    dtype : str
+        The dtype of the target array.
+    """
+
+    from multiprocessing import shared_memory
+
+    try:
+        shm = shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 registers every attach with the resource tracker, which would
+        # unlink the block when the worker exits. Only the parent owns it.
+        from multiprocessing import resource_tracker
+        register = resource_tracker.register
+        resource_tracker.register = lambda *args, **kwargs: None
+        try:
+            shm = shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+    _shared['shm'] = shm
+    _shared['y'] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def _run_task(func, col, x, kwargs):
+    return func(col, x, _shared['y'], **kwargs)
+
+
+def resolve_n_jobs(n_jobs):
+
+    """
+    Converts an `n_jobs` value to a number of worker processes.
+
+    Parameters
+    ----------
+    n_jobs : int or None
+        The requested number of processes. None means 1 and negative values count back
+        from the number of CPUs, so -1 uses all of them.
+
+    Returns
+    -------
+    int
+        The number of processes to use.
+    """
+
+    if n_jobs is None or n_jobs == 0:
+        return 1
+    if n_jobs < 0:
+        return max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+    return n_jobs
+
+
+def map_columns(func, data, cols, y, n_jobs=1, progress_callback=None, column_kwargs=None,
+                **kwargs):
+
+    """
+    Applies a per-column function to every column, optionally in a pool of processes.
+
+    The target array is copied once into shared memory and every worker attaches to it,
+    so only the column itself is sent with each task.
+
+    Parameters
+    ----------
+    func : callable
+        A module level function called as `func(col, x, y, **kwargs)` where `x` is the
+        column as a pd.Series and `y` the target as a np.ndarray.
+    data : pd.DataFrame
+        The dataset holding the columns.
+    cols : list of str
+        The columns to process.
+    y : array-like
+        The target values.
+    n_jobs : int, optional
+        The number of processes to use, -1 for all CPUs (default is 1, no pool).
+    progress_callback : callable, optional
+        Called as `progress_callback(done, total, col)` after each column finishes
+        (default is None).
+    column_kwargs : dict, optional
+        Extra keyword arguments for some columns, keyed by column name (default is None).
+    **kwargs
+        Passed on to `func`.
+
+    Returns
+    -------
+    list
+        The results of `func`, in the order of `cols`.
+    """
+
+    y = np.ascontiguousarray(y)
+    n_jobs = min(resolve_n_jobs(n_jobs), max(len(cols), 1))
+    total = len(cols)
+    results = [None] * total
+    column_kwargs = column_kwargs or {}
+    tasks = [dict(kwargs, **column_kwargs.get(col, {})) for col in cols]
+
+    if n_jobs == 1 or y.dtype == object:
+        for i, col in enumerate(cols):
+            results[i] = func(col, data[col], y, **tasks[i])
+            if progress_callback is not None:
+                progress_callback(i + 1, total, col)
+        return results
+
+    from multiprocessing import shared_memory
+
+    shm = shared_memory.SharedMemory(create=True, size=max(y.nbytes, 1))
+    try:
+        np.ndarray(y.shape, dtype=y.dtype, buffer=shm.buf)[:] = y
+
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker,
+                                 initargs=(shm.name, y.shape, y.dtype.str)) as pool:
+            futures = {pool.submit(_run_task, func, col, data[col], tasks[i]): i
+                       for i, col in enumerate(cols)}
+            done = 0
+            for future in as_completed(futures):
+                i = futures[future]
+                results[i] = future.result()
+                done += 1
+                if progress_callback is not None:
+                    progress_callback(done, total, cols[i])
+    finally:
+        shm.close()
+        shm.unlink()
+
+    return results
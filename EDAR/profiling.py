@@ -0,0 +1,283 @@
+import json
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from contextlib import contextmanager, nullcontext
+
+
+class Profiler:
+
+    """
+    Records where the time and memory of a report run go.
+
+    Every stage of the run (column analysis, frame building, workbook setup, block
+    formatting, saving) is timed, and every analysed column reports the time of its
+    steps with its row, bin and level counts. Stages can be nested; a nested stage is
+    named by its path, such as "format/save".
+
+    Parameters
+    ----------
+    trace_memory : bool, optional
+        Also record the peak Python memory of every stage and column with tracemalloc,
+        which slows the run down (default is False).
+    hooks : list of callable, optional
+        Called as `hook(event, name, info)` where `event` is 'start' or 'end' for a stage
+        and 'column' for a column, so runs can be forwarded to another tracing system
+        (default is None).
+    slow_factor : float, optional
+        Columns taking more than `slow_factor` times the median column time are flagged
+        as slow (default is 5).
+    min_slow_seconds : float, optional
+        Columns faster than this are never flagged for their time (default is 1).
+    max_bins : int, optional
+        Columns with more bins or levels than this are flagged too, as every bin is a
+        formatted row of the report (default is 1,000).
+    write_sheet : bool, optional
+        Add the stage and column tables to the report as a hidden "Diagnostics" sheet.
+        Only what is recorded before the report is saved is written (default is False).
+
+    Attributes
+    ----------
+    stages : list of dict
+        One entry per finished stage, in the order they finished.
+    columns : list of dict
+        One entry per analysed column.
+    """
+
+    def __init__(self, trace_memory= False, hooks= None, slow_factor= 5.0, min_slow_seconds= 1.0,
+                 max_bins= 1000, write_sheet= False):
+
+        self.trace_memory = trace_memory
+        self.hooks = list(hooks or [])
+        self.slow_factor = slow_factor
+        self.min_slow_seconds = min_slow_seconds
+        self.max_bins = max_bins
+        self.write_sheet = write_sheet
+        self.stages = []
+        self.columns = []
+        self._stack = []
+
+    def _emit(self, event, name, info):
+        for hook in self.hooks:
+            hook(event, name, info)
+
+    @contextmanager
+    def stage(self, name, **info):
+
+        """
+        Times the code run in the `with` block as one stage.
+
+        Parameters
+        ----------
+        name : str
+            The name of the stage.
+        **info
+            Counts to record with the stage.
+
+        Yields
+        ------
+        dict
+            The stage's info, counts added to it are recorded when the stage ends.
+        """
+
+        path = '/'.join(self._stack + [name])
+        self._stack.append(name)
+        self._emit('start', path, info)
+
+        started_tracing = False
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            base = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+
+        n_stages = len(self.stages)
+        n_columns = len(self.columns)
+        start = time.perf_counter()
+
+        try:
+            yield info
+        finally:
+            entry = {'stage': path, 'seconds': time.perf_counter() - start}
+            entry.update(info)
+
+            if self.trace_memory:
+                # nested stages and columns reset the peak, so theirs are included here
+                peaks = [tracemalloc.get_traced_memory()[1] - base]
+                peaks += [inner.get('peak_bytes', 0) for inner in self.stages[n_stages:]]
+                peaks += [column.get('peak_bytes', 0) for column in self.columns[n_columns:]]
+                entry['peak_bytes'] = max(peaks)
+                if started_tracing:
+                    tracemalloc.stop()
+
+            self._stack.pop()
+            self.stages.append(entry)
+            self._emit('end', path, entry)
+
+    def add_column(self, col, info):
+
+        """
+        Records the profile of an analysed column.
+
+        Parameters
+        ----------
+        col : str
+            The name of the column.
+        info : dict
+            The profile returned by `ColumnTimer.finish`.
+        """
+
+        entry = {'column': col}
+        entry.update(info)
+        self.columns.append(entry)
+        self._emit('column', col, entry)
+
+    def flag_slow_columns(self):
+
+        """
+        Marks the columns that took much longer than the others.
+
+        A column is slow when its analysis took much longer than the median column, or
+        when it has more than `max_bins` bins. Every column entry gets a 'slow' flag, and
+        slow ones a 'reason' naming the likely cause, such as a categorical column with
+        many levels.
+
+        Returns
+        -------
+        list of dict
+            The entries of the slow columns.
+        """
+
+        seconds = [column['seconds'] for column in self.columns if 'seconds' in column]
+        limit = self.min_slow_seconds
+        if seconds:
+            limit = max(self.slow_factor * float(np.median(seconds)), limit)
+
+        slow = []
+        for column in self.columns:
+            column['slow'] = (column.get('seconds', 0) > limit
+                              or (column.get('bins') or 0) > self.max_bins)
+            if column['slow']:
+                if column.get('kind') == 'categorical':
+                    column['reason'] = f"categorical with {column.get('levels')} levels"
+                else:
+                    column['reason'] = f"{column.get('kind', 'column')} with {column.get('rows')} rows"
+                slow.append(column)
+
+        return slow
+
+    def stage_frame(self):
+        """Returns the stages as a DataFrame."""
+        return pd.DataFrame(self.stages)
+
+    def column_frame(self):
+        """Returns the columns as a DataFrame."""
+        return pd.DataFrame(self.columns)
+
+    def to_dict(self):
+        """Returns the stages and columns as plain Python objects."""
+        return json.loads(self.to_json())
+
+    def to_json(self, path= None):
+
+        """
+        Serialises the stages and columns to JSON.
+
+        Parameters
+        ----------
+        path : str, optional
+            A file to write the JSON to (default is None).
+
+        Returns
+        -------
+        str
+            The JSON document.
+        """
+
+        text = json.dumps({'stages': self.stages, 'columns': self.columns}, indent= 2,
+                          default= lambda value: value.item() if hasattr(value, 'item') else str(value))
+        if path is not None:
+            with open(path, 'w', encoding= 'utf-8') as f:
+                f.write(text)
+        return text
+
+    def write_diagnostics_sheet(self, wb):
+
+        """
+        Adds the stage and column tables to a workbook as a hidden "Diagnostics" sheet.
+
+        Parameters
+        ----------
+        wb : openpyxl.Workbook
+            The report workbook, in normal or write-only mode.
+        """
+
+        ws = wb.create_sheet('Diagnostics')
+        ws.sheet_state = 'hidden'
+
+        for frame in (self.stage_frame(), self.column_frame()):
+            ws.append(frame.columns.tolist())
+            for row in frame.itertuples(index= False):
+                ws.append([None if pd.isna(value) else value for value in row])
+            ws.append([])
+
+
+def stage(profiler, name, **info):
+    """Returns `profiler.stage(name)`, or a context that does nothing when there is no profiler."""
+    if profiler is None:
+        return nullcontext(info)
+    return profiler.stage(name, **info)
+
+
+class ColumnTimer:
+
+    """
+    Times the steps of the analysis of one column, and its peak memory when asked.
+
+    It runs where the column is analysed, possibly in a pool worker, and its result is
+    sent back with the column's record.
+    """
+
+    def __init__(self, trace_memory= False):
+
+        self.info = {}
+        self.trace_memory = trace_memory
+        if trace_memory:
+            self._started_tracing = not tracemalloc.is_tracing()
+            if self._started_tracing:
+                tracemalloc.start()
+            self._base = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        self._start = self._last = time.perf_counter()
+
+    def step(self, name):
+        """Records the time since the previous step as `<name>_seconds`."""
+        now = time.perf_counter()
+        self.info[name + '_seconds'] = now - self._last
+        self._last = now
+
+    def finish(self, **info):
+
+        """
+        Ends the timing.
+
+        Parameters
+        ----------
+        **info
+            Counts to record with the column.
+
+        Returns
+        -------
+        dict
+            The total and per step seconds, the peak memory if traced, and `info`.
+        """
+
+        self.info['seconds'] = time.perf_counter() - self._start
+        if self.trace_memory:
+            self.info['peak_bytes'] = tracemalloc.get_traced_memory()[1] - self._base
+            if self._started_tracing:
+                tracemalloc.stop()
+        self.info.update(info)
+        return self.info
@@ -0,0 +1,173 @@
+import numpy as np
+import pandas as pd
+
+# kinds of column found by infer_schema
+NUMERIC = 'numeric'
+CATEGORICAL = 'categorical'
+FLAG = 'flag'          # only 0 and 1, and missing values
+YES_NO = 'yes_no'      # only 'Y' and 'N', and missing values
+
+# most cells of a numeric block converted to one array at a time
+BLOCK_CELLS = 1 << 22
+
+# rows of a non-numeric column looked at before all of them, to rule out most columns early
+HEAD_ROWS = 1_000
+
+# rows of a float column checked at a time for values other than 0 and 1
+CHUNK_ROWS = 1 << 16
+
+# the levels of a binary flag, in sorted order
+FLAG_LEVELS = ['No', 'Yes']
+
+
+def is_numeric_dtype(dtype):
+    """Tells whether a column of this dtype is binned as a number: the float and int dtypes."""
+    return str(dtype).startswith('float') | str(dtype).startswith('int')
+
+
+def _only_flags(values):
+    """Tells whether a float array only holds 0, 1 and NaN, stopping at the first chunk that does not."""
+    for start in range(0, len(values), CHUNK_ROWS):
+        chunk = values[start:start + CHUNK_ROWS]
+        if not ((chunk == 0) | (chunk == 1) | np.isnan(chunk)).all():
+            return False
+    return True
+
+
+def _numeric_kinds(data, cols):
+
+    """
+    Finds the 0/1 flags among numeric columns of one dtype, from their min and max.
+
+    The columns are converted a block at a time, at most `BLOCK_CELLS` cells each. An
+    integer column is a flag when its min is 0 and its max 1. A float column also needs
+    every value to be 0, 1 or missing, which is only checked when its min and max are
+    0 and 1.
+    """
+
+    kinds = {}
+    if len(data) == 0:
+        return {col: NUMERIC for col in cols}
+
+    width = max(1, BLOCK_CELLS // len(data))
+    for start in range(0, len(cols), width):
+        block_cols = cols[start:start + width]
+        if len(block_cols) == 1:
+            block = data[block_cols[0]].to_numpy().reshape(-1, 1)
+        else:
+            block = data[block_cols].to_numpy()
+
+        if block.dtype.kind == 'f':
+            # fmin and fmax skip missing values, and are NaN for an all-missing column
+            low, high = np.fmin.reduce(block, axis= 0), np.fmax.reduce(block, axis= 0)
+        else:
+            low, high = block.min(axis= 0), block.max(axis= 0)
+
+        for i, col in enumerate(block_cols):
+            flag = low[i] == 0 and high[i] == 1
+            if flag and block.dtype.kind == 'f':
+                flag = _only_flags(block[:, i])
+            kinds[col] = FLAG if flag else NUMERIC
+
+    return kinds
+
+
+def column_kind(x):
+
+    """
+    Finds the kind of a single column, see `infer_schema`.
+
+    Parameters
+    ----------
+    x : pd.Series
+        The column values.
+
+    Returns
+    -------
+    str
+        NUMERIC, CATEGORICAL, FLAG or YES_NO.
+    """
+
+    if is_numeric_dtype(x.dtype):
+        return _numeric_kinds(x.to_frame(), [x.name])[x.name]
+
+    if isinstance(x.dtype, pd.CategoricalDtype):
+        # only the levels in use count, as for any other column
+        codes = x.cat.codes.to_numpy()
+        used = np.bincount(codes[codes >= 0], minlength= len(x.cat.categories))
+        values = set(x.cat.categories[used > 0])
+    else:
+        head = set(x.iloc[:HEAD_ROWS].dropna().unique())
+        if not (head <= {0, 1} or head <= {'Y', 'N'}):
+            return CATEGORICAL
+        values = set(x.dropna().unique())
+
+    if values == {0, 1}:
+        return FLAG
+    if values == {'Y', 'N'}:
+        return YES_NO
+    return CATEGORICAL
+
+
+def infer_schema(data, cols):
+
+    """
+    Classifies the columns of a dataset in one pass, before they are binned.
+
+    Numeric columns are those of a float or int dtype, and their flags are found from
+    the min and max of every block of columns sharing a dtype. The other columns are
+    only scanned in full when their first `HEAD_ROWS` rows hold nothing but 0/1 or
+    'Y'/'N'.
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        The dataset.
+    cols : list of str
+        The columns to classify.
+
+    Returns
+    -------
+    dict
+        The kind of every column: NUMERIC, CATEGORICAL, FLAG for 0/1 columns (of any
+        dtype, booleans included) or YES_NO for 'Y'/'N' columns.
+    """
+
+    by_dtype = {}
+    kinds = {}
+    for col in cols:
+        dtype = data[col].dtype
+        if is_numeric_dtype(dtype):
+            by_dtype.setdefault(dtype, []).append(col)
+        else:
+            kinds[col] = column_kind(data[col])
+
+    for dtype_cols in by_dtype.values():
+        kinds.update(_numeric_kinds(data, dtype_cols))
+
+    return {col: kinds[col] for col in cols}
+
+
+def as_flag(x, kind):
+
+    """
+    Converts a FLAG or YES_NO column into a categorical of "No" and "Yes".
+
+    Missing values become "No", as the column is stored in one byte per row.
+
+    Parameters
+    ----------
+    x : pd.Series
+        The column values.
+    kind : str
+        FLAG or YES_NO, from `infer_schema`.
+
+    Returns
+    -------
+    pd.Series
+        The column as a `category` with the levels "No" and "Yes".
+    """
+
+    positive = 1 if kind == FLAG else 'Y'
+    codes = (x == positive).to_numpy(dtype= np.int8, na_value= 0)
+    return pd.Series(pd.Categorical.from_codes(codes, FLAG_LEVELS), index= x.index, name= x.name)
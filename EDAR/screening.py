@@ -0,0 +1,315 @@
+import warnings
+import numpy as np
+import pandas as pd
+
+from EDAR.schema import is_numeric_dtype
+
+# the thresholds of the screening, a rule is turned off by setting its threshold to None
+SCREEN_DEFAULTS = {
+    'max_missing': 0.99,         # skip columns with a larger share of missing values
+    'max_unique_ratio': 0.95,    # skip text and categorical columns with more distinct values per row, IDs
+    'alpha': 0.001,              # skip columns whose best split is this likely on pure noise
+    'sample_rows': 200_000,      # rows the distinct values and splits are computed on
+}
+
+# the columns of the Skipped columns table
+SKIPPED_COLUMNS = ["Column", "Reason", "Missing Rate", "Unique Ratio", "Variance", "Split AUC"]
+
+# cells of a numeric block sorted at a time, the sort takes about 40 bytes a cell
+SCREEN_CELLS = 1 << 20
+
+
+def screen_options(screen):
+
+    """
+    Returns the thresholds of the screening.
+
+    Parameters
+    ----------
+    screen : bool or dict
+        True for `SCREEN_DEFAULTS`, or a dict overriding some of them.
+
+    Returns
+    -------
+    dict
+        Every threshold of `SCREEN_DEFAULTS`.
+    """
+
+    if screen is True:
+        return dict(SCREEN_DEFAULTS)
+    unknown = set(screen) - set(SCREEN_DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unknown screening thresholds {sorted(unknown)}, "
+                         f"use {sorted(SCREEN_DEFAULTS)}")
+    return dict(SCREEN_DEFAULTS, **screen)
+
+
+def chance_auc(n_pos, n_neg, alpha):
+
+    """
+    The ROC AUC the best single split of a column unrelated to the target exceeds with
+    probability `alpha`.
+
+    The best split of a column reaches an AUC of 0.5 + D / 2, where D is the Kolmogorov-
+    Smirnov distance between its values among positive and negative rows, so this is the
+    critical value of the two-sample test.
+
+    Parameters
+    ----------
+    n_pos, n_neg : int
+        The number of positive and negative rows.
+    alpha : float
+        The significance level.
+
+    Returns
+    -------
+    float
+        The ROC AUC.
+    """
+
+    c = np.sqrt(-0.5 * np.log(alpha / 2))
+    return 0.5 + c * np.sqrt((n_pos + n_neg) / (n_pos * n_neg)) / 2
+
+
+def _best_split(cum_pos, cum_neg, splits, n_pos, n_neg):
+    """The largest gap between the cumulative shares of the classes over the allowed splits."""
+    gap = np.abs(cum_pos / n_pos - cum_neg / n_neg)
+    return np.where(splits, gap, 0).max(axis= 0, initial= 0)
+
+
+def _numeric_stats(block, positive):
+
+    """
+    Computes the distinct values and the best split of every column of a numeric block.
+
+    The columns are sorted once, missing values last, and the rows of each class are
+    counted cumulatively. A split lies between two different values, so the missing
+    values always end on the side of the largest ones.
+
+    Parameters
+    ----------
+    block : np.ndarray
+        The values, one column per column of the dataset, shaped (n, k).
+    positive : np.ndarray
+        Whether each row is positive, one column per target, shaped (n, t).
+
+    Returns
+    -------
+    tuple of (np.ndarray, np.ndarray)
+        The number of distinct values of every column, and its best split AUC over the
+        targets.
+    """
+
+    order = np.argsort(block, axis= 0)
+    values = np.take_along_axis(block, order, axis= 0)
+    splits = values[:-1] != values[1:]
+    if values.dtype.kind == 'f':
+        splits &= ~np.isnan(values[1:])
+        valid = ~np.isnan(values[:1])
+    else:
+        valid = np.ones((1, values.shape[1]), dtype= bool)
+    distinct = splits.sum(axis= 0) + valid[0]
+    del values
+
+    rows = np.arange(1, len(block))[:, None]
+    auc = np.full(block.shape[1], np.nan)
+    for t in range(positive.shape[1]):
+        n_pos = int(positive[:, t].sum())
+        n_neg = len(positive) - n_pos
+        if n_pos == 0 or n_neg == 0:
+            continue
+        cum_pos = np.cumsum(positive[order, t], axis= 0)[:-1]
+        gap = _best_split(cum_pos, rows - cum_pos, splits, n_pos, n_neg)
+        auc = np.fmax(auc, 0.5 + gap / 2)
+
+    return distinct, auc
+
+
+def _categorical_stats(codes, positive):
+
+    """
+    Computes the distinct levels and the best split of a factorized column.
+
+    The levels are ordered by their share of positive rows, which gives the split with
+    the highest AUC any encoding of the levels allows. Missing values are on the side of
+    the last levels.
+
+    Parameters
+    ----------
+    codes : np.ndarray
+        The level of every row, -1 when missing.
+    positive : np.ndarray
+        Whether each row is positive, one column per target, shaped (n, t).
+
+    Returns
+    -------
+    tuple of (int, float)
+        The number of levels present and the best split AUC over the targets.
+    """
+
+    valid = codes >= 0
+    count = np.bincount(codes[valid])
+    used = count > 0
+    auc = np.nan
+
+    for t in range(positive.shape[1]):
+        n_pos = int(positive[:, t].sum())
+        n_neg = len(positive) - n_pos
+        if n_pos == 0 or n_neg == 0:
+            continue
+        pos = np.bincount(codes[valid], weights= positive[valid, t], minlength= len(count))[used]
+        order = np.argsort(pos / count[used])
+        cum_pos = np.cumsum(pos[order])[:-1, None]
+        cum_neg = np.cumsum(count[used][order] - pos[order])[:-1, None]
+        gap = _best_split(cum_pos, cum_neg, np.ones_like(cum_pos, dtype= bool), n_pos, n_neg)[0]
+        auc = np.fmax(auc, 0.5 + gap / 2)
+
+    return int(used.sum()), auc
+
+
+def _is_identifier(kind, unique_ratio, increasing, options):
+    """Tells whether a column looks like a key: text with distinct values, or an integer sequence."""
+    if options['max_unique_ratio'] is None:
+        return False
+    if kind == 'O':
+        return unique_ratio > options['max_unique_ratio']
+    if kind in 'iu':
+        # integer measurements, such as amounts in cents, may not repeat on the sample either
+        return increasing
+    return False
+
+
+def _reason(kind, missing_rate, distinct, unique_ratio, split_auc, chance, options, increasing= False):
+    """Returns why a column is skipped, or None when it is analysed."""
+    if distinct <= 1:
+        return 'constant'
+    if options['max_missing'] is not None and missing_rate > options['max_missing']:
+        return 'mostly missing'
+    if _is_identifier(kind, unique_ratio, increasing, options):
+        return 'identifier'
+    if chance is not None and split_auc < chance:
+        return 'no signal'
+    return None
+
+
+def screen_columns(data, cols, positive, options, rows= None):
+
+    """
+    Finds the columns not worth binning and cross-validating, in one cheap pass.
+
+    For every column the share of missing values and the variance are computed over all
+    rows, numeric columns a block of one dtype at a time. The number of distinct values
+    and the best single split are computed on `rows`, from one sort of every column. A
+    column is skipped when:
+
+    - it has at most one distinct value ('constant'),
+    - its share of missing values is above `max_missing` ('mostly missing'),
+    - it is a key ('identifier'): a text or categorical column whose distinct values
+      per row are above `max_unique_ratio`, or an integer column that is strictly
+      increasing. Other integer columns, such as amounts in cents, even without a
+      repeated value, and float and datetime columns are never taken for keys,
+    - no split of its values separates the classes better than a column unrelated to
+      the target would with probability `alpha` ('no signal'). The split AUC is the
+      in-sample AUC of the best one-split tree, and is optimistic for the trees of the
+      analysis, so a column with signal is not skipped for it.
+
+    A column constant on `rows` is only called constant when it is on all rows.
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        The dataset.
+    cols : list of str
+        The columns to screen.
+    positive : np.ndarray
+        Whether each row is positive, shaped (n,) or one column per target, (n, t). With
+        several targets a column is only skipped for no signal when it has none for any.
+    options : dict
+        The thresholds, see `screen_options`.
+    rows : np.ndarray, optional
+        The positions of the rows the distinct values and splits are computed on
+        (default is None, all rows).
+
+    Returns
+    -------
+    tuple of (list of str, pd.DataFrame)
+        The columns to analyse, in the order of `cols`, and the Skipped columns table
+        with the reason and the statistics of every skipped column.
+    """
+
+    positive = np.asarray(positive, dtype= bool)
+    if positive.ndim == 1:
+        positive = positive.reshape(-1, 1)
+    sample = positive if rows is None else positive[rows]
+
+    chance = None
+    if options['alpha'] is not None:
+        n_pos = sample.sum(axis= 0)
+        valid = (n_pos > 0) & (n_pos < len(sample))
+        if valid.any():
+            # several targets: the threshold of the least strict one
+            chance = min(chance_auc(p, len(sample) - p, options['alpha']) for p in n_pos[valid])
+
+    n = len(data)
+    stats = {}
+    increasing = {}
+    by_dtype = {}
+    for col in cols:
+        if is_numeric_dtype(data[col].dtype):
+            by_dtype.setdefault(data[col].dtype, []).append(col)
+            continue
+
+        x = data[col]
+        if isinstance(x.dtype, pd.CategoricalDtype):
+            codes = x.cat.codes.to_numpy()
+            codes = codes if rows is None else codes[rows]
+        else:
+            codes, _ = pd.factorize(x if rows is None else x.iloc[rows])
+        distinct, split_auc = _categorical_stats(codes, sample)
+        if distinct <= 1 and rows is not None:
+            distinct = x.nunique()
+        stats[col] = ('O', x.isna().mean(), distinct, distinct / len(codes), np.nan, split_auc)
+
+    for dtype, dtype_cols in by_dtype.items():
+        width = max(1, SCREEN_CELLS // max(len(sample), 1))
+        for start in range(0, len(dtype_cols), width):
+            block_cols = dtype_cols[start:start + width]
+            full = data[block_cols].to_numpy()
+            block = full if rows is None else full[rows]
+            distinct, split_auc = _numeric_stats(block, sample)
+            if full.dtype.kind in 'iu' and len(block) > 1:
+                # the rows of a sample keep their order
+                rising = (block[1:] > block[:-1]).all(axis= 0)
+                increasing.update(zip(block_cols, rising))
+
+            with warnings.catch_warnings():
+                # all-missing columns have no variance
+                warnings.simplefilter('ignore', RuntimeWarning)
+                if full.dtype.kind == 'f':
+                    missing = np.isnan(full).sum(axis= 0) / max(n, 1)
+                    variance = np.nanvar(full, axis= 0)
+                    spread = np.fmax.reduce(full, axis= 0) > np.fmin.reduce(full, axis= 0)
+                else:
+                    missing = np.zeros(len(block_cols))
+                    variance = full.var(axis= 0)
+                    spread = variance > 0
+
+            for i, col in enumerate(block_cols):
+                # a column constant on the sample keeps its distinct values when it has any
+                count = max(distinct[i], 2) if spread[i] and distinct[i] <= 1 else distinct[i]
+                stats[col] = (full.dtype.kind, missing[i], count, distinct[i] / max(len(block), 1),
+                              variance[i], split_auc[i])
+
+    kept = []
+    skipped = []
+    for col in cols:
+        kind, missing_rate, distinct, unique_ratio, variance, split_auc = stats[col]
+        reason = _reason(kind, missing_rate, distinct, unique_ratio, split_auc, chance, options,
+                         increasing.get(col, False))
+        if reason is None:
+            kept.append(col)
+        else:
+            skipped.append([col, reason, float(missing_rate), float(unique_ratio), float(variance),
+                            float(split_auc)])
+
+    return kept, pd.DataFrame(skipped, columns= SKIPPED_COLUMNS)
@@ -0,0 +1,529 @@
+"""
+An asyncio service that builds reports in a pool of processes, for web backends.
+
+Run a local stand-in from the command line:
+
+    python -m EDAR.service run data.csv target --report eda_report.xlsx --param max_rows=100000
+    python -m EDAR.service serve --port 8765 --workers 2 --cache eda_cache
+
+The HTTP stand-in accepts `POST /jobs` with a JSON body {"data": ..., "target": ...,
+"report_path": ..., "params": {...}}, and serves `GET /jobs/<id>` for the status and
+`GET /jobs/<id>/events` for the progress events of a job, one JSON object per line.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from EDAR.cache import EDACache
+from EDAR.render import _render
+
+# parameters that change the analysis, the others only change how it is written
+ANALYSIS_PARAMS = ('ignore_cols', 'cat_label_enco_thresh', 'num_min_samples_leaf', 'auc_engine',
+                   'max_rows', 'random_state', 'bin_engine', 'screen', 'cv_folds', 'cv_tolerance',
+                   'fold_aucs', 'bivariate')
+RENDER_PARAMS = ('conditional_color', 'write_only', 'formulas', 'sheet_rows')
+
+# events after which a job has nothing more to report
+FINAL_EVENTS = ('done', 'failed')
+
+# the progress queue of a worker process, set by _init_worker
+_worker = {}
+
+
+def _init_worker(events):
+    _worker['events'] = events
+
+
+def read_data(path):
+
+    """
+    Reads a dataset from a .parquet, .feather or .csv file.
+
+    Parameters
+    ----------
+    path : str
+        The file.
+
+    Returns
+    -------
+    pd.DataFrame
+        The dataset.
+    """
+
+    lower = path.lower()
+    if lower.endswith(('.parquet', '.pq')):
+        return pd.read_parquet(path)
+    if lower.endswith(('.feather', '.arrow')):
+        return pd.read_feather(path)
+    return pd.read_csv(path)
+
+
+def file_fingerprint(path, block_size= 1 << 20):
+    """Hashes the content of a file, a block at a time."""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _analyse(key, data_path, target, params):
+
+    """
+    Analyses a dataset in a worker process, reporting its progress to the service.
+
+    Returns
+    -------
+    tuple of (pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame)
+        The Detailed EDA, the ROC Report, the columns skipped by the screening and the
+        Bivariate EDA, the last two None without `screen` and `bivariate`.
+    """
+
+    from EDAR.excel_report import EDAResult
+
+    events = _worker.get('events')
+
+    def progress(done, total, col):
+        if events is not None:
+            events.put((key, 'column', {'done': done, 'total': total, 'column': col}))
+
+    data = read_data(data_path)
+    if events is not None:
+        events.put((key, 'loaded', {'rows': len(data), 'columns': len(data.columns)}))
+
+    result = EDAResult(data, target, progress_callback= progress, **params)
+    # both frames at once, so the columns are analysed in a single pass
+    return result._frames(('eda', 'roc')) + (result.skipped, result.bivariate_data)
+
+
+class ReportService:
+
+    """
+    Builds EDA reports asynchronously in a pool of processes, reusing identical work.
+
+    A job is analysed and then written with `EDA_Formatter`, both in the pool, so the
+    event loop is never blocked. Jobs are keyed by a fingerprint of the data file and
+    their parameters:
+
+    - A job identical to one still running waits for the same result.
+    - Jobs with different output options share the analysis of the same data.
+    - Finished analyses are kept, in memory or in an `EDACache`, and only the report
+      is written again when the same analysis is asked for later.
+
+    Every job records its progress as events, `{"event": ..., "job": ..., ...}`, which
+    `events(job_id)` replays and then streams as they happen.
+
+    Parameters
+    ----------
+    max_workers : int, optional
+        The number of processes analysing and writing reports (default is 1).
+    cache : str or EDACache, optional
+        Where finished analyses are kept between runs (default is None, in memory).
+    max_results : int, optional
+        The number of finished analyses kept in memory when there is no `cache`, the
+        least recently used are dropped first (default is 32).
+
+    Methods
+    -------
+    submit(data_path, target, report_path, **params)
+        Queues a job and returns its id.
+    result(job_id)
+        Waits for a job and returns its status, with the frames and the report path.
+    events(job_id)
+        Iterates over the progress events of a job.
+    status(job_id)
+        Returns the current status of a job.
+    close()
+        Waits for the running jobs and stops the pool.
+    """
+
+    def __init__(self, max_workers= 1, cache= None, max_results= 32):
+
+        if cache is not None and not isinstance(cache, EDACache):
+            cache = EDACache(cache)
+
+        self.cache = cache
+        self.max_results = max_results
+        self._results = OrderedDict()
+        self._fingerprints = {}
+        self._jobs = {}
+        self._running = {}
+        self._analyses = {}
+        self._watchers = {}
+        self._ids = itertools.count(1)
+
+        context = multiprocessing.get_context()
+        self._events = context.Queue()
+        self._pool = ProcessPoolExecutor(max_workers= max_workers, mp_context= context,
+                                         initializer= _init_worker, initargs= (self._events,))
+        self._loop = None
+        self._pump = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def _start(self):
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+            self._pump = threading.Thread(target= self._pump_events, daemon= True)
+            self._pump.start()
+
+    def _pump_events(self):
+        """Forwards the progress of the worker processes to the event loop, in a thread."""
+        while True:
+            item = self._events.get()
+            if item is None:
+                return
+            self._loop.call_soon_threadsafe(self._analysis_event, *item)
+
+    def _analysis_event(self, key, event, info):
+        for job_id in self._watchers.get(key, ()):
+            self._emit(job_id, event, **info)
+
+    def _emit(self, job_id, event, **info):
+        job = self._jobs[job_id]
+        item = dict(info, event= event, job= job_id)
+        job['events'].append(item)
+        if event in ('analysing', 'rendering', 'done', 'failed'):
+            job['status'] = event
+        for queue in job['subscribers']:
+            queue.put_nowait(item)
+
+    async def _fingerprint(self, path):
+        """Hashes a data file in a thread, once per size and modification time."""
+        stat = os.stat(path)
+        key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+        if key not in self._fingerprints:
+            self._fingerprints[key] = await self._loop.run_in_executor(None, file_fingerprint, path)
+        return self._fingerprints[key]
+
+    def _get_result(self, key):
+        if self.cache is not None:
+            return self.cache.get(key)
+        result = self._results.get(key)
+        if result is not None:
+            self._results.move_to_end(key)
+        return result
+
+    def _put_result(self, key, result):
+        if self.cache is not None:
+            self.cache.put(key, result)
+            return
+        self._results[key] = result
+        while len(self._results) > self.max_results:
+            self._results.popitem(last= False)
+
+    async def submit(self, data_path, target, report_path= None, **params):
+
+        """
+        Queues a report job and returns at once.
+
+        Parameters
+        ----------
+        data_path : str
+            A .csv, .parquet or .feather file holding the dataset.
+        target : str
+            The name of the target column.
+        report_path : str, optional
+            Where the formatted report is written, with a timestamp added (default is
+            None, the frames are computed but no report is written).
+        **params
+            The analysis parameters of `EDAResult` (ignore_cols, cat_label_enco_thresh,
+            num_min_samples_leaf, auc_engine, max_rows, random_state, bin_engine, screen,
+            cv_folds, cv_tolerance, fold_aucs, bivariate) and
+            the output options of `EDA_Formatter` (conditional_color, write_only,
+            formulas, sheet_rows).
+
+        Returns
+        -------
+        str
+            The id of the job, or of the identical job already running.
+        """
+
+        self._start()
+        unknown = set(params) - set(ANALYSIS_PARAMS) - set(RENDER_PARAMS)
+        if unknown:
+            raise TypeError(f"Unknown report parameters: {sorted(unknown)}")
+
+        analysis_params = {name: params[name] for name in ANALYSIS_PARAMS if name in params}
+        render_params = {name: params[name] for name in RENDER_PARAMS if name in params}
+
+        fingerprint = await self._fingerprint(data_path)
+        analysis_key = EDACache.make_key('report', fingerprint, target, sorted(analysis_params.items()))
+        job_key = EDACache.make_key(analysis_key, report_path, sorted(render_params.items()))
+
+        running = self._running.get(job_key)
+        if running is not None:
+            return running
+
+        job_id = str(next(self._ids))
+        self._jobs[job_id] = {'status': 'queued', 'events': [], 'subscribers': [],
+                              'data_path': data_path, 'target': target, 'report_path': None,
+                              'cached': False, 'error': None, 'task': None}
+        self._running[job_key] = job_id
+        self._emit(job_id, 'queued', data= data_path, target= target)
+
+        task = asyncio.ensure_future(self._run(job_id, job_key, analysis_key, data_path, target,
+                                               analysis_params, report_path, render_params))
+        self._jobs[job_id]['task'] = task
+        return job_id
+
+    async def _analysis(self, job_id, analysis_key, data_path, target, params):
+
+        """Returns the frames of an analysis, from the results, a running analysis or the pool."""
+
+        result = self._get_result(analysis_key)
+        if result is not None:
+            self._jobs[job_id]['cached'] = True
+            self._emit(job_id, 'cached')
+            return result
+
+        self._watchers.setdefault(analysis_key, set()).add(job_id)
+        try:
+            future = self._analyses.get(analysis_key)
+            if future is None:
+                future = self._loop.run_in_executor(self._pool, _analyse, analysis_key, data_path,
+                                                    target, params)
+                self._analyses[analysis_key] = future
+                future.add_done_callback(lambda _: self._analyses.pop(analysis_key, None))
+            self._emit(job_id, 'analysing')
+            result = await asyncio.shield(future)
+        finally:
+            self._watchers[analysis_key].discard(job_id)
+
+        if self._get_result(analysis_key) is None:
+            self._put_result(analysis_key, result)
+        return result
+
+    async def _run(self, job_id, job_key, analysis_key, data_path, target, analysis_params,
+                   report_path, render_params):
+
+        job = self._jobs[job_id]
+        try:
+            grp_data, roc_data, skipped_data, bivariate_data = await self._analysis(
+                job_id, analysis_key, data_path, target, analysis_params)
+            job['grp_data'], job['roc_data'], job['skipped_data'] = grp_data, roc_data, skipped_data
+            job['bivariate_data'] = bivariate_data
+            self._emit(job_id, 'analysed', columns= len(roc_data), rows= len(grp_data))
+
+            if report_path is not None:
+                self._emit(job_id, 'rendering', report_path= report_path)
+                render_job = dict(render_params, path= report_path, model_type= target,
+                                  grp_data= grp_data, roc_data= roc_data, skipped_data= skipped_data,
+                                  bivariate_data= bivariate_data)
+                job['report_path'] = await self._loop.run_in_executor(self._pool, _render, render_job)
+
+            self._emit(job_id, 'done', report_path= job['report_path'], cached= job['cached'])
+        except Exception as e:
+            job['error'] = f"{type(e).__name__}: {e}"
+            self._emit(job_id, 'failed', error= job['error'])
+        finally:
+            self._running.pop(job_key, None)
+
+    def status(self, job_id):
+
+        """
+        Returns the current status of a job.
+
+        Returns
+        -------
+        dict
+            The job id, its status ('queued', 'analysing', 'rendering', 'done' or
+            'failed'), the report path, whether the analysis was reused, and the error.
+        """
+
+        job = self._jobs[job_id]
+        return {'job': job_id, 'status': job['status'], 'report_path': job['report_path'],
+                'cached': job['cached'], 'error': job['error']}
+
+    async def result(self, job_id):
+
+        """
+        Waits for a job to finish.
+
+        Returns
+        -------
+        dict
+            The status of the job, with its frames under 'grp_data', 'roc_data',
+            'skipped_data' and 'bivariate_data'.
+        """
+
+        job = self._jobs[job_id]
+        await job['task']
+        return dict(self.status(job_id), grp_data= job.get('grp_data'), roc_data= job.get('roc_data'),
+                    skipped_data= job.get('skipped_data'), bivariate_data= job.get('bivariate_data'))
+
+    async def run(self, data_path, target, report_path= None, **params):
+        """Submits a job and waits for it, see `submit` and `result`."""
+        return await self.result(await self.submit(data_path, target, report_path, **params))
+
+    async def events(self, job_id):
+
+        """
+        Iterates over the events of a job, those already recorded first, until it is done
+        or failed.
+
+        Yields
+        ------
+        dict
+            The next event, with its name under "event" and the job id under "job".
+        """
+
+        job = self._jobs[job_id]
+        queue = asyncio.Queue()
+        for item in job['events']:
+            queue.put_nowait(item)
+        job['subscribers'].append(queue)
+        try:
+            while True:
+                item = await queue.get()
+                yield item
+                if item['event'] in FINAL_EVENTS:
+                    return
+        finally:
+            job['subscribers'].remove(queue)
+
+    async def close(self):
+        """Waits for the running jobs, then stops the pool and the event thread."""
+        tasks = [job['task'] for job in self._jobs.values() if job['task'] is not None]
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions= True)
+        self._pool.shutdown()
+        if self._pump is not None:
+            self._events.put(None)
+            self._pump.join()
+
+
+async def _respond(writer, status, body, content_type= 'application/json'):
+    reason = {200: 'OK', 202: 'Accepted', 400: 'Bad Request', 404: 'Not Found'}[status]
+    data = body if isinstance(body, bytes) else json.dumps(body).encode('utf-8')
+    writer.write(f"HTTP/1.1 {status} {reason}\r\nContent-Type: {content_type}\r\n"
+                 f"Content-Length: {len(data)}\r\nConnection: close\r\n\r\n".encode('latin-1') + data)
+    await writer.drain()
+
+
+async def _handle(service, reader, writer):
+
+    """Serves one HTTP request of the stand-in server."""
+
+    try:
+        request = (await reader.readline()).decode('latin-1').split()
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode('latin-1').strip()
+            if not line:
+                break
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+        if len(request) < 2:
+            return await _respond(writer, 400, {'error': 'bad request'})
+        method, path = request[0], request[1].rstrip('/')
+        parts = path.strip('/').split('/')
+
+        if method == 'POST' and parts == ['jobs']:
+            try:
+                body = json.loads(await reader.readexactly(int(headers.get('content-length', 0))) or b'{}')
+            except (ValueError, asyncio.IncompleteReadError) as e:
+                # a malformed body or Content-Length, or a body shorter than it
+                return await _respond(writer, 400, {'error': f"Invalid JSON body: {e}"})
+            try:
+                job_id = await service.submit(body['data'], body['target'], body.get('report_path'),
+                                              **body.get('params', {}))
+            except (KeyError, TypeError, OSError) as e:
+                return await _respond(writer, 400, {'error': f"{type(e).__name__}: {e}"})
+            return await _respond(writer, 202, service.status(job_id))
+
+        if method == 'GET' and len(parts) >= 2 and parts[0] == 'jobs' and parts[1] in service._jobs:
+            if len(parts) == 2:
+                return await _respond(writer, 200, service.status(parts[1]))
+            if parts[2:] == ['events']:
+                # streamed until the job ends, the connection closing marks the end
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\n"
+                             b"Connection: close\r\n\r\n")
+                async for item in service.events(parts[1]):
+                    writer.write(json.dumps(item).encode('utf-8') + b"\n")
+                    await writer.drain()
+                return
+
+        return await _respond(writer, 404, {'error': f"no route for {method} {path}"})
+    finally:
+        # workers forked while the connection was open hold a copy of its socket, so the
+        # end of the response is sent with a shutdown instead of waiting on the close
+        if writer.can_write_eof() and not writer.is_closing():
+            writer.write_eof()
+        writer.close()
+
+
+async def serve(host= '127.0.0.1', port= 8765, max_workers= 1, cache= None):
+    """Runs the HTTP stand-in until it is interrupted."""
+    async with ReportService(max_workers, cache) as service:
+        server = await asyncio.start_server(lambda r, w: _handle(service, r, w), host, port)
+        print(f"EDA report service listening on http://{host}:{port}", flush= True)
+        async with server:
+            await server.serve_forever()
+
+
+async def _run_cli(args, params):
+    async with ReportService(args.workers, args.cache) as service:
+        job_id = await service.submit(args.data, args.target, args.report, **params)
+        async for item in service.events(job_id):
+            print(json.dumps(item), flush= True)
+        return service.status(job_id)['status'] == 'done'
+
+
+def _parse_param(text):
+    name, _, value = text.partition('=')
+    try:
+        return name, json.loads(value)
+    except ValueError:
+        return name, value
+
+
+def main(argv= None):
+    parser = argparse.ArgumentParser(description= __doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest= 'command', required= True)
+
+    run = commands.add_parser('run', help= 'build one report and print its events')
+    run.add_argument('data')
+    run.add_argument('target')
+    run.add_argument('--report', help= 'the report path, no report is written without it')
+    run.add_argument('--param', action= 'append', default= [], metavar= 'NAME=VALUE',
+                     help= 'a report parameter, the value read as JSON when it parses')
+
+    server = commands.add_parser('serve', help= 'serve jobs over HTTP')
+    server.add_argument('--host', default= '127.0.0.1')
+    server.add_argument('--port', type= int, default= 8765)
+
+    for command in (run, server):
+        command.add_argument('--workers', type= int, default= 1)
+        command.add_argument('--cache', help= 'a directory where finished analyses are kept')
+
+    args = parser.parse_args(argv)
+    if args.command == 'run':
+        params = dict(_parse_param(text) for text in args.param)
+        unknown = set(params) - set(ANALYSIS_PARAMS) - set(RENDER_PARAMS)
+        if unknown:
+            parser.error(f"unknown report parameters: {', '.join(sorted(unknown))}")
+        sys.exit(0 if asyncio.run(_run_cli(args, params)) else 1)
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.cache))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
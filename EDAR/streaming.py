@@ -0,0 +1,468 @@
+import os
+import numpy as np
+import pandas as pd
+
+from EDAR.auc import cv_auc
+from EDAR.excel_report import _fit_thresholds, _bin_table
+from EDAR.schema import is_numeric_dtype
+from EDAR.columnar import is_arrow_dataset
+
+
+def _is_parquet(path):
+    return path.lower().endswith(('.parquet', '.pq'))
+
+
+def _import_parquet():
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Reading Parquet files requires pyarrow, install it with "
+                          "`pip install pyarrow`") from e
+    return pq
+
+
+def source_columns(source):
+
+    """
+    Lists the columns of a file or chunk source.
+
+    Parameters
+    ----------
+    source : str, os.PathLike, callable or pyarrow.dataset.Dataset
+        A .csv or .parquet file, a function returning an iterable of DataFrame chunks, or
+        an Arrow dataset.
+
+    Returns
+    -------
+    list of str
+        The column names.
+    """
+
+    if is_arrow_dataset(source):
+        return source.schema.names
+
+    if callable(source):
+        for chunk in source():
+            return chunk.columns.tolist()
+        return []
+
+    path = os.fspath(source)
+    if _is_parquet(path):
+        return _import_parquet().ParquetFile(path).schema_arrow.names
+    return pd.read_csv(path, nrows= 0).columns.tolist()
+
+
+def iter_chunks(source, columns, chunksize= 100_000):
+
+    """
+    Reads some columns of a file or chunk source, a chunk of rows at a time.
+
+    Parameters
+    ----------
+    source : str, os.PathLike, callable or pyarrow.dataset.Dataset
+        A .csv or .parquet file, a function returning an iterable of DataFrame chunks, or
+        an Arrow dataset, whose batches are scanned with only `columns`.
+    columns : list of str
+        The columns to read.
+    chunksize : int, optional
+        Number of rows per chunk when reading a file (default is 100,000).
+
+    Yields
+    ------
+    pd.DataFrame
+        The next chunk, holding only `columns`.
+    """
+
+    if is_arrow_dataset(source):
+        for batch in source.to_batches(columns= columns, batch_size= chunksize):
+            yield batch.to_pandas()
+        return
+
+    if callable(source):
+        for chunk in source():
+            yield chunk[columns]
+        return
+
+    path = os.fspath(source)
+    if _is_parquet(path):
+        parquet_file = _import_parquet().ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size= chunksize, columns= columns):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, usecols= columns, chunksize= chunksize)
+
+
+class _Reservoir:
+
+    """
+    Keeps a uniform sample of at most `size` rows of a stream of chunks (algorithm R).
+
+    The same seed and chunk sizes select the same rows, so every column group of a
+    source is sampled on the same rows.
+    """
+
+    def __init__(self, size, random_state= 0):
+        self.size = size
+        self.seen = 0
+        self.rng = np.random.default_rng(random_state)
+
+    def offer(self, n):
+
+        """
+        Chooses which rows of the next chunk enter the sample.
+
+        Parameters
+        ----------
+        n : int
+            The number of rows in the chunk.
+
+        Returns
+        -------
+        tuple of (np.ndarray, np.ndarray)
+            The chunk rows to store and the sample slot of each, later rows overwrite
+            earlier ones in the same slot.
+        """
+
+        start = self.seen
+        self.seen += n
+
+        fill = max(0, min(n, self.size - start))
+        rows = np.arange(fill)
+        slots = start + rows
+
+        if fill < n:
+            position = np.arange(start + fill, start + n)
+            slot = self.rng.integers(0, position + 1)
+            keep = slot < self.size
+            rows = np.concatenate([rows, position[keep] - start])
+            slots = np.concatenate([slots, slot[keep]])
+
+        return rows, slots
+
+
+class _ColumnStats:
+
+    """
+    Accumulates what the report needs from one column over a stream of chunks.
+
+    Every column keeps its reservoir sample. Categorical columns also count rows and
+    sum the target per category, and numeric columns do the same for 0, 1 and missing
+    values while they look like binary flags.
+
+    The kind of the column is taken from the first chunk where it has values, so a
+    column empty at the start of a file gets the kind of its later values. A numeric
+    column whose values turn out to hold text in a later chunk is widened to a
+    categorical one: its earlier numbers become text, as `_as_text` writes them, and
+    its categories are counted from the start again in the second pass, see `recount`.
+    """
+
+    def __init__(self, dtype, sample_size):
+        self.isnum = None
+        self.dtype_isnum = is_numeric_dtype(dtype)
+        self.sample = np.full(sample_size, np.nan)
+        self.agg = None
+        self.missing = [0, 0]
+        self.binary = False
+        self.recount = False
+
+    def finish(self):
+        """Settles the kind of a column without any value on that of its first chunk."""
+        if self.isnum is None:
+            self.isnum = self.binary = self.dtype_isnum
+            if not self.isnum:
+                self.sample = self.sample.astype(object)
+                self.agg = pd.DataFrame({'count': [], 'sum': []})
+
+    def widen(self):
+        """Turns a numeric column into a categorical one when a chunk holds text."""
+        self.isnum = self.binary = False
+        self.recount = True
+        self.agg = None
+        self.sample = np.array(_as_text(pd.Series(self.sample)), dtype= object)
+
+    def update(self, x, y, rows, slots):
+
+        isna = x.isna().to_numpy()
+        self.missing[0] += int(isna.sum())
+        self.missing[1] += y[isna].sum().item()
+
+        if isna.all():
+            self.sample[slots] = np.nan
+            return
+
+        isnum = is_numeric_dtype(x.dtype)
+        if self.isnum is None:
+            self.isnum = self.binary = isnum
+            if not isnum:
+                self.sample = self.sample.astype(object)
+        elif self.isnum and not isnum:
+            self.widen()
+        if not self.isnum and isnum:
+            x = _as_text(x)
+
+        self.sample[slots] = x.to_numpy()[rows]
+
+        if self.isnum and self.binary:
+            values = x.to_numpy()[~isna]
+            if np.isin(values, [0, 1]).all():
+                y_valid = y[~isna]
+                one = values == 1
+                part = pd.DataFrame({'count': [(~one).sum(), one.sum()],
+                                     'sum': [y_valid[~one].sum(), y_valid[one].sum()]},
+                                    index= [0, 1])
+                self.agg = part if self.agg is None else self.agg + part
+            else:
+                self.binary = False
+                self.agg = None
+
+        elif not self.isnum and not self.recount:
+            self.agg = _add_counts(self.agg, x, y)
+
+
+def _as_text(x):
+    """Writes the values of a column as text, numbers as floats such as '3.0', keeping missing values."""
+    values = x.astype(np.float64) if is_numeric_dtype(x.dtype) else x
+    return values.astype(str).astype(object).where(x.notna(), np.nan)
+
+
+def _add_counts(agg, x, y):
+    """Adds the row count and target sum per category of a chunk to `agg`."""
+    part = pd.DataFrame({'x': x.to_numpy(), 'y': y}).groupby('x')['y'].agg(['count', 'sum'])
+    return part if agg is None else pd.concat([agg, part]).groupby(level= 0).sum()
+
+
+def _encode_levels(counts, cat_label_enco_thresh):
+
+    """
+    Label encodes categories from their counts, collapsing rare levels into 0.
+
+    Parameters
+    ----------
+    counts : pd.Series
+        The number of rows per category, sorted by category, missing values included
+        in the most frequent one.
+    cat_label_enco_thresh : float
+        Levels with a lower share of rows than this are encoded as 0.
+
+    Returns
+    -------
+    dict
+        The code of every category.
+    """
+
+    rates = counts / counts.sum()
+    codes = np.where(rates >= cat_label_enco_thresh,
+                     np.cumsum(rates >= cat_label_enco_thresh), 0)
+    return dict(zip(counts.index, codes))
+
+
+def _categorical_bins(agg, n_missing, sample, y_sample, cat_label_enco_thresh):
+
+    """
+    Builds the bin table and the ROC AUC of a categorical column from its exact counts.
+
+    Parameters
+    ----------
+    agg : pd.DataFrame
+        The row count and target sum per category.
+    n_missing : int
+        The number of missing values, filled with the most frequent category.
+    sample : np.ndarray
+        The reservoir sample of the column.
+    y_sample : np.ndarray
+        The target values of the sample.
+    cat_label_enco_thresh : float
+        Threshold for encoding categorical labels.
+
+    Returns
+    -------
+    tuple of (pd.DataFrame, float)
+        The count, sum and mean of the target per category and the median ROC AUC.
+    """
+
+    agg = agg.sort_index()
+    counts = agg['count'].copy()
+    mode = counts.idxmax()
+    counts[mode] += n_missing
+
+    grp_df = agg.assign(mean= agg['sum'] / agg['count']).rename_axis('value').reset_index()
+
+    X = pd.Series(sample).fillna(mode).map(_encode_levels(counts, cat_label_enco_thresh))
+
+    return grp_df, np.median(cv_auc(X.to_numpy(dtype= np.float64), y_sample))
+
+
+def _record(col, grp_df, roc_auc):
+    grp_df.insert(0, 'Column', col)
+    return {"Column": col, "bins": grp_df, "ROC AUC": roc_auc}
+
+
+def _analyse_group(source, cols, target, cat_label_enco_thresh, num_min_samples_leaf,
+                   chunksize, sample_size, random_state, bin_engine= 'sklearn'):
+
+    """
+    Analyses a group of columns with one pass over the source, plus one more for numeric columns
+    and the columns widened to categorical after their first values.
+
+    Returns
+    -------
+    list of dict
+        One record per column, in the order of `cols`, as built by `_analyse_column`.
+    """
+
+    reservoir = _Reservoir(sample_size, random_state)
+    stats = {}
+    y_sample = None
+
+    for chunk in iter_chunks(source, cols + [target], chunksize):
+        if not len(chunk):
+            continue
+        y = chunk[target].to_numpy()
+        rows, slots = reservoir.offer(len(chunk))
+
+        if y_sample is None:
+            y_sample = np.empty(sample_size, dtype= y.dtype)
+            stats = {col: _ColumnStats(chunk[col].dtype, sample_size) for col in cols}
+        y_sample[slots] = y[rows]
+
+        for col in cols:
+            stats[col].update(chunk[col], y, rows, slots)
+
+    if y_sample is None or reservoir.seen == 0:
+        raise ValueError("The source has no rows to analyse")
+    for state in stats.values():
+        state.finish()
+
+    n_sample = min(reservoir.seen, sample_size)
+    y_sample = y_sample[:n_sample]
+    y_int = np.issubdtype(y_sample.dtype, np.integer) or y_sample.dtype == bool
+
+    records = {}
+    numeric = {}
+    numeric_auc = {}
+    recount = [col for col in cols if stats[col].recount]
+
+    for col in cols:
+        state = stats[col]
+        sample = state.sample[:n_sample]
+        if state.recount:
+            continue
+
+        binary = None
+        if state.isnum and state.binary and state.agg is not None and (state.agg['count'] > 0).all():
+            binary = {0: "No", 1: "Yes"}
+        elif not state.isnum and set(state.agg.index) == {'Y', 'N'}:
+            binary = {'Y': "Yes", 'N': "No"}
+
+        if binary is not None:
+            # Check for binary columns and replace them with "No" and "Yes", missing as "No"
+            agg = state.agg.rename(index= binary)
+            agg.loc["No", "count"] += state.missing[0]
+            agg.loc["No", "sum"] += state.missing[1]
+            sample = pd.Series(sample).map(binary).fillna("No").to_numpy()
+            records[col] = _record(col, *_categorical_bins(agg, 0, sample, y_sample, cat_label_enco_thresh))
+
+        elif not state.isnum:
+            records[col] = _record(col, *_categorical_bins(state.agg, state.missing[0], sample,
+                                                           y_sample, cat_label_enco_thresh))
+
+        else:
+            fill = np.nanmedian(sample)
+            X = np.where(np.isnan(sample), fill, sample)
+            thresholds = _fit_thresholds(X.reshape(-1,1), y_sample, num_min_samples_leaf, bin_engine)
+            numeric[col] = (fill, thresholds, np.zeros(len(thresholds) + 1), np.zeros(len(thresholds) + 1))
+            numeric_auc[col] = np.median(cv_auc(X, y_sample, num_min_samples_leaf))
+
+    # exact count and sum of the target per bin, and per category of the widened columns
+    if numeric or recount:
+        for chunk in iter_chunks(source, list(numeric) + recount + [target], chunksize):
+            y = chunk[target].to_numpy()
+            for col, (fill, thresholds, count, total) in numeric.items():
+                bins = np.digitize(chunk[col].fillna(fill).to_numpy(dtype= np.float64), thresholds, right= True)
+                count += np.bincount(bins, minlength= len(count))
+                total += np.bincount(bins, weights= y, minlength= len(total))
+            for col in recount:
+                x = chunk[col]
+                stats[col].agg = _add_counts(stats[col].agg, _as_text(x) if is_numeric_dtype(x.dtype) else x, y)
+
+        for col in recount:
+            state = stats[col]
+            records[col] = _record(col, *_categorical_bins(state.agg, state.missing[0],
+                                                           state.sample[:n_sample], y_sample,
+                                                           cat_label_enco_thresh))
+
+        for col, (fill, thresholds, count, total) in numeric.items():
+            grp_df = _bin_table('value', thresholds, count, total, y_int)
+            records[col] = _record(col, grp_df, numeric_auc[col])
+
+    return [records[col] for col in cols]
+
+
+def analyse_source(source, target, ignore_cols= None, cat_label_enco_thresh= 0.05,
+                   num_min_samples_leaf= 0.1, columns_per_group= 50, chunksize= 100_000,
+                   sample_size= 100_000, random_state= 0, progress_callback= None,
+                   bin_engine= 'sklearn'):
+
+    """
+    Runs the per-column analysis of `EDAExcelReport` on a source read in chunks.
+
+    Only one group of `columns_per_group` columns is held in memory at a time. Bins,
+    missing value fills and the ROC AUC are estimated on a reservoir sample of
+    `sample_size` rows, while the count, sum and mean of every bin and category are
+    exact. A CSV file is parsed again for every column group; Parquet files and Arrow
+    datasets only read the columns of the group.
+
+    Parameters
+    ----------
+    source : str, os.PathLike, callable or pyarrow.dataset.Dataset
+        A .csv or .parquet file, a function returning a fresh iterable of DataFrame
+        chunks each time it is called, or an Arrow dataset.
+    target : str
+        The name of the target variable.
+    ignore_cols : list of str, optional
+        Columns to ignore in the analysis (default is None).
+    cat_label_enco_thresh : float, optional
+        Threshold for encoding categorical labels (default is 0.05).
+    num_min_samples_leaf : float, optional
+        Minimum samples per leaf for numerical data (default is 0.1).
+    columns_per_group : int, optional
+        Number of columns analysed per pass over the source (default is 50).
+    chunksize : int, optional
+        Number of rows per chunk when reading a file (default is 100,000).
+    sample_size : int, optional
+        Number of rows kept in the reservoir sample (default is 100,000).
+    random_state : int, optional
+        Seed of the reservoir sample (default is 0).
+    progress_callback : callable, optional
+        Called as `progress_callback(done, total, col)` after each column (default is None).
+    bin_engine : str, optional
+        How the bins of numeric columns are fitted, 'sklearn' or 'hist' (default is 'sklearn').
+
+    Returns
+    -------
+    list of dict
+        One record per column, as returned by `EDAExcelReport._analyse_columns`. A
+        ValueError is raised for an empty source or one without `target`.
+    """
+
+    cols = source_columns(source)
+    if not cols:
+        raise ValueError("The source is empty, it has no columns or rows to analyse")
+    if target not in cols:
+        raise ValueError(f"The target {target!r} is not a column of the source")
+    cols.remove(target)
+
+    if ignore_cols is not None:
+        cols = [col for col in cols if col not in ignore_cols]
+
+    records = []
+    for start in range(0, len(cols), columns_per_group):
+        group = cols[start:start + columns_per_group]
+        records += _analyse_group(source, group, target, cat_label_enco_thresh,
+                                  num_min_samples_leaf, chunksize, sample_size, random_state,
+                                  bin_engine)
+        if progress_callback is not None:
+            for i, col in enumerate(group):
+                progress_callback(start + i + 1, len(cols), col)
+
+    return records
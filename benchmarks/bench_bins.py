@@ -0,0 +1,81 @@
+"""
+Compares the 'sklearn' and 'hist' engines that fit the bins of numeric columns.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_bins --rows 1000000 --leaf 0.05
+
+For every column the fit time and peak memory of both engines are given, with the
+number of bins, the share of rows that land in the same bin under both, and the
+difference between the in-sample ROC AUC of the target rate of the bins of each.
+"""
+
+import argparse
+import time
+import tracemalloc
+import numpy as np
+from sklearn.metrics import roc_auc_score
+
+from EDAR.excel_report import _fit_thresholds
+
+
+def make_columns(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    y = (rng.random(rows) < 0.15).astype(int)
+    columns = {
+        "normal": rng.normal(size=rows) + 0.3 * y,
+        "lognormal": np.exp(rng.normal(size=rows) + 0.2 * y),
+        "uniform": rng.random(rows) + 0.05 * y,
+        "int 0-200": rng.integers(0, 200, rows) + y * rng.integers(0, 5, rows),
+        "4 values": rng.choice([-5.0, 0.0, 1.5, 3.0], rows),
+    }
+    return columns, y
+
+
+def measure(x, y, leaf, engine):
+    X = x.reshape(-1, 1)
+    _fit_thresholds(X, y, leaf, engine)
+    start = time.perf_counter()
+    edges = _fit_thresholds(X, y, leaf, engine)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    _fit_thresholds(X, y, leaf, engine)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return edges, elapsed, peak
+
+
+def binned_auc(bins, y):
+    rate = np.bincount(bins, weights=y) / np.maximum(np.bincount(bins), 1)
+    return roc_auc_score(y, rate[bins])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--leaf", type=float, default=0.05,
+                        help="num_min_samples_leaf, a fraction of the rows")
+    args = parser.parse_args()
+
+    columns, y = make_columns(args.rows)
+    print(f"rows={args.rows} leaf={args.leaf}, a column is {args.rows * 8 / 2**20:.1f} MiB as float64 "
+          f"and {args.rows / 2**20:.1f} MiB as uint8 buckets")
+    print(f"{'column':<12}{'sklearn':>26}{'hist':>26}{'bins':>10}{'same bin':>10}{'AUC diff':>10}")
+
+    for name, x in columns.items():
+        cells = []
+        bins = []
+        for engine in ("sklearn", "hist"):
+            edges, elapsed, peak = measure(x, y, args.leaf, engine)
+            cells.append(f"{elapsed:8.3f}s {peak / 2**20:9.1f} MiB")
+            bins.append(np.digitize(x, edges[:-1], right=True))
+        n_bins = f"{bins[0].max() + 1}/{bins[1].max() + 1}"
+        same = (bins[0] == bins[1]).mean()
+        auc_diff = abs(binned_auc(bins[0], y) - binned_auc(bins[1], y))
+        print(f"{name:<12}" + "".join(f"{cell:>26}" for cell in cells)
+              + f"{n_bins:>10}{same:>10.2%}{auc_diff:>10.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Compares the time and peak memory of ways to turn a numeric column into a filled array.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_extract --rows 5000000
+
+Peak memory is measured with tracemalloc over the extraction of one column, the times
+come from a separate run without tracing.
+"""
+
+import argparse
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+from EDAR.excel_report import _numeric_values
+
+
+def tolist_copy(x):
+    # the extraction of the first versions of the report
+    return np.array(x.fillna(x.median()).values.tolist()).reshape(-1,1)
+
+
+def to_numpy_copy(x):
+    return x.to_numpy(dtype=np.float64, na_value=x.median()).reshape(-1,1)
+
+
+METHODS = {"tolist": tolist_copy, "to_numpy": to_numpy_copy, "buffer": _numeric_values}
+
+
+def make_columns(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    with_missing = rng.normal(size=rows)
+    with_missing[rng.random(rows) < 0.1] = np.nan
+    float32 = with_missing.astype(np.float32)
+    return pd.DataFrame({
+        "float64": rng.normal(size=rows),
+        "float64 missing": with_missing,
+        "float32 missing": float32,
+        "int64": rng.integers(0, 1000, rows),
+    })
+
+
+def measure(func, x):
+    func(x)
+    start = time.perf_counter()
+    func(x)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    func(x)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--skip-tolist", action="store_true",
+                        help="leave out the slowest method")
+    args = parser.parse_args()
+
+    data = make_columns(args.rows)
+    methods = {name: func for name, func in METHODS.items()
+               if not (args.skip_tolist and name == "tolist")}
+
+    print(f"rows={args.rows}, column size {args.rows * 8 / 2**20:.1f} MiB as float64")
+    print(f"{'column':<16}" + "".join(f"{name:>24}" for name in methods))
+    for col in data.columns:
+        cells = []
+        for func in methods.values():
+            elapsed, peak = measure(func, data[col])
+            cells.append(f"{elapsed:8.3f}s {peak / 2**20:9.1f} MiB")
+        print(f"{col:<16}" + "".join(f"{cell:>24}" for cell in cells))
+
+
+if __name__ == "__main__":
+    main()
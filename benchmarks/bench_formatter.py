@@ -0,0 +1,80 @@
+"""
+Times EDA_Formatter on synthetic Detailed EDA frames of growing width.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_formatter --cols 500 1000 2000 5000 [--write-only]
+
+Peak memory is measured with tracemalloc, which slows the run down, so the times are
+only comparable between runs of this script.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+from EDAR.eda_format import EDA_Formatter
+
+
+def make_report(cols, bins=8, seed=0):
+
+    """
+    Builds `grp_data` and `roc_data` frames shaped like the output of EDAExcelReport.
+
+    Even columns are numeric, with `bins` bins keyed by their upper edge, odd columns
+    are categorical with `bins` levels.
+    """
+
+    rng = np.random.default_rng(seed)
+    frames = []
+    for i in range(cols):
+        if i % 2 == 0:
+            edges = np.sort(rng.normal(100, 30, bins - 1))
+            values = [str(v) for v in edges] + ['inf']
+        else:
+            values = ['level_%d' % j for j in range(bins)]
+        count = rng.integers(50, 5000, bins)
+        total = rng.binomial(count, 0.1)
+        frames.append(pd.DataFrame({'Column': 'col_%d' % i, 'value': values, 'count': count,
+                                    'sum': total, 'mean': total / count}))
+
+    grp_data = pd.concat(frames, ignore_index=True)
+    roc_data = pd.DataFrame({'Column': ['col_%d' % i for i in range(cols)],
+                             'ROC AUC': rng.uniform(0.45, 0.7, cols)})
+    return grp_data, roc_data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cols", type=int, nargs="+", default=[500, 1000, 2000, 5000])
+    parser.add_argument("--bins", type=int, default=8)
+    parser.add_argument("--write-only", action="store_true",
+                        help="use the streaming write-only workbook")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for cols in args.cols:
+            grp_data, roc_data = make_report(cols, args.bins)
+            tracemalloc.start()
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                formatter = EDA_Formatter(path=os.path.join(tmp, 'report_%d.xlsx' % cols),
+                                          model_type='target', grp_data=grp_data, roc_data=roc_data,
+                                          write_only=args.write_only)
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1] / 2**20
+            tracemalloc.stop()
+            size = os.path.getsize(formatter.output_path) / 2**20
+            print(f"cols={cols:6d} rows={len(grp_data):7d}  {elapsed:8.2f}s  "
+                  f"{elapsed / len(grp_data) * 1e6:7.1f}us/row  peak {peak:7.1f} MiB  "
+                  f"file {size:6.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Compares writing the Detailed EDA with Excel formulas and with precomputed values.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_formulas --cols 2000 --bins 20
+
+For each mode the report is written from a synthetic Detailed EDA frame, and the write
+time, file size and openpyxl load time are given. When LibreOffice is installed
+(`soffice` on the PATH), the time it takes to open the report, recalculate it and save
+it again is given too, as a stand-in for opening the report in Excel.
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+from EDAR.eda_format import EDA_Formatter
+
+
+def make_eda(cols, bins, seed=0):
+    rng = np.random.default_rng(seed)
+    blocks = []
+    for i in range(cols):
+        if i % 2:
+            values = [f"level_{j}" for j in range(bins)]
+        else:
+            values = [str(edge) for edge in np.sort(rng.normal(size=bins - 1))] + ["inf"]
+        count = rng.integers(1, 1000, bins)
+        total = rng.binomial(count, 0.1)
+        blocks.append(pd.DataFrame({"Column": f"col_{i}", "value": values, "count": count,
+                                    "sum": total, "mean": total / count}))
+    grp_data = pd.concat(blocks)
+    roc_data = pd.DataFrame({"Column": [f"col_{i}" for i in range(cols)],
+                             "ROC AUC": rng.uniform(0.5, 0.7, cols)})
+    return grp_data, roc_data
+
+
+def recalc_time(path, soffice, out_dir):
+    start = time.perf_counter()
+    subprocess.run([soffice, "--headless", "--calc", "--convert-to", "xlsx", "--outdir", out_dir, path],
+                   check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cols", type=int, default=2000)
+    parser.add_argument("--bins", type=int, default=20)
+    args = parser.parse_args()
+
+    grp_data, roc_data = make_eda(args.cols, args.bins)
+    soffice = shutil.which("soffice") or shutil.which("libreoffice")
+
+    print(f"cols={args.cols} bins={args.bins} rows={len(grp_data)}")
+    header = f"{'mode':<22}{'write':>10}{'size':>12}{'load':>10}"
+    print(header + (f"{'recalc':>10}" if soffice else "  (no soffice, recalc time skipped)"))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for write_only in (False, True):
+            for formulas in (True, False):
+                name = ("write_only " if write_only else "") + ("formulas" if formulas else "values")
+                start = time.perf_counter()
+                formatter = EDA_Formatter(path=os.path.join(tmp, "bench.xlsx"), model_type="target",
+                                          grp_data=grp_data, roc_data=roc_data,
+                                          write_only=write_only, formulas=formulas)
+                write = time.perf_counter() - start
+                path = formatter.output_path
+
+                start = time.perf_counter()
+                load_workbook(path)
+                load = time.perf_counter() - start
+
+                line = f"{name:<22}{write:9.2f}s{os.path.getsize(path) / 2**20:9.2f} MiB{load:9.2f}s"
+                if soffice:
+                    line += f"{recalc_time(path, soffice, os.path.join(tmp, 'recalc')):9.2f}s"
+                print(line)
+                os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""
+Times every stage of the report on synthetic datasets and compares runs with a baseline.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_suite --preset small --save      # store a baseline
+    python -m benchmarks.bench_suite --preset small --compare   # check against it
+
+Each dataset of `benchmarks.datasets` is run through four steps, each in a fresh
+process so its peak RSS is its own:
+
+    full_eda       EDAExcelReport._get_full_eda, the Detailed EDA frame
+    roc_auc        EDAExcelReport._get_roc_auc, the ROC Report frame
+    run_formatter  EDA_Formatter.run_formatter on the two frames above
+    end_to_end     EDAExcelReport, from the DataFrame to the saved report
+
+For each step the wall time, the peak RSS of the process, the RSS once the dataset was
+generated and the size of the written report are kept. The 'full' preset holds the
+sizes the package is meant to handle (10k columns, 50M rows, 100k levels, 95% missing)
+and needs tens of GB and hours, 'small' scales them down to run in minutes.
+
+A baseline is a JSON file with the results and the versions of Python and of the
+libraries used. With --compare, every time, peak RSS or file size more than --tolerance
+above the baseline is reported and the script exits with status 1, so a library upgrade
+can be checked before it is rolled out. Baselines depend on the machine, compare runs
+made on the same one.
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.datasets import GENERATORS
+
+PRESETS = {
+    "full": {
+        "wide": dict(rows=10_000, cols=10_000),
+        "tall": dict(rows=50_000_000, cols=4),
+        "high_cardinality": dict(rows=1_000_000, cols=10, levels=100_000),
+        "mostly_missing": dict(rows=1_000_000, cols=50, missing=0.95),
+    },
+    "small": {
+        "wide": dict(rows=2_000, cols=400),
+        "tall": dict(rows=1_000_000, cols=4),
+        "high_cardinality": dict(rows=100_000, cols=4, levels=10_000),
+        "mostly_missing": dict(rows=100_000, cols=20, missing=0.95),
+    },
+}
+
+STEPS = ("full_eda", "roc_auc", "run_formatter", "end_to_end")
+
+# differences below these are noise, whatever the tolerance
+MIN_DELTA = {"seconds": 0.05, "peak_rss": 5 * 2**20, "file_size": 1024}
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+
+
+def peak_rss():
+
+    """
+    Returns the peak resident memory of this process in bytes, or None where the
+    `resource` module is missing (Windows).
+    """
+
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def environment():
+    """The versions a run depends on, stored with the baseline."""
+    import numpy, pandas, openpyxl, sklearn
+    return {"python": platform.python_version(), "machine": platform.machine(),
+            "numpy": numpy.__version__, "pandas": pandas.__version__,
+            "openpyxl": openpyxl.__version__, "scikit-learn": sklearn.__version__}
+
+
+def run_step(preset, dataset, step, work):
+
+    """
+    Runs one step on one dataset in this process.
+
+    The frames of 'full_eda' and 'roc_auc' are pickled to `work` for 'run_formatter',
+    which computes them itself when they are missing.
+
+    Returns
+    -------
+    dict
+        The seconds, peak_rss, data_rss and file_size of the step.
+    """
+
+    from EDAR.excel_report import EDAExcelReport, EDAResult
+    from EDAR.eda_format import EDA_Formatter
+
+    class TimedFormatter(EDA_Formatter):
+        def run_formatter(self):
+            start = time.perf_counter()
+            super().run_formatter()
+            self.seconds = time.perf_counter() - start
+
+    eda_path = os.path.join(work, "eda.pkl")
+    roc_path = os.path.join(work, "roc.pkl")
+    frames_ready = os.path.exists(eda_path) and os.path.exists(roc_path)
+
+    data = None
+    if step != "run_formatter" or not frames_ready:
+        data = GENERATORS[dataset](**PRESETS[preset][dataset])
+    data_rss = peak_rss()
+
+    result = {"file_size": None}
+    with contextlib.redirect_stdout(io.StringIO()):
+        if step in ("full_eda", "roc_auc"):
+            report = EDAExcelReport.__new__(EDAExcelReport)
+            start = time.perf_counter()
+            if step == "full_eda":
+                frame = report._get_full_eda(data, "target", num_min_samples_leaf=0.1)
+            else:
+                frame = report._get_roc_auc(data, "target")
+            result["seconds"] = time.perf_counter() - start
+            frame.to_pickle(eda_path if step == "full_eda" else roc_path)
+
+        elif step == "run_formatter":
+            if frames_ready:
+                import pandas as pd
+                grp_data, roc_data = pd.read_pickle(eda_path), pd.read_pickle(roc_path)
+            else:
+                frames = EDAResult(data, "target")
+                grp_data, roc_data = frames.grp_data, frames.roc_data
+            formatter = TimedFormatter(path=os.path.join(work, "formatted.xlsx"), model_type="target",
+                                       grp_data=grp_data, roc_data=roc_data)
+            result["seconds"] = formatter.seconds
+            result["file_size"] = os.path.getsize(formatter.output_path)
+
+        else:
+            start = time.perf_counter()
+            EDAExcelReport(data, "target", os.path.join(work, "report.xlsx"))
+            result["seconds"] = time.perf_counter() - start
+            path = max(glob.glob(os.path.join(work, "report_*.xlsx")), key=os.path.getmtime)
+            result["file_size"] = os.path.getsize(path)
+
+    result["peak_rss"] = peak_rss()
+    result["data_rss"] = data_rss
+    return result
+
+
+def run_case(preset, dataset, step, work, repeat):
+
+    """
+    Runs a step in `repeat` fresh processes and keeps the smallest of each measure.
+    """
+
+    best = None
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-m", "benchmarks.bench_suite", "--preset", preset,
+                              "--case", dataset, step, "--work", work],
+                             check=True, stdout=subprocess.PIPE, text=True).stdout
+        result = json.loads(out.strip().splitlines()[-1])
+        if best is None:
+            best = result
+        else:
+            best = {key: value if best[key] is None else min(best[key], value)
+                    for key, value in result.items()}
+    return best
+
+
+def compare(results, baseline, tolerance):
+
+    """
+    Lists the measures of `results` more than `tolerance` above those of `baseline`.
+
+    Returns
+    -------
+    list of str
+        One line per regression.
+    """
+
+    regressions = []
+    for case, result in results.items():
+        base = baseline["results"].get(case)
+        if base is None:
+            continue
+        for key in ("seconds", "peak_rss", "file_size"):
+            new, old = result.get(key), base.get(key)
+            if new is None or not old:
+                continue
+            if new > old * (1 + tolerance) and new - old > MIN_DELTA[key]:
+                regressions.append(f"{case} {key}: {_fmt(key, old)} -> {_fmt(key, new)} "
+                                   f"({new / old - 1:+.0%})")
+    return regressions
+
+
+def _fmt(key, value):
+    if value is None:
+        return "-"
+    if key == "seconds":
+        return f"{value:.2f}s"
+    return f"{value / 2**20:.1f} MiB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="small")
+    parser.add_argument("--datasets", nargs="+", choices=sorted(GENERATORS), default=list(GENERATORS))
+    parser.add_argument("--steps", nargs="+", choices=STEPS, default=list(STEPS))
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="runs per step, the smallest time and memory are kept")
+    parser.add_argument("--baseline", help="the baseline file (default is baselines/<preset>.json)")
+    parser.add_argument("--save", action="store_true", help="store the results as the baseline")
+    parser.add_argument("--compare", action="store_true", help="compare the results with the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed increase over the baseline, as a fraction (default 0.2)")
+    parser.add_argument("--case", nargs=2, metavar=("DATASET", "STEP"), help=argparse.SUPPRESS)
+    parser.add_argument("--work", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        print(json.dumps(run_step(args.preset, args.case[0], args.case[1], args.work)))
+        return
+
+    baseline_path = args.baseline or os.path.join(BASELINE_DIR, f"{args.preset}.json")
+    baseline = None
+    if args.compare:
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+
+    print(f"preset={args.preset}")
+    print(f"{'case':<32}{'time':>10}{'peak RSS':>14}{'data RSS':>14}{'file':>12}"
+          + (f"{'vs base':>10}" if baseline else ""))
+
+    results = {}
+    for dataset in args.datasets:
+        with tempfile.TemporaryDirectory() as work:
+            for step in STEPS:
+                if step not in args.steps:
+                    continue
+                case = f"{dataset}.{step}"
+                result = run_case(args.preset, dataset, step, work, args.repeat)
+                results[case] = result
+                line = (f"{case:<32}{_fmt('seconds', result['seconds']):>10}"
+                        f"{_fmt('peak_rss', result['peak_rss']):>14}"
+                        f"{_fmt('data_rss', result['data_rss']):>14}"
+                        f"{_fmt('file_size', result['file_size']):>12}")
+                base = baseline["results"].get(case) if baseline else None
+                if base:
+                    line += f"{result['seconds'] / base['seconds'] - 1:>+10.0%}"
+                print(line, flush=True)
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(baseline_path)), exist_ok=True)
+        with open(baseline_path, "w") as f:
+            json.dump({"preset": args.preset, "environment": environment(), "results": results},
+                      f, indent=2)
+        print(f"baseline saved to {baseline_path}")
+
+    if baseline:
+        env = environment()
+        changed = [f"{key} {baseline['environment'].get(key)} -> {value}"
+                   for key, value in env.items() if baseline["environment"].get(key) != value]
+        if changed:
+            print("environment changed: " + ", ".join(changed))
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} regression(s) above {args.tolerance:.0%}:")
+            for line in regressions:
+                print("  " + line)
+            sys.exit(1)
+        print(f"no regression above {args.tolerance:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Compares the analysis of several targets in one pass with one report per target.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_targets --rows 200000 --cols 20 --targets 4
+
+Only the per-column analysis is timed, the workbooks are not written.
+"""
+
+import argparse
+import time
+import numpy as np
+import pandas as pd
+
+from EDAR.excel_report import EDAExcelReport, _analyse_column_targets
+from EDAR.parallel import map_columns
+
+
+def make_data(rows, cols, targets, seed=0):
+    rng = np.random.default_rng(seed)
+    data = {}
+    for i in range(cols):
+        if i % 3 == 0:
+            data[f"num_{i}"] = rng.normal(size=rows)
+        elif i % 3 == 1:
+            data[f"int_{i}"] = rng.integers(0, 50, rows)
+        else:
+            data[f"cat_{i}"] = rng.choice([f"level_{j}" for j in range(30)], rows)
+    data = pd.DataFrame(data)
+    for t in range(targets):
+        data[f"target_{t}"] = (rng.random(rows) < 0.1 + 0.05 * t).astype(int)
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--cols", type=int, default=20)
+    parser.add_argument("--targets", type=int, default=4)
+    args = parser.parse_args()
+
+    data = make_data(args.rows, args.cols, args.targets)
+    targets = [f"target_{t}" for t in range(args.targets)]
+    cols = [col for col in data.columns if col not in targets]
+    report = EDAExcelReport.__new__(EDAExcelReport)
+
+    start = time.perf_counter()
+    for target in targets:
+        report._analyse_columns(data.drop(columns=[t for t in targets if t != target]), target)
+    separate_time = time.perf_counter() - start
+
+    timings = {}
+    for n in (1, args.targets):
+        start = time.perf_counter()
+        map_columns(_analyse_column_targets, data, cols, data[targets[:n]].to_numpy(),
+                    targets=targets[:n], cat_label_enco_thresh=0.05, num_min_samples_leaf=0.1)
+        timings[n] = time.perf_counter() - start
+
+    print(f"rows={args.rows} cols={args.cols} targets={args.targets}")
+    print(f"one report per target : {separate_time:8.3f}s")
+    print(f"one pass, 1 target    : {timings[1]:8.3f}s")
+    print(f"one pass, {args.targets} targets   : {timings[args.targets]:8.3f}s"
+          f"  ({timings[args.targets] / timings[1]:.2f}x one target)")
+
+
+if __name__ == "__main__":
+    main()
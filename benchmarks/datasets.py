@@ -0,0 +1,131 @@
+"""
+Synthetic datasets for the benchmarks, each with a binary "target" column.
+
+Every generator is seeded, so a dataset is the same from one run to the next and the
+timings of two runs can be compared.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def _target(rng, rows, signal=None):
+    """A binary target with a 10% rate, raised where `signal` is large."""
+    logit = -2.2 + (0.0 if signal is None else 0.5 * signal)
+    return (rng.random(rows) < 1 / (1 + np.exp(-logit))).astype(int)
+
+
+def _levels(n, prefix="level"):
+    return [f"{prefix}_{i}" for i in range(n)]
+
+
+def wide(rows=10_000, cols=10_000, seed=0):
+
+    """
+    Many columns of a few rows, which stresses the per-column work and the formatter.
+
+    A quarter of the columns each are normal, small integers, binary flags and
+    categoricals of 30 levels.
+    """
+
+    rng = np.random.default_rng(seed)
+    levels = np.array(_levels(30))
+    data = {}
+    for i in range(cols):
+        kind = i % 4
+        if kind == 0:
+            data[f"num_{i}"] = rng.normal(size=rows)
+        elif kind == 1:
+            data[f"int_{i}"] = rng.integers(0, 50, rows)
+        elif kind == 2:
+            data[f"flag_{i}"] = rng.integers(0, 2, rows)
+        else:
+            data[f"cat_{i}"] = levels[rng.integers(0, len(levels), rows)]
+    data = pd.DataFrame(data)
+    data["target"] = _target(rng, rows, data.iloc[:, 0].to_numpy())
+    return data
+
+
+def tall(rows=50_000_000, cols=4, seed=0):
+
+    """
+    A few very long columns, which stresses the binning and the cross-validated ROC AUC.
+
+    The columns cycle through normal, lognormal, small integers and a categorical of
+    30 levels. The categorical is a pandas category, as it would be read with
+    `dtype='category'`, since 50M strings alone take several GB.
+    """
+
+    rng = np.random.default_rng(seed)
+    data = {}
+    for i in range(cols):
+        kind = i % 4
+        if kind == 0:
+            data[f"num_{i}"] = rng.normal(size=rows)
+        elif kind == 1:
+            data[f"lognormal_{i}"] = rng.lognormal(size=rows)
+        elif kind == 2:
+            data[f"int_{i}"] = rng.integers(0, 200, rows)
+        else:
+            data[f"cat_{i}"] = pd.Categorical.from_codes(rng.integers(0, 30, rows), _levels(30))
+    data = pd.DataFrame(data)
+    data["target"] = _target(rng, rows, data.iloc[:, 0].to_numpy())
+    return data
+
+
+def high_cardinality(rows=1_000_000, cols=10, levels=100_000, seed=0):
+
+    """
+    Categoricals with up to `levels` distinct values, which stresses the label encoding
+    and gives the formatter one row per level.
+
+    Even columns draw their levels uniformly, odd ones from a Zipf distribution, so a
+    few levels are frequent and most are rare.
+    """
+
+    rng = np.random.default_rng(seed)
+    names = np.array(_levels(levels, "id"))
+    data = {}
+    for i in range(cols):
+        if i % 2 == 0:
+            codes = rng.integers(0, levels, rows)
+        else:
+            codes = np.minimum(rng.zipf(1.3, rows), levels) - 1
+        data[f"cat_{i}"] = names[codes]
+    data = pd.DataFrame(data)
+    data["target"] = _target(rng, rows)
+    return data
+
+
+def mostly_missing(rows=1_000_000, cols=50, missing=0.95, seed=0):
+
+    """
+    Numeric and categorical columns where a share `missing` of the values are missing.
+
+    Numeric columns are filled with their median before binning, so most rows fall into
+    one bin, and the missing categorical values are left out of the counts.
+    """
+
+    rng = np.random.default_rng(seed)
+    levels = np.array(_levels(20), dtype=object)
+    data = {}
+    for i in range(cols):
+        if i % 2 == 0:
+            values = rng.normal(size=rows)
+            values[rng.random(rows) < missing] = np.nan
+            data[f"num_{i}"] = values
+        else:
+            values = levels[rng.integers(0, len(levels), rows)]
+            values[rng.random(rows) < missing] = None
+            data[f"cat_{i}"] = values
+    data = pd.DataFrame(data)
+    data["target"] = _target(rng, rows)
+    return data
+
+
+GENERATORS = {
+    "wide": wide,
+    "tall": tall,
+    "high_cardinality": high_cardinality,
+    "mostly_missing": mostly_missing,
+}
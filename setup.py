@@ -28,9 +28,6 @@ setup(
         "Topic :: Scientific/Engineering :: Information Analysis",
         "Topic :: Scientific/Engineering :: Visualization",
         "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.6",
-        "Programming Language :: Python :: 3.7",
-        "Programming Language :: Python :: 3.8",
         "Programming Language :: Python :: 3.9",
         "Programming Language :: Python :: 3.10",
         "License :: OSI Approved :: MIT License",
@@ -41,14 +38,18 @@ setup(
         "machine learning", "data science", "data analysis", "EDAExcelReport", "profiling", 
         "Visualization", "Excel report", "python EDA report"
     ],
-    python_requires='>=3.6',
+    python_requires='>=3.9',
     install_requires=[
         "pandas>=1.2.0",  
         "openpyxl>=3.0.0",
-        "numpy>=1.19.0",
+        "numpy>=1.22.0",
         "scikit-learn>=0.24.0",
         "datetime"
     ],
+    extras_require={
+        "parquet": ["pyarrow"],
+        "polars": ["polars", "pyarrow"],
+    },
     entry_points={
         "console_scripts": [
             "eda_contributors=EDAExcelReport.contributors:set_contributors"
@@ -0,0 +1,59 @@
+import warnings
+
+import numpy as np
+import pytest
+
+from EDAR.auc import cv_auc, fold_indices
+from EDAR.excel_report import _column_auc
+
+
+def make_data(rows= 2000, seed= 0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size= rows)
+    y = (rng.random(rows) < 1 / (1 + np.exp(-X))).astype(int)
+    return X, y
+
+
+def engines(X, y, min_samples_leaf):
+    folds = fold_indices(y)
+    X = np.asarray(X, dtype= np.float64).reshape(-1, 1)
+    sklearn_aucs = _column_auc(X, y, min_samples_leaf, 'sklearn', folds= folds)
+    sorted_aucs = _column_auc(X, y, min_samples_leaf, 'sorted', folds= folds)
+    return np.array(sklearn_aucs), np.array(sorted_aucs)
+
+
+@pytest.mark.parametrize("min_samples_leaf", [0.1, 0.2])
+def test_continuous_column_matches_sklearn(min_samples_leaf):
+    X, y = make_data()
+    sklearn_aucs, sorted_aucs = engines(X, y, min_samples_leaf)
+    np.testing.assert_allclose(sorted_aucs, sklearn_aucs, rtol= 0, atol= 1e-12)
+
+
+def test_repeated_values_match_sklearn():
+    X, y = make_data()
+    sklearn_aucs, sorted_aucs = engines(np.round(X * 3), y, 0.1)
+    np.testing.assert_allclose(sorted_aucs, sklearn_aucs, rtol= 0, atol= 1e-12)
+
+
+def test_small_leaves_differ_only_by_ties():
+    # ties between splits and between leaf rates are broken differently, see cv_auc
+    X, y = make_data(rows= 3000)
+    sklearn_aucs, sorted_aucs = engines(X, y, 0.01)
+    assert abs(np.median(sorted_aucs) - np.median(sklearn_aucs)) < 5e-3
+
+
+def test_median_of_folds_is_the_report_auc():
+    X, y = make_data()
+    assert np.median(cv_auc(X, y, 0.1)) == pytest.approx(np.median(engines(X, y, 0.1)[1]))
+
+
+@pytest.mark.parametrize("auc_engine", ['sorted', 'sklearn'])
+def test_single_class_fold_raises(auc_engine):
+    X, y = make_data(rows= 200)
+    y = np.zeros(200, dtype= int)
+    y[:3] = 1
+    with warnings.catch_warnings():
+        # StratifiedKFold warns that a class has fewer rows than folds
+        warnings.simplefilter('ignore', UserWarning)
+        with pytest.raises(ValueError):
+            _column_auc(X.reshape(-1, 1), y, 0.1, auc_engine, folds= fold_indices(y))
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+from sklearn.metrics import roc_auc_score
+
+from EDAR.binning import hist_thresholds
+from EDAR.excel_report import _fit_thresholds
+
+# the in-sample ROC AUC of the binned column, hist against the exact engine
+AUC_TOLERANCE = 0.005
+
+
+def make_data(rows= 20000, seed= 0):
+    rng = np.random.default_rng(seed)
+    y = (rng.random(rows) < 0.15).astype(int)
+    columns = {'normal': rng.normal(size= rows) + 0.3 * y,
+               'lognormal': np.exp(rng.normal(size= rows) + 0.2 * y),
+               'uniform': rng.random(rows) + 0.05 * y}
+    return columns, y
+
+
+def binned_auc(x, y, edges):
+    bins = np.digitize(x, edges[:-1], right= True)
+    rate = np.bincount(bins, weights= y) / np.maximum(np.bincount(bins), 1)
+    return roc_auc_score(y, rate[bins]), bins.max() + 1
+
+
+@pytest.mark.parametrize("min_samples_leaf", [0.05, 0.1])
+def test_few_distinct_values_get_the_exact_bins(min_samples_leaf):
+    rng = np.random.default_rng(1)
+    y = (rng.random(20000) < 0.2).astype(int)
+    x = (rng.integers(0, 200, 20000) + y * rng.integers(0, 5, 20000)).astype(np.float64)
+    np.testing.assert_array_equal(hist_thresholds(x, y, min_samples_leaf),
+                                  _fit_thresholds(x.reshape(-1, 1), y, min_samples_leaf, 'sklearn'))
+
+
+@pytest.mark.parametrize("min_samples_leaf", [0.05, 0.1])
+def test_continuous_bins_are_as_good_as_the_exact_ones(min_samples_leaf):
+    columns, y = make_data()
+    for name, x in columns.items():
+        exact_auc, exact_bins = binned_auc(x, y, _fit_thresholds(x.reshape(-1, 1), y, min_samples_leaf, 'sklearn'))
+        hist_auc, hist_bins = binned_auc(x, y, hist_thresholds(x, y, min_samples_leaf))
+        assert abs(hist_auc - exact_auc) < AUC_TOLERANCE, name
+        assert abs(hist_bins - exact_bins) <= 2, name
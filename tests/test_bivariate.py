@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from EDAR.bivariate import SEPARATOR, bivariate_options, categorical_bins, numeric_bins, pair_table
+from EDAR.excel_report import EDAResult, _column_codes
+
+
+def make_data(rows= 2000, seed= 0):
+    rng = np.random.default_rng(seed)
+    income = rng.normal(50, 10, size= rows)
+    city = rng.choice(['Pune', 'Delhi', 'Mumbai', 'Agra'], size= rows).astype(object)
+    city[::7] = None
+    grade = rng.choice(['A', 'B', 'C'], size= rows).astype(object)
+    grade[::11] = None
+    target = (rng.random(rows) < 1 / (1 + np.exp(-(income - 50) / 10))).astype(int)
+    return pd.DataFrame({'INCOME': income, 'CITY': city, 'GRADE': grade, 'target': target})
+
+
+def expected_table(first, second, y):
+    # the same aggregation with pandas, on the labels of the bins
+    name_a, codes_a, labels_a = first
+    name_b, codes_b, labels_b = second
+    frame = pd.DataFrame({'a': codes_a, 'b': codes_b, 'y': y})
+    frame = frame[(frame['a'] >= 0) & (frame['b'] >= 0)]
+    grouped = frame.groupby(['a', 'b'])['y'].agg(['count', 'sum', 'mean']).reset_index()
+    grouped['value'] = [labels_a[a] + SEPARATOR + labels_b[b] for a, b in zip(grouped['a'], grouped['b'])]
+    return grouped[['value', 'count', 'sum', 'mean']]
+
+
+def assert_matches_groupby(first, second, y):
+    table = pair_table(first, second, y)
+    assert (table['Column'] == f"{first[0]} x {second[0]}").all()
+    expected = expected_table(first, second, y)
+    pd.testing.assert_frame_equal(table[['value', 'count', 'sum', 'mean']].reset_index(drop= True),
+                                  expected.reset_index(drop= True), check_dtype= False)
+    return table
+
+
+def test_numeric_by_categorical_with_missing_values():
+    df = make_data()
+    y = df['target'].to_numpy()
+    edges = np.array([40.0, 50.0, 60.0, np.inf])
+    income = ('INCOME',) + numeric_bins(df['INCOME'].to_numpy().reshape(-1, 1), edges)
+    city = ('CITY',) + categorical_bins(_column_codes(df['CITY']))
+
+    table = assert_matches_groupby(income, city, y)
+    assert table['count'].sum() == df['CITY'].notna().sum()
+    np.testing.assert_array_equal(income[1], pd.cut(df['INCOME'], [-np.inf, 40, 50, 60, np.inf], labels= False))
+    assert len(income[2]) == 4
+    assert city[2] == ['Agra', 'Delhi', 'Mumbai', 'Pune']
+
+
+def test_two_categoricals_with_missing_values():
+    df = make_data()
+    city = ('CITY',) + categorical_bins(_column_codes(df['CITY']))
+    grade = ('GRADE',) + categorical_bins(_column_codes(df['GRADE']))
+
+    table = assert_matches_groupby(city, grade, df['target'].to_numpy())
+    assert table['count'].sum() == (df['CITY'].notna() & df['GRADE'].notna()).sum()
+
+
+def test_report_pairs_the_top_columns():
+    result = EDAResult(make_data(), 'target', bivariate= 2)
+    pairs = result.bivariate_data['Column'].unique()
+    assert len(pairs) == 1
+    assert pairs[0].startswith(result.roc_data['Column'].iloc[0] + ' x ')
+
+
+def test_options():
+    assert bivariate_options(3)['top_k'] == 3
+    with pytest.raises(ValueError):
+        bivariate_options({'top': 3})
+    with pytest.raises(ValueError):
+        bivariate_options(1)
@@ -0,0 +1,93 @@
+import os
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+from EDAR.cache import EDACache
+from EDAR.excel_report import EDAResult
+
+
+class CountingCache(EDACache):
+
+    """An EDACache that lists the keys it stores results under."""
+
+    def __init__(self, path, **kwargs):
+        super().__init__(path, **kwargs)
+        self.stored = []
+
+    def put(self, key, record, evict= True):
+        self.stored.append(record["Column"])
+        super().put(key, record, evict= evict)
+
+
+def make_data(rows= 1000, seed= 0):
+    rng = np.random.default_rng(seed)
+    income = rng.normal(50, 10, size= rows)
+    target = (rng.random(rows) < 1 / (1 + np.exp(-(income - 50) / 10))).astype(int)
+    return pd.DataFrame({'INCOME': income,
+                         'AGE': rng.integers(18, 70, size= rows),
+                         'CITY': rng.choice(['Pune', 'Delhi', 'Mumbai'], size= rows),
+                         'OWNS_CAR': rng.choice(['Y', 'N'], size= rows),
+                         'target': target})
+
+
+def analyse(df, **kwargs):
+    # the columns are analysed when the frames are first read
+    result = EDAResult(df, 'target', **kwargs)
+    result.grp_data, result.roc_data
+    return result
+
+
+def assert_same_result(expected, result):
+    pd.testing.assert_frame_equal(expected.grp_data, result.grp_data)
+    pd.testing.assert_frame_equal(expected.roc_data, result.roc_data)
+
+
+def workbook_values(result, path):
+    result.render_excel(str(path))
+    (report,) = path.parent.glob(path.stem + '_*.xlsx')
+    return [[row for row in ws.iter_rows(values_only= True)] for ws in load_workbook(report)]
+
+
+def test_second_run_reuses_every_column(tmp_path):
+    df = make_data()
+    cache = CountingCache(str(tmp_path / 'cache'))
+    first = analyse(df, cache= cache)
+    assert sorted(cache.stored) == ['AGE', 'CITY', 'INCOME', 'OWNS_CAR']
+
+    cache.stored.clear()
+    second = analyse(df, cache= cache)
+    assert cache.stored == []
+    assert_same_result(first, second)
+    assert_same_result(EDAResult(df, 'target'), second)
+    assert workbook_values(first, tmp_path / 'first.xlsx') == workbook_values(second, tmp_path / 'second.xlsx')
+
+
+def test_changed_column_misses_the_cache(tmp_path):
+    df = make_data()
+    cache = CountingCache(str(tmp_path))
+    analyse(df, cache= cache)
+
+    cache.stored.clear()
+    changed = df.assign(INCOME= df['INCOME'] * 1.5)
+    result = analyse(changed, cache= cache)
+    assert cache.stored == ['INCOME']
+    assert_same_result(EDAResult(changed, 'target'), result)
+
+
+def test_changed_option_misses_the_cache(tmp_path):
+    df = make_data()
+    cache = CountingCache(str(tmp_path))
+    analyse(df, cache= cache)
+
+    cache.stored.clear()
+    analyse(df, cache= cache, num_min_samples_leaf= 0.2)
+    assert sorted(cache.stored) == ['AGE', 'CITY', 'INCOME', 'OWNS_CAR']
+
+
+def test_evict_limits_results_and_edges(tmp_path):
+    cache = EDACache(str(tmp_path), max_entries= 2)
+    analyse(make_data(), cache= cache)
+    assert len(os.listdir(cache.results_path)) == 2
+    assert len(os.listdir(cache.edges_path)) == 2
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+
+from EDAR.columnar import to_arrow, to_pandas
+from EDAR.excel_report import EDAResult
+
+
+def make_data(rows= 1000, seed= 0):
+    rng = np.random.default_rng(seed)
+    income = rng.normal(50, 10, size= rows)
+    city = rng.choice(['Pune', 'Delhi', 'Mumbai', 'Agra'], size= rows).astype(object)
+    city[::9] = None
+    target = (rng.random(rows) < 1 / (1 + np.exp(-(income - 50) / 10))).astype(int)
+    return pd.DataFrame({'INCOME': income, 'AGE': rng.integers(18, 70, size= rows),
+                         'CITY': city, 'target': target})
+
+
+def assert_same_report(expected, result):
+    grp_expected = expected.grp_data.reset_index(drop= True)
+    grp_result = result.grp_data.reset_index(drop= True)
+    # the levels of a categorical come back as its categories, compare them as text
+    grp_expected['value'] = grp_expected['value'].astype(str)
+    grp_result['value'] = grp_result['value'].astype(str)
+    pd.testing.assert_frame_equal(grp_expected, grp_result, check_dtype= False)
+    pd.testing.assert_frame_equal(expected.roc_data, result.roc_data)
+
+
+def test_strings_become_sorted_categoricals():
+    df = to_pandas(pa.RecordBatch.from_pandas(make_data(), preserve_index= False))
+    assert isinstance(df['CITY'].dtype, pd.CategoricalDtype)
+    assert list(df['CITY'].cat.categories) == ['Agra', 'Delhi', 'Mumbai', 'Pune']
+    assert df['CITY'].isna().sum() == make_data()['CITY'].isna().sum()
+
+
+def test_arrow_table_gives_the_pandas_report():
+    df = make_data()
+    table = pa.Table.from_pandas(df, preserve_index= False)
+    assert_same_report(EDAResult(df, 'target'), EDAResult(table, 'target'))
+
+
+def test_unknown_type_raises():
+    with pytest.raises(TypeError):
+        to_arrow(pa.array([1, 2, 3]))
+
+
+def test_polars_frame_gives_the_pandas_report():
+    pl = pytest.importorskip("polars")
+    df = make_data()
+    assert_same_report(EDAResult(df, 'target'), EDAResult(pl.from_pandas(df), 'target'))
+
+
+def test_polars_lazy_frame_raises():
+    pl = pytest.importorskip("polars")
+    with pytest.raises(TypeError):
+        to_arrow(pl.from_pandas(make_data()).lazy())
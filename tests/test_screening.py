@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from EDAR.excel_report import EDAResult
+from EDAR.screening import SCREEN_DEFAULTS, screen_columns, screen_options
+
+
+def make_data(rows= 2000, seed= 0):
+    rng = np.random.default_rng(seed)
+    amount_cents = rng.choice(10 ** 7, size= rows, replace= False).astype(np.int64)
+    score = (amount_cents - 5 * 10 ** 6) / 2.5e6
+    target = (rng.random(rows) < 1 / (1 + np.exp(-score))).astype(int)
+    return pd.DataFrame({'ID': np.arange(1000, 1000 + rows),
+                         'CUSTOMER': [f"C{i:06d}" for i in rng.permutation(rows)],
+                         'amount_cents': amount_cents,
+                         'target': target})
+
+
+def reasons(data, cols, options= True, rows= None):
+    kept, skipped = screen_columns(data, cols, data['target'].to_numpy() == 1,
+                                   screen_options(options), rows)
+    return kept, dict(zip(skipped['Column'], skipped['Reason']))
+
+
+def test_options_default_and_override():
+    assert screen_options(True) == SCREEN_DEFAULTS
+    options = screen_options({'alpha': None})
+    assert options['alpha'] is None
+    assert options['max_missing'] == SCREEN_DEFAULTS['max_missing']
+
+
+def test_options_reject_unknown_keys():
+    with pytest.raises(ValueError, match= "max_unique"):
+        screen_options({'max_unique': 0.5})
+
+
+def test_keys_are_identifiers_but_not_distinct_amounts():
+    data = make_data()
+    kept, skipped = reasons(data, ['ID', 'CUSTOMER', 'amount_cents'])
+    assert skipped == {'ID': 'identifier', 'CUSTOMER': 'identifier'}
+    assert kept == ['amount_cents']
+
+
+def test_report_keeps_a_predictive_distinct_integer_column():
+    result = EDAResult(make_data(), 'target', screen= True)
+    assert dict(zip(result.skipped['Column'], result.skipped['Reason'])) == {
+        'ID': 'identifier', 'CUSTOMER': 'identifier'}
+    assert 'amount_cents' in set(result.roc_data['Column'])
+
+
+def test_skip_reasons():
+    data = make_data()
+    rng = np.random.default_rng(1)
+    mostly_missing = np.full(len(data), np.nan)
+    mostly_missing[:5] = np.arange(5)
+    data = data.assign(CONSTANT= 7, CITY= 'Pune', MOSTLY_MISSING= mostly_missing,
+                       NOISE= rng.normal(size= len(data)))
+    cols = ['CONSTANT', 'CITY', 'MOSTLY_MISSING', 'NOISE', 'amount_cents']
+    kept, skipped = reasons(data, cols)
+    assert skipped == {'CONSTANT': 'constant', 'CITY': 'constant',
+                       'MOSTLY_MISSING': 'mostly missing', 'NOISE': 'no signal'}
+    assert kept == ['amount_cents']
+
+
+def test_rules_are_turned_off_with_none():
+    data = make_data().assign(NOISE= np.random.default_rng(1).normal(size= 2000))
+    kept, skipped = reasons(data, ['ID', 'CUSTOMER', 'NOISE'],
+                            {'max_unique_ratio': None, 'alpha': None})
+    assert skipped == {}
+    assert kept == ['ID', 'CUSTOMER', 'NOISE']
+
+
+def test_constant_on_the_sample_only_is_not_constant():
+    data = make_data()
+    rare = np.zeros(len(data))
+    rare[-10:] = np.arange(1, 11)
+    level = np.array(['A'] * len(data), dtype= object)
+    level[-10:] = 'B'
+    data = data.assign(RARE= rare, RARE_INT= rare.astype(np.int64), LEVEL= level, CONSTANT= 7)
+    sample = np.arange(len(data) - 100)
+    kept, skipped = reasons(data, ['RARE', 'RARE_INT', 'LEVEL', 'CONSTANT'], {'alpha': None}, sample)
+    assert skipped == {'CONSTANT': 'constant'}
+    assert kept == ['RARE', 'RARE_INT', 'LEVEL']
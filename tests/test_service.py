@@ -0,0 +1,127 @@
+import asyncio
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from EDAR.excel_report import EDAResult
+from EDAR.service import ReportService, _handle
+
+
+@pytest.fixture
+def data_path(tmp_path):
+    rng = np.random.default_rng(0)
+    rows = 2000
+    df = pd.DataFrame({'a': rng.normal(size= rows), 'b': rng.integers(0, 5, rows),
+                       'c': rng.choice(list('xyz'), rows)})
+    df['t'] = (df['a'] + rng.normal(size= rows) > 0).astype(int)
+    path = tmp_path / 'data.csv'
+    df.to_csv(path, index= False)
+    return str(path)
+
+
+def test_identical_jobs_share_one_run(data_path):
+    async def main():
+        async with ReportService() as service:
+            first = await service.submit(data_path, 't')
+            second = await service.submit(data_path, 't')
+            return first, second, await service.result(first)
+
+    first, second, result = asyncio.run(main())
+    assert first == second
+    assert result['status'] == 'done' and not result['cached']
+    expected = EDAResult(pd.read_csv(data_path), 't')
+    pd.testing.assert_frame_equal(expected.grp_data, result['grp_data'])
+    pd.testing.assert_frame_equal(expected.roc_data, result['roc_data'])
+
+
+def test_finished_analysis_is_reused(data_path, tmp_path):
+    async def main():
+        async with ReportService() as service:
+            first = await service.run(data_path, 't')
+            job_id = await service.submit(data_path, 't', str(tmp_path / 'report.xlsx'), write_only= True)
+            events = [item['event'] async for item in service.events(job_id)]
+            return first, events, await service.result(job_id)
+
+    first, events, second = asyncio.run(main())
+    assert second['cached'] and 'cached' in events and 'analysing' not in events
+    assert events[-1] == 'done'
+    assert second['report_path'].startswith(str(tmp_path / 'report_'))
+    pd.testing.assert_frame_equal(first['grp_data'], second['grp_data'])
+
+
+def test_failed_job_reports_the_error(data_path):
+    async def main():
+        async with ReportService() as service:
+            job_id = await service.submit(data_path, 'missing')
+            events = [item async for item in service.events(job_id)]
+            return events, service.status(job_id)
+
+    events, status = asyncio.run(main())
+    assert events[-1]['event'] == 'failed' and events[-1]['error']
+    assert status['status'] == 'failed' and status['error'] == events[-1]['error']
+
+
+def test_unknown_parameters_are_rejected(data_path):
+    async def main():
+        async with ReportService() as service:
+            await service.submit(data_path, 't', max_row= 10)
+
+    with pytest.raises(TypeError):
+        asyncio.run(main())
+
+
+async def request(service, method, path, body= b""):
+    # the responses end with the connection, the events stream too
+    server = await asyncio.start_server(lambda r, w: _handle(service, r, w), '127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(f"{method} {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n".encode('latin-1') + body)
+        await writer.drain()
+        response = await asyncio.wait_for(reader.read(), 60)
+        writer.close()
+    head, _, payload = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), payload
+
+
+async def post(service, body):
+    status, payload = await request(service, 'POST', '/jobs', body)
+    return status, json.loads(payload)
+
+
+@pytest.mark.parametrize("body", [b"{not json", b"\xff\xfe", b'{"data": "x.csv", "target": "t", "params": 5}',
+                                  b'["x.csv", "t"]'])
+def test_http_rejects_bad_requests(data_path, body):
+    async def main():
+        async with ReportService() as service:
+            return await post(service, body)
+
+    status, payload = asyncio.run(main())
+    assert status == 400
+    assert payload['error']
+
+
+def test_http_accepts_a_job(data_path):
+    async def main():
+        async with ReportService() as service:
+            status, payload = await post(service, json.dumps({'data': data_path, 'target': 't'}).encode('utf-8'))
+            await service.result(payload['job'])
+            return status, payload
+
+    status, payload = asyncio.run(main())
+    assert status == 202
+    assert payload['status'] == 'queued'
+
+
+def test_http_streams_the_events_of_a_job(data_path):
+    async def main():
+        async with ReportService() as service:
+            _, payload = await post(service, json.dumps({'data': data_path, 'target': 't'}).encode('utf-8'))
+            return await request(service, 'GET', f"/jobs/{payload['job']}/events")
+
+    status, payload = asyncio.run(main())
+    events = [json.loads(line)['event'] for line in payload.splitlines()]
+    assert status == 200
+    assert events[0] == 'queued' and events[-1] == 'done'
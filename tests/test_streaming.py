@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from EDAR.excel_report import EDAExcelReport
+
+
+def make_data(rows= 3000, seed= 0):
+    rng = np.random.default_rng(seed)
+    amount = rng.normal(100, 30, size= rows)
+    target = (rng.random(rows) < 1 / (1 + np.exp(-(amount - 100) / 30))).astype(int)
+    flag = rng.integers(0, 2, size= rows).astype(float)
+    flag[::11] = np.nan
+    city = rng.choice(list('abcdefghij'), size= rows).astype(object)
+    city[::7] = None
+    return pd.DataFrame({'AMT': amount,
+                         'CNT': rng.integers(0, 5, size= rows),
+                         'FLAG': flag,
+                         'OWN_CAR': rng.choice(['Y', 'N'], size= rows),
+                         'CITY': city,
+                         'target': target})
+
+
+def assert_same_report(expected, result):
+    grp_expected = expected.grp_data.reset_index(drop= True)
+    grp_result = result.grp_data.reset_index(drop= True)
+    grp_expected['value'] = grp_expected['value'].astype(str)
+    grp_result['value'] = grp_result['value'].astype(str)
+    pd.testing.assert_frame_equal(grp_expected, grp_result, check_dtype= False)
+    pd.testing.assert_frame_equal(expected.roc_data, result.roc_data)
+
+
+@pytest.fixture
+def data():
+    return make_data()
+
+
+@pytest.fixture
+def in_memory(data, tmp_path):
+    return EDAExcelReport(data.copy(), 'target', str(tmp_path / 'memory.xlsx'))
+
+
+def test_csv_matches_the_in_memory_report(data, in_memory, tmp_path):
+    path = tmp_path / 'data.csv'
+    data.to_csv(path, index= False)
+    result = EDAExcelReport.from_source(str(path), 'target', str(tmp_path / 'csv.xlsx'),
+                                        chunksize= 700, columns_per_group= 2)
+    assert_same_report(in_memory, result)
+
+
+def test_parquet_matches_the_in_memory_report(data, in_memory, tmp_path):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / 'data.parquet'
+    data.to_parquet(path, index= False)
+    result = EDAExcelReport.from_source(str(path), 'target', str(tmp_path / 'parquet.xlsx'),
+                                        chunksize= 700, columns_per_group= 2)
+    assert_same_report(in_memory, result)
+
+
+def test_chunks_match_the_in_memory_report(data, in_memory, tmp_path):
+    chunks = lambda: (data.iloc[start:start + 500] for start in range(0, len(data), 500))
+    result = EDAExcelReport.from_source(chunks, 'target', str(tmp_path / 'chunks.xlsx'),
+                                        columns_per_group= 3)
+    assert_same_report(in_memory, result)
+
+
+def test_empty_source_raises(data, tmp_path):
+    path = tmp_path / 'empty.csv'
+    data.iloc[:0].to_csv(path, index= False)
+    with pytest.raises(ValueError):
+        EDAExcelReport.from_source(str(path), 'target', str(tmp_path / 'empty.xlsx'))